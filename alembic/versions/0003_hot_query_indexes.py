@@ -0,0 +1,61 @@
+"""composite and partial indexes for list queries"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_hot_query_indexes"
+down_revision = "0002_membership_version"
+branch_labels = None
+depends_on = None
+
+
+INDEXES: list[tuple[str, str, list[str], dict]] = [
+    ("ix_members_user", "organization_members", ["user_id"], {}),
+    ("ix_contacts_org_created", "contacts", ["organization_id", "created_at"], {}),
+    (
+        "ix_contacts_org_owner_created",
+        "contacts",
+        ["organization_id", "owner_id", "created_at"],
+        {},
+    ),
+    ("ix_deals_org_created", "deals", ["organization_id", "created_at"], {}),
+    ("ix_deals_org_status_created", "deals", ["organization_id", "status", "created_at"], {}),
+    ("ix_deals_org_stage_created", "deals", ["organization_id", "stage", "created_at"], {}),
+    ("ix_deals_org_owner_created", "deals", ["organization_id", "owner_id", "created_at"], {}),
+    ("ix_deals_org_amount", "deals", ["organization_id", "amount"], {}),
+    ("ix_deals_contact", "deals", ["contact_id"], {}),
+    ("ix_tasks_deal_due", "tasks", ["deal_id", "due_date"], {}),
+    (
+        "ix_tasks_open_deal_due",
+        "tasks",
+        ["deal_id", "due_date"],
+        {
+            "postgresql_where": sa.text("NOT is_done"),
+            "sqlite_where": sa.text("NOT is_done"),
+        },
+    ),
+    ("ix_activities_deal_created", "activities", ["deal_id", "created_at"], {}),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps large tenants writable while the indexes build; it cannot run inside
+    # the migration transaction.
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
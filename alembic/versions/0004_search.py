@@ -0,0 +1,73 @@
+"""full-text search structures for contacts and deals"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0004_search"
+down_revision = "0003_hot_query_indexes"
+branch_labels = None
+depends_on = None
+
+# Frozen copies of the DDL in app/models/search.py as of this revision.
+POSTGRESQL_UPGRADE = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_contacts_name_trgm "
+    "ON contacts USING gin (lower(name) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_contacts_email_trgm "
+    "ON contacts USING gin (lower(email) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_deals_title_trgm ON deals USING gin (lower(title) gin_trgm_ops)",
+]
+
+SQLITE_UPGRADE = {
+    "contacts": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(name, email, "
+        "content='contacts', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER IF NOT EXISTS contacts_fts_ai AFTER INSERT ON contacts BEGIN "
+        "INSERT INTO contacts_fts(rowid, name, email) VALUES (new.id, new.name, new.email); END",
+        "CREATE TRIGGER IF NOT EXISTS contacts_fts_ad AFTER DELETE ON contacts BEGIN "
+        "INSERT INTO contacts_fts(contacts_fts, rowid, name, email) "
+        "VALUES ('delete', old.id, old.name, old.email); END",
+        "CREATE TRIGGER IF NOT EXISTS contacts_fts_au AFTER UPDATE OF name, email ON contacts "
+        "BEGIN INSERT INTO contacts_fts(contacts_fts, rowid, name, email) "
+        "VALUES ('delete', old.id, old.name, old.email); "
+        "INSERT INTO contacts_fts(rowid, name, email) VALUES (new.id, new.name, new.email); END",
+    ],
+    "deals": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS deals_fts USING fts5(title, content='deals', "
+        "content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER IF NOT EXISTS deals_fts_ai AFTER INSERT ON deals BEGIN "
+        "INSERT INTO deals_fts(rowid, title) VALUES (new.id, new.title); END",
+        "CREATE TRIGGER IF NOT EXISTS deals_fts_ad AFTER DELETE ON deals BEGIN "
+        "INSERT INTO deals_fts(deals_fts, rowid, title) VALUES ('delete', old.id, old.title); END",
+        "CREATE TRIGGER IF NOT EXISTS deals_fts_au AFTER UPDATE OF title ON deals BEGIN "
+        "INSERT INTO deals_fts(deals_fts, rowid, title) VALUES ('delete', old.id, old.title); "
+        "INSERT INTO deals_fts(rowid, title) VALUES (new.id, new.title); END",
+    ],
+}
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        for statement in POSTGRESQL_UPGRADE:
+            op.execute(statement)
+    elif dialect == "sqlite":
+        for table, statements in SQLITE_UPGRADE.items():
+            for statement in statements:
+                op.execute(statement)
+            # Index the rows that existed before the triggers.
+            op.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_deals_title_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_contacts_email_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_contacts_name_trgm")
+    elif dialect == "sqlite":
+        for table in SQLITE_UPGRADE:
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
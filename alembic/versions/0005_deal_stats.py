@@ -0,0 +1,44 @@
+"""deal_stats rollup for analytics"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0005_deal_stats"
+down_revision = "0004_search"
+branch_labels = None
+depends_on = None
+
+deal_status_enum = postgresql.ENUM(
+    "new", "in_progress", "won", "lost", name="deal_status_enum", create_type=False
+)
+deal_stage_enum = postgresql.ENUM(
+    "qualification", "proposal", "negotiation", "closed", name="deal_stage_enum", create_type=False
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "deal_stats",
+        sa.Column(
+            "organization_id",
+            sa.Integer(),
+            sa.ForeignKey("organizations.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("stage", deal_stage_enum, primary_key=True),
+        sa.Column("status", deal_status_enum, primary_key=True),
+        sa.Column("deal_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("amount_total", sa.Numeric(18, 2), nullable=False, server_default="0"),
+    )
+    op.execute(
+        "INSERT INTO deal_stats (organization_id, stage, status, deal_count, amount_total) "
+        "SELECT organization_id, stage, status, count(id), coalesce(sum(amount), 0) "
+        "FROM deals GROUP BY organization_id, stage, status"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("deal_stats")
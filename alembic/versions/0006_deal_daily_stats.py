@@ -0,0 +1,74 @@
+"""deal_daily_stats rollup for time-bucketed analytics"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006_deal_daily_stats"
+down_revision = "0005_deal_stats"
+branch_labels = None
+depends_on = None
+
+# Created deals count on their UTC creation day; won/lost flows come from STATUS_CHANGED
+# activities. Their payloads carry no amounts yet, so wins and losses are valued at each deal's
+# current amount, as the rollup rebuild does for such rows. The placeholders read the UTC day of
+# a timestamp and the activity type and payload.
+BACKFILL = """
+INSERT INTO deal_daily_stats
+    (organization_id, day, created_count, won_count, lost_count, won_amount)
+SELECT organization_id, day, sum(created_count), sum(won_count), sum(lost_count), sum(won_amount)
+FROM (
+    SELECT organization_id, {deal_day} AS day, 1 AS created_count, 0 AS won_count,
+        0 AS lost_count, 0 AS won_amount
+    FROM deals
+    UNION ALL
+    SELECT deals.organization_id, {activity_day}, 0,
+        CASE WHEN {to_status} = 'won' THEN 1 WHEN {from_status} = 'won' THEN -1 ELSE 0 END,
+        CASE WHEN {to_status} = 'lost' THEN 1 WHEN {from_status} = 'lost' THEN -1 ELSE 0 END,
+        CASE WHEN {to_status} = 'won' THEN deals.amount
+            WHEN {from_status} = 'won' THEN -deals.amount ELSE 0 END
+    FROM activities JOIN deals ON deals.id = activities.deal_id
+    WHERE {activity_type} = 'status_changed'
+) AS flows
+GROUP BY organization_id, day
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "deal_daily_stats",
+        sa.Column(
+            "organization_id",
+            sa.Integer(),
+            sa.ForeignKey("organizations.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("created_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("won_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("lost_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("won_amount", sa.Numeric(18, 2), nullable=False, server_default="0"),
+    )
+    if op.get_bind().dialect.name == "postgresql":
+        day = "date(timezone('UTC', {}.created_at))"
+        activity_type = "activities.type"
+        payload = "activities.payload ->> '{}'"
+    else:
+        day = "date({}.created_at)"
+        # rows written before 0009 hold the enum member name there
+        activity_type = "lower(activities.type)"
+        payload = "json_extract(activities.payload, '$.{}')"
+    op.execute(
+        BACKFILL.format(
+            deal_day=day.format("deals"),
+            activity_day=day.format("activities"),
+            activity_type=activity_type,
+            to_status=payload.format("to"),
+            from_status=payload.format("from"),
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("deal_daily_stats")
@@ -0,0 +1,44 @@
+"""activities.organization_id for the organization-wide feed"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_activity_organization"
+down_revision = "0006_deal_daily_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("activities", sa.Column("organization_id", sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE activities SET organization_id = "
+        "(SELECT deals.organization_id FROM deals WHERE deals.id = activities.deal_id)"
+    )
+    with op.batch_alter_table("activities") as batch:
+        batch.alter_column("organization_id", existing_type=sa.Integer(), nullable=False)
+        batch.create_foreign_key(
+            "fk_activities_organization_id",
+            "organizations",
+            ["organization_id"],
+            ["id"],
+            ondelete="CASCADE",
+        )
+    op.create_index(
+        "ix_activities_org_created", "activities", ["organization_id", "created_at", "id"]
+    )
+    op.create_index(
+        "ix_activities_org_type_created",
+        "activities",
+        ["organization_id", "type", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_activities_org_type_created", table_name="activities")
+    op.drop_index("ix_activities_org_created", table_name="activities")
+    with op.batch_alter_table("activities") as batch:
+        batch.drop_constraint("fk_activities_organization_id", type_="foreignkey")
+        batch.drop_column("organization_id")
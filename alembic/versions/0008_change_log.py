@@ -0,0 +1,49 @@
+"""per-organization change log and data version"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008_change_log"
+down_revision = "0007_activity_organization"
+branch_labels = None
+depends_on = None
+
+change_entity_enum = sa.Enum("deal", "contact", "task", "activity", name="change_entity_enum")
+change_op_enum = sa.Enum("created", "updated", "deleted", name="change_op_enum")
+
+
+def upgrade() -> None:
+    op.add_column(
+        "organizations",
+        sa.Column("data_version", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.create_table(
+        "change_log",
+        sa.Column(
+            "id", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), primary_key=True
+        ),
+        sa.Column(
+            "organization_id",
+            sa.Integer(),
+            sa.ForeignKey("organizations.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("entity", change_entity_enum, nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("op", change_op_enum, nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.UniqueConstraint("organization_id", "version", name="uq_change_log_org_version"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("change_log")
+    change_op_enum.drop(op.get_bind(), checkfirst=True)
+    change_entity_enum.drop(op.get_bind(), checkfirst=True)
+    with op.batch_alter_table("organizations") as batch:
+        batch.drop_column("data_version")
@@ -0,0 +1,37 @@
+"""store enum values rather than member names"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0009_enum_values"
+down_revision = "0008_change_log"
+branch_labels = None
+depends_on = None
+
+# The models used to bind the member names (``STATUS_CHANGED``) while the migrations declare the
+# values (``status_changed``). PostgreSQL enums reject the names, so only SQLite, where the
+# columns are plain VARCHAR, can hold such rows. Every value is its member name in lower case.
+ENUM_COLUMNS = {
+    "organization_members": ["role"],
+    "deals": ["status", "stage"],
+    "deal_stats": ["stage", "status"],
+    "activities": ["type"],
+    "change_log": ["entity", "op"],
+}
+
+
+def upgrade() -> None:
+    _convert("lower")
+
+
+def downgrade() -> None:
+    _convert("upper")
+
+
+def _convert(function: str) -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for table, columns in ENUM_COLUMNS.items():
+        assignments = ", ".join(f"{column} = {function}({column})" for column in columns)
+        op.execute(f"UPDATE {table} SET {assignments}")
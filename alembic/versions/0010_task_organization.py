@@ -0,0 +1,57 @@
+"""tasks.organization_id for the organization-wide task list"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010_task_organization"
+down_revision = "0009_enum_values"
+branch_labels = None
+depends_on = None
+
+# SQLite has no boolean type: ``NOT is_done`` in a query is rendered as ``is_done = 0``, and a
+# partial index is only used when the query repeats its predicate.
+OPEN_PREDICATE = {
+    "postgresql_where": sa.text("NOT is_done"),
+    "sqlite_where": sa.text("is_done = 0"),
+}
+
+
+def upgrade() -> None:
+    op.drop_index("ix_tasks_open_deal_due", table_name="tasks")
+    op.add_column("tasks", sa.Column("organization_id", sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE tasks SET organization_id = "
+        "(SELECT deals.organization_id FROM deals WHERE deals.id = tasks.deal_id)"
+    )
+    with op.batch_alter_table("tasks") as batch:
+        batch.alter_column("organization_id", existing_type=sa.Integer(), nullable=False)
+        batch.create_foreign_key(
+            "fk_tasks_organization_id",
+            "organizations",
+            ["organization_id"],
+            ["id"],
+            ondelete="CASCADE",
+        )
+    op.create_index("ix_tasks_open_deal_due", "tasks", ["deal_id", "due_date"], **OPEN_PREDICATE)
+    op.create_index("ix_tasks_org_due", "tasks", ["organization_id", "due_date", "id"])
+    op.create_index(
+        "ix_tasks_open_org_due", "tasks", ["organization_id", "due_date", "id"], **OPEN_PREDICATE
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_open_org_due", table_name="tasks")
+    op.drop_index("ix_tasks_org_due", table_name="tasks")
+    op.drop_index("ix_tasks_open_deal_due", table_name="tasks")
+    with op.batch_alter_table("tasks") as batch:
+        batch.drop_constraint("fk_tasks_organization_id", type_="foreignkey")
+        batch.drop_column("organization_id")
+    op.create_index(
+        "ix_tasks_open_deal_due",
+        "tasks",
+        ["deal_id", "due_date"],
+        postgresql_where=sa.text("NOT is_done"),
+        sqlite_where=sa.text("NOT is_done"),
+    )
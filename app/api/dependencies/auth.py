@@ -4,27 +4,33 @@ from dataclasses import dataclass
 
 from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy import select
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.caching.principals import membership_cache, membership_version_cache
 from app.core.config import get_settings
-from app.core.security import decode_token
+from app.core.security import TokenPayload, decode_token
 from app.db.session import get_session
+from app.models.enums import MemberRole
 from app.models.models import Organization, OrganizationMember, User
+from app.repositories.user_repository import UserRepository
 
 settings = get_settings()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.api_v1_prefix}/auth/login")
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_session)
-) -> User:
+def _decode_access_token(token: str) -> TokenPayload:
     try:
-        payload = decode_token(token)
-    except ValueError as exc:  
+        return decode_token(token)
+    except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc)) from exc
 
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_session)
+) -> User:
+    payload = _decode_access_token(token)
     user_id = int(payload.sub)
     user = await session.get(User, user_id)
     if not user:
@@ -32,25 +38,86 @@ async def get_current_user(
     return user
 
 
-@dataclass
+@dataclass(frozen=True)
+class OrganizationRef:
+    id: int
+
+
+@dataclass(frozen=True)
+class MembershipRef:
+    organization_id: int
+    user_id: int
+    role: MemberRole
+
+
+@dataclass(frozen=True)
 class OrganizationContext:
-    organization: Organization
-    membership: OrganizationMember
+    organization: OrganizationRef
+    membership: MembershipRef
 
 
 async def get_current_member(
-    current_user: User = Depends(get_current_user),
+    token: str = Depends(oauth2_scheme),
     organization_id: int = Header(..., alias="X-Organization-Id"),
     session: AsyncSession = Depends(get_session),
 ) -> OrganizationContext:
-    stmt = select(OrganizationMember).where(
-        OrganizationMember.organization_id == organization_id,
-        OrganizationMember.user_id == current_user.id,
+    payload = _decode_access_token(token)
+    user_id = int(payload.sub)
+    if settings.token.embed_memberships and payload.orgs is not None:
+        context = await _context_from_claims(session, payload, user_id, organization_id)
+        if context:
+            return context
+
+    cache_key = (user_id, organization_id)
+    cached = membership_cache.get(cache_key)
+    if cached:
+        return cached
+
+    stmt = (
+        select(User.id, OrganizationMember.role, Organization.id)
+        .outerjoin(
+            OrganizationMember,
+            and_(
+                OrganizationMember.user_id == User.id,
+                OrganizationMember.organization_id == organization_id,
+            ),
+        )
+        .outerjoin(Organization, Organization.id == OrganizationMember.organization_id)
+        .where(User.id == user_id)
     )
-    membership = await session.scalar(stmt)
-    if not membership:
+    row = (await session.execute(stmt)).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    _, role, org_id = row
+    if role is None:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member")
-    organization = await session.get(Organization, organization_id)
-    if not organization:
+    if org_id is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Organization not found")
-    return OrganizationContext(organization=organization, membership=membership)
+
+    context = OrganizationContext(
+        organization=OrganizationRef(id=org_id),
+        membership=MembershipRef(organization_id=org_id, user_id=user_id, role=role),
+    )
+    membership_cache.set(cache_key, context, settings.auth_cache_ttl_seconds)
+    return context
+
+
+async def _context_from_claims(
+    session: AsyncSession, payload: TokenPayload, user_id: int, organization_id: int
+) -> OrganizationContext | None:
+    """Build the context from token claims, or return None when the claims are stale."""
+    version = membership_version_cache.get(user_id)
+    if version is None:
+        version = await UserRepository(session).get_membership_version(user_id)
+        if version is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        membership_version_cache.set(user_id, version, settings.auth_cache_ttl_seconds)
+    if version != payload.mv:
+        return None
+    role = (payload.orgs or {}).get(str(organization_id))
+    if role is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member")
+    return OrganizationContext(
+        organization=OrganizationRef(id=organization_id),
+        membership=MembershipRef(organization_id=organization_id, user_id=user_id, role=role),
+    )
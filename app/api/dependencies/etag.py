@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Awaitable, Callable
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies.auth import OrganizationContext, get_current_member
+from app.db.session import get_session
+from app.repositories.change_repository import ChangeRepository
+
+
+def conditional_get(
+    *, max_age_seconds: int | None = None
+) -> Callable[..., Awaitable[str]]:
+    """Dependency answering ``If-None-Match`` with 304 before the endpoint runs any query.
+
+    The ETag covers the organization's data version, the path, query and Accept header, and
+    the caller's role. Responses that also depend on the clock (rolling analytics windows) pass
+    ``max_age_seconds`` so the tag changes at least that often.
+    """
+
+    async def dependency(
+        request: Request,
+        response: Response,
+        session: AsyncSession = Depends(get_session),
+        context: OrganizationContext = Depends(get_current_member),
+    ) -> str:
+        version = await ChangeRepository(session).current_version(context.organization.id)
+        parts = [
+            str(context.organization.id),
+            str(version),
+            context.membership.role.value,
+            request.url.path,
+            "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items())),
+            request.headers.get("accept", ""),
+        ]
+        if max_age_seconds:
+            parts.append(str(int(time.time() // max_age_seconds)))
+        etag = '"' + hashlib.sha256("|".join(parts).encode()).hexdigest()[:32] + '"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if _matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+        return etag
+
+    return dependency
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from enum import Enum
+from typing import Any, AsyncIterator, Callable
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionMaker
+
+settings = get_settings()
+
+
+class DataFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    DataFormat.NDJSON: "application/x-ndjson",
+    DataFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def export_response(
+    rows: Callable[[AsyncSession], AsyncIterator[Any]],
+    schema: type[BaseModel],
+    fmt: DataFormat,
+    filename: str,
+) -> StreamingResponse:
+    # The body owns its session: the request-scoped one may be closed before streaming finishes.
+    async def body() -> AsyncIterator[bytes]:
+        async with AsyncSessionMaker() as session:
+            async for chunk in _encode(rows(session), schema, fmt):
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt.value}"'},
+    )
+
+
+async def _encode(
+    rows: AsyncIterator[Any], schema: type[BaseModel], fmt: DataFormat
+) -> AsyncIterator[bytes]:
+    fields = list(schema.model_fields)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields) if fmt == DataFormat.CSV else None
+    if writer:
+        writer.writeheader()
+    pending = 0
+    async for row in rows:
+        item = schema.model_validate(row).model_dump(mode="json")
+        if writer:
+            writer.writerow(
+                {
+                    key: json.dumps(value) if isinstance(value, (dict, list)) else value
+                    for key, value in item.items()
+                }
+            )
+        else:
+            buffer.write(json.dumps(item, separators=(",", ":")))
+            buffer.write("\n")
+        pending += 1
+        if pending >= settings.export_batch_size:
+            yield _drain(buffer)
+            pending = 0
+    if buffer.tell():
+        yield _drain(buffer)
+
+
+def _drain(buffer: io.StringIO) -> bytes:
+    data = buffer.getvalue().encode()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Iterator
+
+from fastapi import UploadFile
+
+from app.api.export import DataFormat
+from app.services.imports import RawRow
+
+UNDECODABLE = "File is not UTF-8 encoded; the rest of it was not read"
+
+
+def detect_format(upload: UploadFile, fmt: DataFormat | None) -> DataFormat:
+    if fmt:
+        return fmt
+    filename = (upload.filename or "").lower()
+    if filename.endswith(".csv") or (upload.content_type or "").startswith("text/csv"):
+        return DataFormat.CSV
+    return DataFormat.NDJSON
+
+
+def read_rows(upload: UploadFile, fmt: DataFormat) -> Iterator[RawRow]:
+    """Parse the upload row by row; a decoding error ends the file with one row error."""
+    text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    rows = _csv_rows(text) if fmt == DataFormat.CSV else _ndjson_rows(text)
+    number = 0
+    try:
+        for row in rows:
+            number = row.number
+            yield row
+    except UnicodeDecodeError:
+        yield RawRow(number + 1, None, UNDECODABLE)
+
+
+def _csv_rows(text: io.TextIOWrapper) -> Iterator[RawRow]:
+    for number, record in enumerate(csv.DictReader(text), start=1):
+        yield RawRow(number, {key: value for key, value in record.items() if value != ""})
+
+
+def _ndjson_rows(text: io.TextIOWrapper) -> Iterator[RawRow]:
+    number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            data = json.loads(line)
+        except ValueError:
+            yield RawRow(number, None, "Invalid JSON")
+            continue
+        if isinstance(data, dict):
+            yield RawRow(number, data)
+        else:
+            yield RawRow(number, None, "Row must be a JSON object")
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.timing import RequestTimings, current_timings
+
+logger = logging.getLogger("app.requests")
+
+
+class ServerTimingMiddleware:
+    """Times every HTTP request and reports it in a ``Server-Timing`` header.
+
+    Pure ASGI (no BaseHTTPMiddleware), so the endpoint runs in this task and sees the
+    ``current_timings`` set here. The header is only sent to authenticated callers and never
+    under ``hidden_prefixes``: on login, timings would reveal whether a password was checked,
+    i.e. whether the account exists. Requests slower than ``slow_request_ms`` are logged
+    together with the statements they issued.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        header: bool = False,
+        hidden_prefixes: tuple[str, ...] = (),
+        slow_request_ms: float = 0,
+        max_logged_statements: int = 50,
+    ) -> None:
+        self.app = app
+        self.header = header
+        self.hidden_prefixes = hidden_prefixes
+        self.slow_request_ms = slow_request_ms
+        self.max_logged_statements = max_logged_statements
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timings = RequestTimings(
+            max_statements=self.max_logged_statements if self.slow_request_ms > 0 else 0
+        )
+        status_code = 500
+        report = self.header and self._may_report(scope)
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if report:
+                    elapsed = time.perf_counter() - timings.started
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", timings.server_timing(elapsed))
+            await send(message)
+
+        token = current_timings.set(timings)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_timings.reset(token)
+            elapsed_ms = (time.perf_counter() - timings.started) * 1000
+            if 0 < self.slow_request_ms <= elapsed_ms:
+                _log_slow(scope, status_code, elapsed_ms, timings)
+
+    def _may_report(self, scope: Scope) -> bool:
+        if scope["path"].startswith(self.hidden_prefixes):
+            return False
+        return any(name == b"authorization" for name, _ in scope["headers"])
+
+
+def _log_slow(scope: Scope, status_code: int, elapsed_ms: float, timings: RequestTimings) -> None:
+    lines = [
+        f"  {seconds * 1000:8.1f} ms  {statement}" for seconds, statement in timings.statements
+    ]
+    if timings.sql_count > len(timings.statements):
+        lines.append(f"  ... {timings.sql_count - len(timings.statements)} more statements")
+    logger.warning(
+        "slow request %s %s -> %s in %.1f ms (sql %.1f ms in %d statements, "
+        "connection wait %.1f ms, password hashing %.1f ms)\n%s",
+        scope["method"],
+        scope["path"],
+        status_code,
+        elapsed_ms,
+        timings.sql_seconds * 1000,
+        timings.sql_count,
+        timings.acquire_seconds * 1000,
+        timings.hash_seconds * 1000,
+        "\n".join(lines),
+    )
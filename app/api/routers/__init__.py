@@ -1,11 +1,23 @@
-from app.api.routers import activities, analytics, auth, contacts, deals, organizations, tasks
+from app.api.routers import (
+    activities,
+    analytics,
+    auth,
+    changes,
+    contacts,
+    deals,
+    organizations,
+    search,
+    tasks,
+)
 
 __all__ = [
     "activities",
     "analytics",
     "auth",
+    "changes",
     "contacts",
     "deals",
     "organizations",
+    "search",
     "tasks",
 ]
@@ -1,25 +1,104 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies.auth import OrganizationContext, get_current_member
+from app.api.export import DataFormat, export_response
+from app.api.responses import list_response
+from app.core.config import get_settings
 from app.db.session import get_session
+from app.models.enums import ActivityType, DealStage
 from app.schemas.activity import ActivityCreate, ActivityRead
 from app.services.activities import ActivityService
 
+settings = get_settings()
+
 router = APIRouter(prefix="/deals/{deal_id}/activities", tags=["activities"])
+feed_router = APIRouter(prefix="/activities", tags=["activities"])
+
+
+@feed_router.get("", response_model=list[ActivityRead])
+async def activity_feed(
+    request: Request,
+    response: Response,
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    type: list[ActivityType] = Query(default=[]),
+    author_id: int | None = None,
+    owner_id: int | None = Query(default=None, description="Owner of the deal"),
+    stage: DealStage | None = Query(default=None, description="Current stage of the deal"),
+    include_payload: bool = Query(True, description="Set to false to omit the JSON payload"),
+    cursor: str | None = Query(
+        default=None, description="Opaque cursor from X-Next-Cursor or X-Prev-Cursor"
+    ),
+    session: AsyncSession = Depends(get_session),
+    context: OrganizationContext = Depends(get_current_member),
+):
+    service = ActivityService(session)
+    result = await service.feed(
+        context.organization.id,
+        limit=limit,
+        types=type or None,
+        author_id=author_id,
+        owner_id=owner_id,
+        stage=stage,
+        include_payload=include_payload,
+        cursor=cursor,
+    )
+    if result.next_cursor:
+        response.headers["X-Next-Cursor"] = result.next_cursor
+    if result.prev_cursor:
+        response.headers["X-Prev-Cursor"] = result.prev_cursor
+    return list_response(request, response, result.items, ActivityRead)
 
 
 @router.get("", response_model=list[ActivityRead])
 async def list_activities(
     deal_id: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    order: str = Query("asc", pattern="^(?i)(asc|desc)$"),
+    type: list[ActivityType] = Query(default=[]),
+    author_id: int | None = None,
+    include_payload: bool = Query(True, description="Set to false to omit the JSON payload"),
+    cursor: str | None = Query(
+        default=None, description="Opaque cursor from X-Next-Cursor or X-Prev-Cursor"
+    ),
     session: AsyncSession = Depends(get_session),
     context: OrganizationContext = Depends(get_current_member),
 ):
     service = ActivityService(session)
-    activities = await service.list_for_deal(context.organization.id, deal_id)
-    return [ActivityRead.model_validate(item) for item in activities]
+    result = await service.list_for_deal(
+        context.organization.id,
+        deal_id,
+        limit=limit,
+        order=order,
+        types=type or None,
+        author_id=author_id,
+        include_payload=include_payload,
+        cursor=cursor,
+    )
+    if result.next_cursor:
+        response.headers["X-Next-Cursor"] = result.next_cursor
+    if result.prev_cursor:
+        response.headers["X-Prev-Cursor"] = result.prev_cursor
+    return list_response(request, response, result.items, ActivityRead)
+
+
+@router.get("/export")
+async def export_activities(
+    deal_id: int,
+    fmt: DataFormat = Query(DataFormat.NDJSON, alias="format"),
+    session: AsyncSession = Depends(get_session),
+    context: OrganizationContext = Depends(get_current_member),
+):
+    deal = await ActivityService(session).get_deal(context.organization.id, deal_id)
+
+    def rows(export_session: AsyncSession):
+        return ActivityService(export_session).export_for_deal(context.organization.id, deal.id)
+
+    return export_response(rows, ActivityRead, fmt, f"deal-{deal.id}-activities")
 
 
 @router.post("", response_model=ActivityRead, status_code=201)
@@ -4,14 +4,30 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies.auth import OrganizationContext, get_current_member
+from app.api.dependencies.etag import conditional_get
+from app.core.config import get_settings
 from app.db.session import get_session
-from app.schemas.analytics import DealsFunnelResponse, DealsSummaryResponse
+from app.schemas.analytics import (
+    DealsFunnelResponse,
+    DealsSummaryResponse,
+    DealsTimeseriesResponse,
+    TimeseriesBucket,
+)
 from app.services.analytics import AnalyticsService
 
+settings = get_settings()
+
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
+# Rolling windows move with the clock, so their tags also expire with the analytics cache.
+rolling_window_etag = Depends(
+    conditional_get(max_age_seconds=max(settings.analytics_cache_ttl_seconds, 1))
+)
+
 
-@router.get("/deals/summary", response_model=DealsSummaryResponse)
+@router.get(
+    "/deals/summary", response_model=DealsSummaryResponse, dependencies=[rolling_window_etag]
+)
 async def deals_summary(
     days: int = Query(30, ge=1, le=180),
     session: AsyncSession = Depends(get_session),
@@ -21,10 +37,29 @@ async def deals_summary(
     return await service.deals_summary(context.organization.id, days=days)
 
 
-@router.get("/deals/funnel", response_model=DealsFunnelResponse)
+@router.get(
+    "/deals/funnel",
+    response_model=DealsFunnelResponse,
+    dependencies=[Depends(conditional_get())],
+)
 async def deals_funnel(
     session: AsyncSession = Depends(get_session),
     context: OrganizationContext = Depends(get_current_member),
 ):
     service = AnalyticsService(session)
     return await service.deals_funnel(context.organization.id)
+
+
+@router.get(
+    "/deals/timeseries",
+    response_model=DealsTimeseriesResponse,
+    dependencies=[rolling_window_etag],
+)
+async def deals_timeseries(
+    bucket: TimeseriesBucket = Query(TimeseriesBucket.DAY),
+    days: int = Query(180, ge=1, le=366),
+    session: AsyncSession = Depends(get_session),
+    context: OrganizationContext = Depends(get_current_member),
+):
+    service = AnalyticsService(session)
+    return await service.deals_timeseries(context.organization.id, bucket=bucket, days=days)
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies.auth import OrganizationContext, get_current_member
+from app.core.config import get_settings
+from app.db.session import get_session
+from app.schemas.change import ChangesResponse
+from app.services.changes import ChangeService
+
+settings = get_settings()
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+
+@router.get("", response_model=ChangesResponse)
+async def list_changes(
+    since: int = Query(0, ge=0, description="`next_since` of the previous response"),
+    limit: int = Query(settings.max_page_size, ge=1, le=settings.max_change_page_size),
+    wait: int = Query(
+        0, ge=0, le=settings.max_change_wait_seconds, description="Long-poll for up to N seconds"
+    ),
+    session: AsyncSession = Depends(get_session),
+    context: OrganizationContext = Depends(get_current_member),
+):
+    service = ChangeService(session)
+    return await service.changes_since(
+        context.organization.id, since=since, limit=limit, wait_seconds=wait
+    )
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, File, Query, Request, Response, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies.auth import OrganizationContext, get_current_member
+from app.api.dependencies.etag import conditional_get
+from app.api.export import DataFormat, export_response
+from app.api.imports import detect_format, read_rows
+from app.api.responses import list_response, parse_fields
 from app.core.config import get_settings
 from app.db.session import get_session
-from app.schemas.contact import ContactCreate, ContactRead
+from app.schemas.contact import ContactCreate, ContactOverview, ContactRead
+from app.schemas.imports import ImportResult
 from app.services.contacts import ContactService
 
 settings = get_settings()
@@ -14,25 +19,60 @@ settings = get_settings()
 router = APIRouter(prefix="/contacts", tags=["contacts"])
 
 
-@router.get("", response_model=list[ContactRead])
+@router.get("", response_model=list[ContactRead], dependencies=[Depends(conditional_get())])
 async def list_contacts(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
     search: str | None = None,
     owner_id: int | None = Query(default=None, description="Filter by owner (admins only)"),
+    cursor: str | None = Query(default=None, description="Opaque cursor from X-Next-Cursor"),
+    ids: list[int] = Query(
+        default=[],
+        max_length=settings.max_fetch_ids,
+        description="Fetch these ids in one page; pagination parameters are ignored",
+    ),
+    fields: str | None = Query(
+        default=None, description="Comma-separated ContactRead fields to return, e.g. id,name,email"
+    ),
     session: AsyncSession = Depends(get_session),
     context: OrganizationContext = Depends(get_current_member),
 ):
+    columns = parse_fields(fields, ContactRead)
     service = ContactService(session)
-    contacts = await service.list_contacts(
+    result = await service.list_contacts(
         context.organization.id,
         role=context.membership.role,
         page=page,
         page_size=page_size,
         search=search,
         owner_id=owner_id,
+        cursor=cursor,
+        fields=columns,
+        ids=ids or None,
     )
-    return [ContactRead.model_validate(contact) for contact in contacts]
+    if result.next_cursor:
+        response.headers["X-Next-Cursor"] = result.next_cursor
+    return list_response(request, response, result.items, ContactRead, columns)
+
+
+@router.get("/export")
+async def export_contacts(
+    fmt: DataFormat = Query(DataFormat.NDJSON, alias="format"),
+    search: str | None = None,
+    owner_id: int | None = Query(default=None, description="Filter by owner (admins only)"),
+    context: OrganizationContext = Depends(get_current_member),
+):
+    def rows(session: AsyncSession):
+        return ContactService(session).export_contacts(
+            context.organization.id,
+            role=context.membership.role,
+            search=search,
+            owner_id=owner_id,
+        )
+
+    return export_response(rows, ContactRead, fmt, "contacts")
 
 
 @router.post("", response_model=ContactRead, status_code=201)
@@ -51,6 +91,29 @@ async def create_contact(
     return ContactRead.model_validate(contact)
 
 
+@router.get(
+    "/{contact_id}/overview",
+    response_model=ContactOverview,
+    dependencies=[Depends(conditional_get())],
+)
+async def contact_overview(
+    contact_id: int,
+    deal_limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    tasks_per_deal: int = Query(5, ge=0, le=settings.max_page_size),
+    activities_per_deal: int = Query(5, ge=0, le=settings.max_page_size),
+    session: AsyncSession = Depends(get_session),
+    context: OrganizationContext = Depends(get_current_member),
+):
+    service = ContactService(session)
+    return await service.overview(
+        context.organization.id,
+        contact_id,
+        deal_limit=deal_limit,
+        tasks_per_deal=tasks_per_deal,
+        activities_per_deal=activities_per_deal,
+    )
+
+
 @router.delete("/{contact_id}", status_code=204)
 async def delete_contact(
     contact_id: int,
@@ -65,3 +128,19 @@ async def delete_contact(
         requestor_id=context.membership.user_id,
     )
     return None
+
+
+@router.post("/import", response_model=ImportResult)
+async def import_contacts(
+    file: UploadFile = File(...),
+    fmt: DataFormat | None = Query(default=None, alias="format"),
+    session: AsyncSession = Depends(get_session),
+    context: OrganizationContext = Depends(get_current_member),
+):
+    service = ContactService(session)
+    return await service.import_contacts(
+        context.organization.id,
+        role=context.membership.role,
+        requestor_id=context.membership.user_id,
+        rows=read_rows(file, detect_format(file, fmt)),
+    )
@@ -2,14 +2,26 @@ from __future__ import annotations
 
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, File, Query, Request, Response, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies.auth import OrganizationContext, get_current_member
+from app.api.dependencies.etag import conditional_get
+from app.api.export import DataFormat, export_response
+from app.api.imports import detect_format, read_rows
+from app.api.responses import encoded_response, parse_fields, parse_include, to_items
 from app.core.config import get_settings
 from app.db.session import get_session
 from app.models.enums import DealStage, DealStatus
-from app.schemas.deal import DealCreate, DealRead, DealUpdate
+from app.schemas.deal import (
+    DealBatchUpdate,
+    DealCreate,
+    DealInclude,
+    DealListItem,
+    DealRead,
+    DealUpdate,
+)
+from app.schemas.imports import ImportResult
 from app.services.deals import DealService
 
 settings = get_settings()
@@ -17,8 +29,10 @@ settings = get_settings()
 router = APIRouter(prefix="/deals", tags=["deals"])
 
 
-@router.get("", response_model=list[DealRead])
+@router.get("", response_model=list[DealListItem], dependencies=[Depends(conditional_get())])
 async def list_deals(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
     status: list[DealStatus] = Query(default=[]),
@@ -28,11 +42,31 @@ async def list_deals(
     owner_id: int | None = Query(default=None, description="Filter by owner (admins only)"),
     order_by: str = Query("created_at"),
     order: str = Query("desc", pattern="^(?i)(asc|desc)$"),
+    cursor: str | None = Query(default=None, description="Opaque cursor from X-Next-Cursor"),
+    ids: list[int] = Query(
+        default=[],
+        max_length=settings.max_fetch_ids,
+        description="Fetch these ids in one page; pagination parameters are ignored",
+    ),
+    fields: str | None = Query(
+        default=None, description="Comma-separated DealRead fields to return, e.g. id,title"
+    ),
+    include: str | None = Query(
+        default=None,
+        description="Comma-separated related resources: "
+        + ",".join(choice.value for choice in DealInclude),
+    ),
     session: AsyncSession = Depends(get_session),
     context: OrganizationContext = Depends(get_current_member),
 ):
+    columns = parse_fields(fields, DealRead)
+    embeds = parse_include(include, DealInclude)
+    selected = columns
+    if columns and embeds:
+        # the foreign keys are needed to look up the embedded rows even when not returned
+        selected = (*columns, "contact_id", "owner_id")
     service = DealService(session)
-    deals = await service.list_deals(
+    result = await service.list_deals(
         context.organization.id,
         role=context.membership.role,
         page=page,
@@ -44,8 +78,42 @@ async def list_deals(
         owner_id=owner_id,
         order_by=order_by,
         order=order,
+        cursor=cursor,
+        fields=selected,
+        ids=ids or None,
     )
-    return [DealRead.model_validate(deal) for deal in deals]
+    if result.next_cursor:
+        response.headers["X-Next-Cursor"] = result.next_cursor
+    items = to_items(result.items, DealRead, columns)
+    if embeds:
+        embedded = await service.embed(context.organization.id, result.items, embeds)
+        for item, deal in zip(items, result.items):
+            item.update(embedded[deal.id])
+    return encoded_response(request, response, items)
+
+
+@router.get("/export")
+async def export_deals(
+    fmt: DataFormat = Query(DataFormat.NDJSON, alias="format"),
+    status: list[DealStatus] = Query(default=[]),
+    min_amount: Decimal | None = Query(default=None, ge=0),
+    max_amount: Decimal | None = Query(default=None, ge=0),
+    stage: DealStage | None = None,
+    owner_id: int | None = Query(default=None, description="Filter by owner (admins only)"),
+    context: OrganizationContext = Depends(get_current_member),
+):
+    def rows(session: AsyncSession):
+        return DealService(session).export_deals(
+            context.organization.id,
+            role=context.membership.role,
+            statuses=status or None,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            stage=stage,
+            owner_id=owner_id,
+        )
+
+    return export_response(rows, DealRead, fmt, "deals")
 
 
 @router.post("", response_model=DealRead, status_code=201)
@@ -64,6 +132,22 @@ async def create_deal(
     return DealRead.model_validate(deal)
 
 
+@router.patch("/batch", response_model=list[DealRead])
+async def update_deals(
+    payload: DealBatchUpdate,
+    session: AsyncSession = Depends(get_session),
+    context: OrganizationContext = Depends(get_current_member),
+):
+    service = DealService(session)
+    deals = await service.update_deals(
+        context.organization.id,
+        user_id=context.membership.user_id,
+        role=context.membership.role,
+        updates=payload.updates(),
+    )
+    return [DealRead.model_validate(deal) for deal in deals]
+
+
 @router.patch("/{deal_id}", response_model=DealRead)
 async def update_deal(
     deal_id: int,
@@ -80,3 +164,19 @@ async def update_deal(
         data=payload,
     )
     return DealRead.model_validate(deal)
+
+
+@router.post("/import", response_model=ImportResult)
+async def import_deals(
+    file: UploadFile = File(...),
+    fmt: DataFormat | None = Query(default=None, alias="format"),
+    session: AsyncSession = Depends(get_session),
+    context: OrganizationContext = Depends(get_current_member),
+):
+    service = DealService(session)
+    return await service.import_deals(
+        context.organization.id,
+        role=context.membership.role,
+        requestor_id=context.membership.user_id,
+        rows=read_rows(file, detect_format(file, fmt)),
+    )
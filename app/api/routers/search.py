@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies.auth import OrganizationContext, get_current_member
+from app.core.config import get_settings
+from app.db.session import get_session
+from app.schemas.search import SearchResponse
+from app.services.search import SearchService
+
+settings = get_settings()
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    session: AsyncSession = Depends(get_session),
+    context: OrganizationContext = Depends(get_current_member),
+):
+    service = SearchService(session)
+    return await service.search(context.organization.id, q, limit=limit)
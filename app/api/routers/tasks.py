@@ -2,35 +2,89 @@ from __future__ import annotations
 
 from datetime import date, datetime, time, timezone
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies.auth import OrganizationContext, get_current_member
+from app.api.dependencies.etag import conditional_get
+from app.api.export import DataFormat, export_response
+from app.api.responses import list_response, parse_fields
+from app.core.config import get_settings
 from app.db.session import get_session
 from app.schemas.task import TaskCreate, TaskRead, TaskUpdate
 from app.services.tasks import TaskService
 
+settings = get_settings()
+
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
-@router.get("", response_model=list[TaskRead])
+@router.get("", response_model=list[TaskRead], dependencies=[Depends(conditional_get())])
 async def list_tasks(
+    request: Request,
+    response: Response,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
     deal_id: int | None = None,
     only_open: bool = False,
     due_before: date | None = Query(default=None),
     due_after: date | None = Query(default=None),
+    owner_id: int | None = Query(default=None, description="Filter by deal owner (admins only)"),
+    cursor: str | None = Query(default=None, description="Opaque cursor from X-Next-Cursor"),
+    ids: list[int] = Query(
+        default=[],
+        max_length=settings.max_fetch_ids,
+        description="Fetch these ids in one page; pagination parameters are ignored",
+    ),
+    fields: str | None = Query(
+        default=None, description="Comma-separated TaskRead fields to return, e.g. id,title"
+    ),
     session: AsyncSession = Depends(get_session),
     context: OrganizationContext = Depends(get_current_member),
 ):
+    columns = parse_fields(fields, TaskRead)
     service = TaskService(session)
-    tasks = await service.list_tasks(
+    result = await service.list_tasks(
         context.organization.id,
+        role=context.membership.role,
+        page=page,
+        page_size=page_size,
         deal_id=deal_id,
         only_open=only_open,
         due_before=_to_datetime(due_before, end_of_day=True),
         due_after=_to_datetime(due_after, end_of_day=False),
+        owner_id=owner_id,
+        cursor=cursor,
+        fields=columns,
+        ids=ids or None,
     )
-    return [TaskRead.model_validate(task) for task in tasks]
+    if result.next_cursor:
+        response.headers["X-Next-Cursor"] = result.next_cursor
+    return list_response(request, response, result.items, TaskRead, columns)
+
+
+@router.get("/export")
+async def export_tasks(
+    fmt: DataFormat = Query(DataFormat.NDJSON, alias="format"),
+    deal_id: int | None = None,
+    only_open: bool = False,
+    due_before: date | None = Query(default=None),
+    due_after: date | None = Query(default=None),
+    owner_id: int | None = Query(default=None, description="Filter by deal owner (admins only)"),
+    context: OrganizationContext = Depends(get_current_member),
+):
+    def rows(session: AsyncSession):
+        return TaskService(session).export_tasks(
+            context.organization.id,
+            role=context.membership.role,
+            deal_id=deal_id,
+            only_open=only_open,
+            due_before=_to_datetime(due_before, end_of_day=True),
+            due_after=_to_datetime(due_after, end_of_day=False),
+            owner_id=owner_id,
+        )
+
+    return export_response(rows, TaskRead, fmt, "tasks")
 
 
 @router.post("", response_model=TaskRead, status_code=201)
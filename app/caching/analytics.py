@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Awaitable, Callable, TypeVar
+
+from pydantic import BaseModel
+
+from app.caching.backends import CacheBackend, CacheBackendError, create_backend
+from app.caching.memory import SingleFlightCache
+from app.core.config import get_settings
+
+M = TypeVar("M", bound=BaseModel)
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+class AnalyticsCache:
+    """Analytics responses stored as JSON in a (possibly shared) backend.
+
+    Keys embed the organization's generation, so an invalidation from any worker makes every
+    worker miss on its next read. Concurrent misses within a worker share one computation.
+    """
+
+    def __init__(self, backend: CacheBackend) -> None:
+        self.backend = backend
+        # ttl=0: only coalesces in-flight computations, the backend holds the values
+        self._inflight: SingleFlightCache[Any] = SingleFlightCache(max_entries=0)
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get_or_compute(
+        self,
+        organization_id: int,
+        name: str,
+        schema: type[M],
+        factory: Callable[[], Awaitable[M]],
+        ttl_seconds: float,
+    ) -> M:
+        try:
+            generation = await self.backend.generation(_tag(organization_id))
+        except (CacheBackendError, OSError):
+            self._failed("read generation")
+            return await factory()
+        key = f"analytics:{organization_id}:{generation}:{name}"
+
+        async def load() -> M:
+            try:
+                raw = await self.backend.get(key)
+            except (CacheBackendError, OSError):
+                self._failed("read")
+                raw = None
+            if raw is not None:
+                self.hits += 1
+                return schema.model_validate_json(raw)
+            self.misses += 1
+            value = await factory()
+            try:
+                await self.backend.set(key, value.model_dump_json().encode(), ttl_seconds)
+            except (CacheBackendError, OSError):
+                self._failed("write")
+            return value
+
+        return await self._inflight.get_or_compute(key, load, 0)
+
+    async def invalidate_organization(self, organization_id: int) -> None:
+        try:
+            await self.backend.bump(_tag(organization_id))
+        except (CacheBackendError, OSError):
+            self._failed("invalidate")
+
+    async def clear(self) -> None:
+        self._inflight.clear()
+        await self.backend.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": self.backend.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "coalesced": self._inflight.coalesced,
+            "inflight": self._inflight.stats()["inflight"],
+            **{f"backend_{key}": value for key, value in self.backend.stats().items()},
+        }
+
+    def _failed(self, operation: str) -> None:
+        # a broken cache must not break analytics; serve from the database instead
+        self.errors += 1
+        logger.warning("analytics cache %s failed", operation, exc_info=True)
+
+
+def _tag(organization_id: int) -> str:
+    return f"org:{organization_id}"
+
+
+analytics_cache = AnalyticsCache(create_backend(settings))
+
+
+async def invalidate_organization(organization_id: int) -> None:
+    await analytics_cache.invalidate_organization(organization_id)
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any
+from urllib.parse import urlparse
+
+from app.caching.memory import LRUTTLCache
+from app.core.config import Settings
+
+
+class CacheBackendError(RuntimeError):
+    pass
+
+
+class CacheBackend(ABC):
+    """Byte store shared by the analytics cache.
+
+    Tags carry integer generations: bumping a tag's generation orphans every key built with
+    the previous one, which is how invalidation reaches all workers without key scans.
+    """
+
+    name: str
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None: ...
+
+    @abstractmethod
+    async def generation(self, tag: str) -> int: ...
+
+    @abstractmethod
+    async def bump(self, tag: str) -> int: ...
+
+    async def purge_expired(self) -> int:
+        return 0
+
+    async def clear(self) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+    def stats(self) -> dict[str, Any]:
+        return {}
+
+
+class MemoryBackend(CacheBackend):
+    name = "memory"
+
+    def __init__(self, max_entries: int) -> None:
+        self.entries: LRUTTLCache[bytes] = LRUTTLCache(max_entries)
+        self._generations: dict[str, int] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self.entries.set(key, value, ttl_seconds)
+
+    async def generation(self, tag: str) -> int:
+        return self._generations.get(tag, 0)
+
+    async def bump(self, tag: str) -> int:
+        self._generations[tag] = self._generations.get(tag, 0) + 1
+        return self._generations[tag]
+
+    async def purge_expired(self) -> int:
+        return self.entries.purge_expired()
+
+    async def clear(self) -> None:
+        self.entries.clear()
+        self._generations.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return self.entries.stats()
+
+
+class SQLiteBackend(CacheBackend):
+    """Cache in a SQLite file that every worker on the host opens (WAL, so readers never block)."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, *, timeout_seconds: float) -> None:
+        self._conn = sqlite3.connect(
+            path, timeout=timeout_seconds, check_same_thread=False, isolation_level=None
+        )
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_generations "
+                "(tag TEXT PRIMARY KEY, generation INTEGER NOT NULL)"
+            )
+
+    def _run(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            try:
+                return self._conn.execute(sql, params).fetchall()
+            except sqlite3.Error as exc:
+                raise CacheBackendError(str(exc)) from exc
+
+    async def _execute(self, sql: str, params: tuple = ()) -> list[tuple]:
+        return await asyncio.to_thread(self._run, sql, params)
+
+    async def get(self, key: str) -> bytes | None:
+        rows = await self._execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?", (key, time.time())
+        )
+        return rows[0][0] if rows else None
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        if ttl_seconds <= 0:
+            return
+        await self._execute(
+            "INSERT INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE "
+            "SET value = excluded.value, expires_at = excluded.expires_at",
+            (key, value, time.time() + ttl_seconds),
+        )
+
+    async def generation(self, tag: str) -> int:
+        rows = await self._execute("SELECT generation FROM cache_generations WHERE tag = ?", (tag,))
+        return rows[0][0] if rows else 0
+
+    async def bump(self, tag: str) -> int:
+        rows = await self._execute(
+            "INSERT INTO cache_generations (tag, generation) VALUES (?, 1) "
+            "ON CONFLICT (tag) DO UPDATE SET generation = generation + 1 RETURNING generation",
+            (tag,),
+        )
+        return rows[0][0]
+
+    async def purge_expired(self) -> int:
+        rows = await self._execute(
+            "DELETE FROM cache_entries WHERE expires_at <= ? RETURNING key", (time.time(),)
+        )
+        return len(rows)
+
+    async def clear(self) -> None:
+        await self._execute("DELETE FROM cache_entries")
+        await self._execute("DELETE FROM cache_generations")
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RedisBackend(CacheBackend):
+    """Minimal RESP2 client: one connection per worker, commands serialized on a lock.
+
+    All keys live under ``key_prefix`` so the cache can share a Redis database with other data.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self, url: str, *, timeout_seconds: float, key_prefix: str = "mini-crm:cache:"
+    ) -> None:
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout_seconds = timeout_seconds
+        self.key_prefix = key_prefix
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock = asyncio.Lock()
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.command("GET", self.key_prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        if ttl_seconds <= 0:
+            return
+        ttl_ms = max(int(ttl_seconds * 1000), 1)
+        await self.command("SET", self.key_prefix + key, value, "PX", ttl_ms)
+
+    async def generation(self, tag: str) -> int:
+        value = await self.command("GET", f"{self.key_prefix}gen:{tag}")
+        return int(value) if value is not None else 0
+
+    async def bump(self, tag: str) -> int:
+        return await self.command("INCR", f"{self.key_prefix}gen:{tag}")
+
+    async def clear(self) -> None:
+        # SCAN + DEL over our prefix only; FLUSHDB would take other tenants of the database too
+        pattern = _glob_escape(self.key_prefix) + "*"
+        cursor = b"0"
+        while True:
+            cursor, keys = await self.command("SCAN", cursor, "MATCH", pattern, "COUNT", 500)
+            if keys:
+                await self.command("DEL", *keys)
+            if cursor == b"0":
+                return
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._disconnect()
+
+    async def command(self, *args: str | bytes | int) -> Any:
+        async with self._lock:
+            for attempt in (1, 2):
+                try:
+                    if self._writer is None:
+                        await self._connect()
+                    return await asyncio.wait_for(self._roundtrip(args), self.timeout_seconds)
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as exc:
+                    await self._disconnect()
+                    if attempt == 2:
+                        raise CacheBackendError(f"redis unavailable: {exc!r}") from exc
+                except CacheBackendError:
+                    raise  # an error reply: the exchange completed, the connection is fine
+                except BaseException:
+                    # Cancelled (or failed) between write and read: the reply is still in
+                    # flight, and the next command would read it as its own. Drop the socket.
+                    self._abort()
+                    raise
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout_seconds
+        )
+        if self.password:
+            await self._roundtrip(("AUTH", self.password))
+        if self.db:
+            await self._roundtrip(("SELECT", self.db))
+
+    def _abort(self) -> None:
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+
+    async def _disconnect(self) -> None:
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def _roundtrip(self, args: tuple) -> Any:
+        assert self._reader is not None and self._writer is not None
+        self._writer.write(encode_command(*args))
+        await self._writer.drain()
+        return await read_reply(self._reader)
+
+
+def _glob_escape(value: str) -> str:
+    return "".join(f"\\{char}" if char in "*?[]\\" else char for char in value)
+
+
+def encode_command(*args: str | bytes | int) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    line = (await reader.readuntil(b"\r\n"))[:-2]
+    kind, rest = line[:1], line[1:]
+    if kind == b"+":
+        return rest.decode()
+    if kind == b"-":
+        raise CacheBackendError(rest.decode())
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        length = int(rest)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if kind == b"*":
+        length = int(rest)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise CacheBackendError(f"unexpected reply {line!r}")
+
+
+def create_backend(settings: Settings) -> CacheBackend:
+    config = settings.cache
+    if config.backend == "sqlite":
+        return SQLiteBackend(config.url or "cache.sqlite3", timeout_seconds=config.timeout_seconds)
+    if config.backend == "redis":
+        return RedisBackend(
+            config.url or "redis://localhost:6379/0",
+            timeout_seconds=config.timeout_seconds,
+            key_prefix=config.key_prefix,
+        )
+    return MemoryBackend(settings.analytics_cache_max_entries)
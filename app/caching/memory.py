@@ -1,25 +1,158 @@
 from __future__ import annotations
 
+import asyncio
+import inspect
+import logging
 import time
-from typing import Dict, Generic, Hashable, TypeVar
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Generic, Hashable, Iterable, TypeVar
 
 T = TypeVar("T")
 
+logger = logging.getLogger(__name__)
 
-class SimpleTTLCache(Generic[T]):
-    def __init__(self) -> None:
-        self._store: Dict[Hashable, tuple[float, T]] = {}
+
+class LRUTTLCache(Generic[T]):
+    """Bounded LRU cache whose entries also expire after a per-entry TTL."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._store: OrderedDict[Hashable, tuple[float, T]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._store)
 
     def get(self, key: Hashable) -> T | None:
-        now = time.time()
         item = self._store.get(key)
-        if not item:
+        if item is None:
+            self.misses += 1
             return None
         expires, value = item
-        if expires > now:
-            return value
+        if expires <= time.monotonic():
+            del self._store[key]
+            self.misses += 1
+            self.expirations += 1
+            return None
+        self._store.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: T, ttl_seconds: float) -> None:
+        if self.max_entries <= 0 or ttl_seconds <= 0:
+            return
+        self._store[key] = (time.monotonic() + ttl_seconds, value)
+        self._store.move_to_end(key)
+        while len(self._store) > self.max_entries:
+            self._store.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
         self._store.pop(key, None)
-        return None
 
-    def set(self, key: Hashable, value: T, ttl_seconds: int) -> None:
-        self._store[key] = (time.time() + ttl_seconds, value)
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        keys = [key for key in self._store if predicate(key)]
+        for key in keys:
+            del self._store[key]
+        return len(keys)
+
+    def purge_expired(self) -> int:
+        now = time.monotonic()
+        expired = [key for key, (expires, _) in self._store.items() if expires <= now]
+        for key in expired:
+            del self._store[key]
+        self.expirations += len(expired)
+        return len(expired)
+
+    def clear(self) -> None:
+        self._store.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._store),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class SingleFlightCache(LRUTTLCache[T]):
+    """LRU/TTL cache where concurrent misses of one key share a single computation."""
+
+    def __init__(self, max_entries: int) -> None:
+        super().__init__(max_entries)
+        self._inflight: dict[Hashable, asyncio.Future[T]] = {}
+        self.coalesced = 0
+
+    async def get_or_compute(
+        self, key: Hashable, factory: Callable[[], Awaitable[T]], ttl_seconds: float
+    ) -> T:
+        while True:
+            value = self.get(key)
+            if value is not None:
+                return value
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # the computing request went away; the next waiter takes over
+
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await factory()
+        except BaseException as exc:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if isinstance(exc, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(exc)
+                future.exception()  # waiters re-raise it; don't warn when there are none
+            raise
+        # an invalidation during the computation drops the in-flight entry: serve, don't store
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+            self.set(key, value, ttl_seconds)
+        future.set_result(value)
+        return value
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        for key in [key for key in self._inflight if predicate(key)]:
+            del self._inflight[key]
+        return super().invalidate(predicate)
+
+    def pop(self, key: Hashable) -> None:
+        self._inflight.pop(key, None)
+        super().pop(key)
+
+    def clear(self) -> None:
+        self._inflight.clear()
+        super().clear()
+
+    def stats(self) -> dict[str, int]:
+        return {**super().stats(), "coalesced": self.coalesced, "inflight": len(self._inflight)}
+
+
+async def sweep_expired(caches: Iterable[Any], interval_seconds: float) -> None:
+    """Drop expired entries that are never read again, so they do not hold LRU slots."""
+    caches = list(caches)
+    while True:
+        await asyncio.sleep(interval_seconds)
+        for cache in caches:
+            try:
+                purged = cache.purge_expired()
+                if inspect.isawaitable(purged):
+                    await purged
+            except Exception:  # pragma: no cover - the sweep must outlive a bad cache
+                logger.exception("cache sweep failed")
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.caching.memory import LRUTTLCache
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# (user_id, organization_id) -> OrganizationContext, shared by every request of this process.
+membership_cache: LRUTTLCache[Any] = LRUTTLCache(settings.auth_cache_max_entries)
+# user_id -> users.membership_version, used to validate membership claims embedded in tokens.
+membership_version_cache: LRUTTLCache[int] = LRUTTLCache(settings.auth_cache_max_entries)
+
+# session.info key: (user_id, organization_id) pairs whose membership changed in the transaction
+CHANGED_MEMBERSHIPS = "changed_memberships"
+
+
+def invalidate_membership(user_id: int, organization_id: int | None = None) -> None:
+    membership_version_cache.pop(user_id)
+    if organization_id is not None:
+        membership_cache.pop((user_id, organization_id))
+        return
+    membership_cache.invalidate(lambda key: key[0] == user_id)
+
+
+# Invalidating before the commit lets a concurrent request re-cache the old rows until the TTL.
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_memberships(session: Session) -> None:
+    for user_id, organization_id in session.info.pop(CHANGED_MEMBERSHIPS, ()):
+        invalidate_membership(user_id, organization_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_memberships(session: Session) -> None:
+    session.info.pop(CHANGED_MEMBERSHIPS, None)
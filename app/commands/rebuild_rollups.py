@@ -0,0 +1,37 @@
+"""Recompute the ``deal_stats`` and ``deal_daily_stats`` rollups to repair drift.
+
+``deal_stats`` comes from ``deals``; the daily flows come from ``deals`` and their
+STATUS_CHANGED activities, by the same rules the write path applies.
+
+Usage::
+
+    python -m app.commands.rebuild_rollups [--organization-id ID]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from app.db.session import AsyncSessionMaker, engine
+from app.repositories.deal_stats_repository import DealStatsRepository
+
+
+async def rebuild(organization_id: int | None = None) -> int:
+    async with AsyncSessionMaker() as session:
+        written = await DealStatsRepository(session).rebuild(organization_id)
+        await session.commit()
+    return written
+
+
+async def main(organization_id: int | None) -> None:
+    written = await rebuild(organization_id)
+    scope = "all organizations" if organization_id is None else f"organization {organization_id}"
+    print(f"deal_stats and deal_daily_stats rebuilt for {scope}: {written} rows")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--organization-id", type=int, default=None)
+    asyncio.run(main(parser.parse_args().organization_id))
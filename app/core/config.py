@@ -12,6 +12,17 @@ class TokenConfig(BaseModel):
     algorithm: Literal["HS256"] = "HS256"
     access_token_expire_minutes: int = 30
     refresh_token_expire_minutes: int = 60 * 24
+    decode_cache_size: int = 4096
+    embed_memberships: bool = False
+
+
+class CacheConfig(BaseModel):
+    backend: Literal["memory", "sqlite", "redis"] = "memory"
+    # sqlite: path of the file shared by all workers; redis: redis://[:password@]host:port/db
+    url: str = ""
+    timeout_seconds: float = 0.5
+    # redis: every key gets this prefix; clear() deletes only keys under it
+    key_prefix: str = "mini-crm:cache:"
 
 
 class Settings(BaseSettings):
@@ -24,9 +35,28 @@ class Settings(BaseSettings):
         description="SQLAlchemy compatible database URL",
     )
     token: TokenConfig = TokenConfig()
+    cache: CacheConfig = CacheConfig()
     default_page_size: int = 20
     max_page_size: int = 100
+    export_batch_size: int = 1000
+    import_chunk_size: int = 1000
+    import_max_errors: int = 1000
+    max_batch_size: int = 200
+    max_fetch_ids: int = 500
+    max_change_page_size: int = 1000
+    max_change_wait_seconds: int = 30
     analytics_cache_ttl_seconds: int = 60
+    analytics_cache_max_entries: int = 1024
+    cache_sweep_interval_seconds: int = 30
+    auth_cache_ttl_seconds: int = 30
+    auth_cache_max_entries: int = 10_000
+    password_hash_workers: int = 4
+    password_hash_max_concurrency: int = 16
+    server_timing_header: bool = False
+    slow_request_threshold_ms: int = Field(
+        default=1000, description="Log requests slower than this (0 disables the log)"
+    )
+    slow_request_max_statements: int = 50
 
 
 @lru_cache
@@ -1,26 +1,57 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict
+from typing import Any, Callable, Dict, TypeVar
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from pydantic import BaseModel
 
+from app.caching.memory import LRUTTLCache
 from app.core.config import get_settings
+from app.core.timing import track_hashing
+from app.models.enums import MemberRole
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+R = TypeVar("R")
+
+# bcrypt holds the calling thread for tens of milliseconds, so it runs on a dedicated pool and
+# callers beyond ``password_hash_max_concurrency`` are rejected instead of queueing up.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=get_settings().password_hash_workers, thread_name_prefix="password-hash"
+)
+_hash_slots = asyncio.Semaphore(get_settings().password_hash_max_concurrency)
+
+
+class PasswordHasherBusy(RuntimeError):
+    pass
+
 
 class TokenPayload(BaseModel):
     sub: str
     token_type: str
     exp: datetime
+    orgs: Dict[str, MemberRole] | None = None
+    mv: int | None = None
 
 
-def create_token(subject: str, token_type: str, expires_delta: timedelta) -> str:
+# sha256(token) -> verified payload; entries never outlive the token's own ``exp``.
+verified_token_cache: LRUTTLCache[TokenPayload] = LRUTTLCache(get_settings().token.decode_cache_size)
+
+
+def create_token(
+    subject: str,
+    token_type: str,
+    expires_delta: timedelta,
+    extra_claims: Dict[str, Any] | None = None,
+) -> str:
     settings = get_settings()
     payload: Dict[str, Any] = {
+        **(extra_claims or {}),
         "sub": subject,
         "token_type": token_type,
         "exp": datetime.now(tz=timezone.utc) + expires_delta,
@@ -33,6 +64,19 @@ def create_token(subject: str, token_type: str, expires_delta: timedelta) -> str
 
 
 def decode_token(token: str) -> TokenPayload:
+    key = hashlib.sha256(token.encode()).digest()
+    cached = verified_token_cache.get(key)
+    if cached is not None:
+        if cached.exp > datetime.now(tz=timezone.utc):
+            return cached
+        verified_token_cache.pop(key)
+    payload = _verify_token(token)
+    ttl = (payload.exp - datetime.now(tz=timezone.utc)).total_seconds()
+    verified_token_cache.set(key, payload, ttl)
+    return payload
+
+
+def _verify_token(token: str) -> TokenPayload:
     settings = get_settings()
     try:
         payload = jwt.decode(
@@ -51,3 +95,20 @@ def get_password_hash(password: str) -> str:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_hasher(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hasher(verify_password, plain_password, hashed_password)
+
+
+async def _run_hasher(func: Callable[..., R], *args: Any) -> R:
+    if _hash_slots.locked():
+        raise PasswordHasherBusy("Too many concurrent password operations")
+    async with _hash_slots:
+        loop = asyncio.get_running_loop()
+        with track_hashing():
+            return await loop.run_in_executor(_hash_executor, func, *args)
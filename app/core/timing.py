@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass
+class RequestTimings:
+    """What one request spent its time on; filled in by the engine hooks and the hasher."""
+
+    started: float = field(default_factory=time.perf_counter)
+    max_statements: int = 0
+    sql_count: int = 0
+    sql_seconds: float = 0.0
+    acquire_count: int = 0
+    acquire_seconds: float = 0.0
+    hash_seconds: float = 0.0
+    statements: list[tuple[float, str]] = field(default_factory=list)
+
+    def add_statement(self, seconds: float, statement: str) -> None:
+        self.sql_count += 1
+        self.sql_seconds += seconds
+        if len(self.statements) < self.max_statements:
+            self.statements.append((seconds, " ".join(statement.split())))
+
+    def server_timing(self, total_seconds: float) -> str:
+        waited = self.sql_seconds + self.acquire_seconds + self.hash_seconds
+        metrics = [
+            f'db;dur={_ms(self.sql_seconds)};desc="{self.sql_count} queries"',
+            f"db-acquire;dur={_ms(self.acquire_seconds)}",
+        ]
+        if self.hash_seconds:
+            metrics.append(f"hash;dur={_ms(self.hash_seconds)}")
+        metrics.append(f"app;dur={_ms(max(total_seconds - waited, 0.0))}")
+        metrics.append(f"total;dur={_ms(total_seconds)}")
+        return ", ".join(metrics)
+
+
+current_timings: ContextVar[RequestTimings | None] = ContextVar("current_timings", default=None)
+
+
+@contextmanager
+def track_hashing() -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = current_timings.get()
+        if timings is not None:
+            timings.hash_seconds += time.perf_counter() - start
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attribute statement time and connection-acquire waits to the current request.
+
+    SQLAlchemy runs the sync engine inside greenlets that share the caller's context, so the
+    request's ``current_timings`` is visible from the event hooks.
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        conn.info.setdefault("timing_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _stop(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        started = conn.info["timing_started"].pop()
+        timings = current_timings.get()
+        if timings is not None:
+            timings.add_statement(time.perf_counter() - started, statement)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _failed(context: Any) -> None:
+        if context.cursor is None or context.connection is None:
+            return
+        pending = context.connection.info.get("timing_started")
+        if pending:
+            pending.pop()
+
+    # There is no pool event fired *before* a checkout, so the wait is timed around the
+    # engine's own entry point to the pool (it also covers opening a new connection).
+    raw_connection = sync_engine.raw_connection
+
+    def timed_raw_connection() -> Any:
+        start = time.perf_counter()
+        try:
+            return raw_connection()
+        finally:
+            timings = current_timings.get()
+            if timings is not None:
+                timings.acquire_count += 1
+                timings.acquire_seconds += time.perf_counter() - start
+
+    sync_engine.raw_connection = timed_raw_connection  # type: ignore[method-assign]
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f}"
@@ -3,10 +3,12 @@ from __future__ import annotations
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.core.config import get_settings
+from app.core.timing import instrument_engine
 
 settings = get_settings()
 
 engine = create_async_engine(settings.database_url, echo=False, future=True)
+instrument_engine(engine)
 AsyncSessionMaker = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 
@@ -1,13 +1,60 @@
 from __future__ import annotations
 
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import Any, AsyncIterator
+
 from fastapi import APIRouter, FastAPI
 
-from app.api.routers import activities, analytics, auth, contacts, deals, organizations, tasks
+from app.api.middleware import ServerTimingMiddleware
+from app.api.routers import (
+    activities,
+    analytics,
+    auth,
+    changes,
+    contacts,
+    deals,
+    organizations,
+    search,
+    tasks,
+)
+from app.caching.analytics import analytics_cache
+from app.caching.memory import sweep_expired
+from app.caching.principals import membership_cache, membership_version_cache
 from app.core.config import get_settings
+from app.core.security import verified_token_cache
 
 settings = get_settings()
 
-app = FastAPI(title=settings.app_name, version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    sweeper = asyncio.create_task(
+        sweep_expired(
+            [
+                analytics_cache.backend,
+                membership_cache,
+                membership_version_cache,
+                verified_token_cache,
+            ],
+            settings.cache_sweep_interval_seconds,
+        )
+    )
+    yield
+    sweeper.cancel()
+    with suppress(asyncio.CancelledError):
+        await sweeper
+    await analytics_cache.backend.close()
+
+
+app = FastAPI(title=settings.app_name, version="0.1.0", lifespan=lifespan)
+app.add_middleware(
+    ServerTimingMiddleware,
+    header=settings.server_timing_header,
+    hidden_prefixes=(f"{settings.api_v1_prefix}/auth/",),
+    slow_request_ms=settings.slow_request_threshold_ms,
+    max_logged_statements=settings.slow_request_max_statements,
+)
 
 api_v1 = APIRouter(prefix=settings.api_v1_prefix)
 
@@ -17,7 +64,10 @@ api_v1.include_router(contacts.router)
 api_v1.include_router(deals.router)
 api_v1.include_router(tasks.router)
 api_v1.include_router(activities.router)
+api_v1.include_router(activities.feed_router)
 api_v1.include_router(analytics.router)
+api_v1.include_router(search.router)
+api_v1.include_router(changes.router)
 
 app.include_router(api_v1)
 
@@ -25,3 +75,12 @@ app.include_router(api_v1)
 @app.get("/health")
 async def health() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/health/caches")
+async def cache_stats() -> dict[str, dict[str, Any]]:
+    return {
+        "analytics": analytics_cache.stats(),
+        "membership": membership_cache.stats(),
+        "verified_tokens": verified_token_cache.stats(),
+    }
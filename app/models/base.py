@@ -3,15 +3,25 @@ from __future__ import annotations
 from datetime import datetime
 
 from sqlalchemy import DateTime, func
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+# SQLite stores CURRENT_TIMESTAMP defaults with whole seconds; bind Python values in the same
+# format so server-generated timestamps compare equal to values read back (keyset cursors).
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
+
 
 class Base(DeclarativeBase):
     pass
 
 
 class TimestampMixin:
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(Timestamp, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+        Timestamp, server_default=func.now(), onupdate=func.now()
     )
@@ -30,3 +30,16 @@ class ActivityType(str, Enum):
     STAGE_CHANGED = "stage_changed"
     TASK_CREATED = "task_created"
     SYSTEM = "system"
+
+
+class ChangeEntity(str, Enum):
+    DEAL = "deal"
+    CONTACT = "contact"
+    TASK = "task"
+    ACTIVITY = "activity"
+
+
+class ChangeOp(str, Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
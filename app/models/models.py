@@ -1,26 +1,50 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
+from enum import Enum as PyEnum
 
 from sqlalchemy import (
     JSON,
+    BigInteger,
     Boolean,
     CheckConstraint,
     Date,
-    DateTime,
     Enum,
     ForeignKey,
+    Index,
+    Integer,
     Numeric,
     String,
     Text,
     UniqueConstraint,
     func,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import Base
-from app.models.enums import ActivityType, DealStage, DealStatus, MemberRole
+from app.models.base import Base, Timestamp
+from app.models.enums import (
+    ActivityType,
+    ChangeEntity,
+    ChangeOp,
+    DealStage,
+    DealStatus,
+    MemberRole,
+)
+
+
+def _values(enum: type[PyEnum]) -> list[str]:
+    # the migrations declare the database enums with the values, not the member names
+    return [member.value for member in enum]
+
+
+member_role_enum = Enum(MemberRole, name="member_role_enum", values_callable=_values)
+deal_status_enum = Enum(DealStatus, name="deal_status_enum", values_callable=_values)
+deal_stage_enum = Enum(DealStage, name="deal_stage_enum", values_callable=_values)
+activity_type_enum = Enum(ActivityType, name="activity_type_enum", values_callable=_values)
+change_entity_enum = Enum(ChangeEntity, name="change_entity_enum", values_callable=_values)
+change_op_enum = Enum(ChangeOp, name="change_op_enum", values_callable=_values)
 
 
 class Organization(Base):
@@ -28,8 +52,12 @@ class Organization(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    # version of the latest change_log entry; bumped under the row lock by every write
+    data_version: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        Timestamp, server_default=func.now(), nullable=False
     )
 
     members: Mapped[list["OrganizationMember"]] = relationship(
@@ -46,8 +74,11 @@ class User(Base):
     email: Mapped[str] = mapped_column(String(320), unique=True, nullable=False)
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
+    membership_version: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        Timestamp, server_default=func.now(), nullable=False
     )
 
     memberships: Mapped[list["OrganizationMember"]] = relationship(
@@ -63,16 +94,19 @@ class User(Base):
 
 class OrganizationMember(Base):
     __tablename__ = "organization_members"
-    __table_args__ = (UniqueConstraint("organization_id", "user_id", name="uq_member_org_user"),)
+    __table_args__ = (
+        UniqueConstraint("organization_id", "user_id", name="uq_member_org_user"),
+        Index("ix_members_user", "user_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     organization_id: Mapped[int] = mapped_column(ForeignKey("organizations.id", ondelete="CASCADE"))
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     role: Mapped[MemberRole] = mapped_column(
-        Enum(MemberRole, name="member_role_enum"), default=MemberRole.MEMBER, nullable=False
+        member_role_enum, default=MemberRole.MEMBER, nullable=False
     )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        Timestamp, server_default=func.now(), nullable=False
     )
 
     organization: Mapped[Organization] = relationship(back_populates="members")
@@ -81,6 +115,10 @@ class OrganizationMember(Base):
 
 class Contact(Base):
     __tablename__ = "contacts"
+    __table_args__ = (
+        Index("ix_contacts_org_created", "organization_id", "created_at"),
+        Index("ix_contacts_org_owner_created", "organization_id", "owner_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     organization_id: Mapped[int] = mapped_column(ForeignKey("organizations.id", ondelete="CASCADE"))
@@ -89,7 +127,7 @@ class Contact(Base):
     email: Mapped[str | None] = mapped_column(String(320))
     phone: Mapped[str | None] = mapped_column(String(50))
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        Timestamp, server_default=func.now(), nullable=False
     )
 
     organization: Mapped[Organization] = relationship(back_populates="contacts")
@@ -99,6 +137,15 @@ class Contact(Base):
 
 class Deal(Base):
     __tablename__ = "deals"
+    __table_args__ = (
+        Index("ix_deals_org_created", "organization_id", "created_at"),
+        Index("ix_deals_org_status_created", "organization_id", "status", "created_at"),
+        Index("ix_deals_org_stage_created", "organization_id", "stage", "created_at"),
+        Index("ix_deals_org_owner_created", "organization_id", "owner_id", "created_at"),
+        Index("ix_deals_org_amount", "organization_id", "amount"),
+        Index("ix_deals_contact", "contact_id"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(primary_key=True)
     organization_id: Mapped[int] = mapped_column(ForeignKey("organizations.id", ondelete="CASCADE"))
@@ -108,16 +155,16 @@ class Deal(Base):
     amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), default=0)
     currency: Mapped[str] = mapped_column(String(8), default="USD")
     status: Mapped[DealStatus] = mapped_column(
-        Enum(DealStatus, name="deal_status_enum"), default=DealStatus.NEW, nullable=False
+        deal_status_enum, default=DealStatus.NEW, nullable=False
     )
     stage: Mapped[DealStage] = mapped_column(
-        Enum(DealStage, name="deal_stage_enum"), default=DealStage.QUALIFICATION, nullable=False
+        deal_stage_enum, default=DealStage.QUALIFICATION, nullable=False
     )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        Timestamp, server_default=func.now(), nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+        Timestamp, server_default=func.now(), onupdate=func.now(), nullable=False
     )
 
     organization: Mapped[Organization] = relationship(back_populates="deals")
@@ -129,17 +176,71 @@ class Deal(Base):
     )
 
 
+class DealStat(Base):
+    """Per-organization (stage, status) rollup of deals, maintained alongside every deal write."""
+
+    __tablename__ = "deal_stats"
+
+    organization_id: Mapped[int] = mapped_column(
+        ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True
+    )
+    stage: Mapped[DealStage] = mapped_column(deal_stage_enum, primary_key=True)
+    status: Mapped[DealStatus] = mapped_column(deal_status_enum, primary_key=True)
+    deal_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    amount_total: Mapped[Decimal] = mapped_column(Numeric(18, 2), default=0, nullable=False)
+
+
+class DealDailyStat(Base):
+    """Per-organization daily deal flows: created, and net moves into won/lost (UTC days)."""
+
+    __tablename__ = "deal_daily_stats"
+
+    organization_id: Mapped[int] = mapped_column(
+        ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    created_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    won_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    lost_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    won_amount: Mapped[Decimal] = mapped_column(Numeric(18, 2), default=0, nullable=False)
+
+
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_deal_due", "deal_id", "due_date"),
+        # the predicates are what ``~Task.is_done`` renders as on each dialect; anything else
+        # and the planners will not use the partial indexes
+        Index(
+            "ix_tasks_open_deal_due",
+            "deal_id",
+            "due_date",
+            postgresql_where=text("NOT is_done"),
+            sqlite_where=text("is_done = 0"),
+        ),
+        Index("ix_tasks_org_due", "organization_id", "due_date", "id"),
+        Index(
+            "ix_tasks_open_org_due",
+            "organization_id",
+            "due_date",
+            "id",
+            postgresql_where=text("NOT is_done"),
+            sqlite_where=text("is_done = 0"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
+    # copied from the deal so the organization-wide list is one index range scan
+    organization_id: Mapped[int] = mapped_column(
+        ForeignKey("organizations.id", ondelete="CASCADE")
+    )
     deal_id: Mapped[int] = mapped_column(ForeignKey("deals.id", ondelete="CASCADE"))
     title: Mapped[str] = mapped_column(String(255))
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
-    due_date: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    due_date: Mapped[datetime] = mapped_column(Timestamp)
     is_done: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        Timestamp, server_default=func.now(), nullable=False
     )
 
     deal: Mapped[Deal] = relationship(back_populates="tasks")
@@ -147,14 +248,44 @@ class Task(Base):
 
 class Activity(Base):
     __tablename__ = "activities"
+    __table_args__ = (
+        Index("ix_activities_deal_created", "deal_id", "created_at"),
+        Index("ix_activities_org_created", "organization_id", "created_at", "id"),
+        Index("ix_activities_org_type_created", "organization_id", "type", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
+    # copied from the deal so the organization feed is one index range scan
+    organization_id: Mapped[int] = mapped_column(
+        ForeignKey("organizations.id", ondelete="CASCADE")
+    )
     deal_id: Mapped[int] = mapped_column(ForeignKey("deals.id", ondelete="CASCADE"))
     author_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True)
-    type: Mapped[ActivityType] = mapped_column(Enum(ActivityType, name="activity_type_enum"))
+    type: Mapped[ActivityType] = mapped_column(activity_type_enum)
     payload: Mapped[dict | None] = mapped_column(JSON, default=dict)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        Timestamp, server_default=func.now(), nullable=False
     )
 
     deal: Mapped[Deal] = relationship(back_populates="activities")
+
+
+class Change(Base):
+    """One created/updated/deleted entity, numbered per organization by ``data_version``."""
+
+    __tablename__ = "change_log"
+    __table_args__ = (
+        UniqueConstraint("organization_id", "version", name="uq_change_log_org_version"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    organization_id: Mapped[int] = mapped_column(
+        ForeignKey("organizations.id", ondelete="CASCADE")
+    )
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    entity: Mapped[ChangeEntity] = mapped_column(change_entity_enum)
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    op: Mapped[ChangeOp] = mapped_column(change_op_enum)
+    created_at: Mapped[datetime] = mapped_column(
+        Timestamp, server_default=func.now(), nullable=False
+    )
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from sqlalchemy import DDL, column, event, table
+
+from app.models.models import Contact, Deal
+
+# Full-text search structures that plain metadata cannot express. PostgreSQL gets trigram GIN
+# indexes (they also serve the ``lower(col) LIKE '%x%'`` filters); SQLite gets external-content
+# FTS5 tables kept in sync by triggers. Both are maintained by the database on every write.
+
+contacts_fts = table("contacts_fts", column("rowid"))
+deals_fts = table("deals_fts", column("rowid"))
+
+POSTGRESQL_DDL = {
+    Contact.__table__: [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_contacts_name_trgm "
+        "ON contacts USING gin (lower(name) gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS ix_contacts_email_trgm "
+        "ON contacts USING gin (lower(email) gin_trgm_ops)",
+    ],
+    Deal.__table__: [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_deals_title_trgm "
+        "ON deals USING gin (lower(title) gin_trgm_ops)",
+    ],
+}
+
+
+def _fts5(table: str, columns: list[str]) -> tuple[list[str], list[str]]:
+    names = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    delete_old = (
+        f"INSERT INTO {table}_fts({table}_fts, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = f"INSERT INTO {table}_fts(rowid, {names}) VALUES (new.id, {new_values});"
+    create = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5({names}, "
+        f"content='{table}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_fts_ai AFTER INSERT ON {table} "
+        f"BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_fts_ad AFTER DELETE ON {table} "
+        f"BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_fts_au AFTER UPDATE OF {names} ON {table} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+    drop = [
+        f"DROP TRIGGER IF EXISTS {table}_fts_ai",
+        f"DROP TRIGGER IF EXISTS {table}_fts_ad",
+        f"DROP TRIGGER IF EXISTS {table}_fts_au",
+        f"DROP TABLE IF EXISTS {table}_fts",
+    ]
+    return create, drop
+
+
+SQLITE_DDL = {
+    Contact.__table__: _fts5("contacts", ["name", "email"]),
+    Deal.__table__: _fts5("deals", ["title"]),
+}
+
+for _table, _statements in POSTGRESQL_DDL.items():
+    for _statement in _statements:
+        event.listen(_table, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+for _table, (_create, _drop) in SQLITE_DDL.items():
+    for _statement in _create:
+        event.listen(_table, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+    for _statement in _drop:
+        event.listen(_table, "before_drop", DDL(_statement).execute_if(dialect="sqlite"))
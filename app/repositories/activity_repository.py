@@ -1,18 +1,137 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from typing import Any
 
-from app.models.models import Activity
+from sqlalchemy import Select, insert, select
+
+from app.models.enums import ActivityType, DealStage
+from app.models.models import Activity, Deal
 from app.repositories.base import BaseRepository
+from app.repositories.pagination import Keyset, Page, keyset_page
+
+# Everything but the JSON payload, for compact timeline views.
+SUMMARY_COLUMNS = (
+    Activity.id,
+    Activity.organization_id,
+    Activity.deal_id,
+    Activity.author_id,
+    Activity.type,
+    Activity.created_at,
+)
 
 
 class ActivityRepository(BaseRepository):
-    async def list_for_deal(self, deal_id: int) -> list[Activity]:
-        stmt = select(Activity).where(Activity.deal_id == deal_id).order_by(Activity.created_at.asc())
-        rows = await self.session.scalars(stmt)
-        return list(rows.all())
+    async def list_for_deal(
+        self,
+        deal_id: int,
+        *,
+        limit: int,
+        order: str = "asc",
+        types: list[ActivityType] | None = None,
+        author_id: int | None = None,
+        include_payload: bool = True,
+        cursor: str | None = None,
+    ) -> Page[Any]:
+        stmt = self._select(include_payload).where(Activity.deal_id == deal_id)
+        stmt = self._filter(stmt, types=types, author_id=author_id)
+        return await self._page(stmt, self.keyset(order), limit, include_payload, cursor)
+
+    async def feed(
+        self,
+        organization_id: int,
+        *,
+        limit: int,
+        types: list[ActivityType] | None = None,
+        author_id: int | None = None,
+        owner_id: int | None = None,
+        stage: DealStage | None = None,
+        include_payload: bool = True,
+        cursor: str | None = None,
+    ) -> Page[Any]:
+        stmt = self._select(include_payload).where(Activity.organization_id == organization_id)
+        stmt = self._filter(stmt, types=types, author_id=author_id)
+        if owner_id is not None or stage is not None:
+            stmt = stmt.join(Deal, Deal.id == Activity.deal_id)
+            if owner_id is not None:
+                stmt = stmt.where(Deal.owner_id == owner_id)
+            if stage is not None:
+                stmt = stmt.where(Deal.stage == stage)
+        return await self._page(stmt, self.keyset("desc"), limit, include_payload, cursor)
+
+    def _select(self, include_payload: bool) -> Select[Any]:
+        return select(Activity) if include_payload else select(*SUMMARY_COLUMNS)
+
+    def _filter(
+        self, stmt: Select[Any], *, types: list[ActivityType] | None, author_id: int | None
+    ) -> Select[Any]:
+        if types:
+            stmt = stmt.where(Activity.type.in_(types))
+        if author_id is not None:
+            stmt = stmt.where(Activity.author_id == author_id)
+        return stmt
+
+    async def _page(
+        self,
+        stmt: Select[Any],
+        keyset: Keyset,
+        limit: int,
+        include_payload: bool,
+        cursor: str | None,
+    ) -> Page[Any]:
+        backward = False
+        if cursor:
+            predicate, backward = keyset.seek(cursor)
+            stmt = stmt.where(predicate)
+        stmt = stmt.order_by(*keyset.order_by(reverse=backward)).limit(limit + 1)
+        result = await self.session.execute(stmt)
+        rows = result.scalars().all() if include_payload else result.all()
+        return keyset_page(keyset, rows, limit, cursor=cursor, backward=backward)
+
+    async def latest_for_deals(self, deal_ids: set[int]) -> dict[int, Any]:
+        """The newest activity of every deal, as (id, deal_id, type, created_at) rows."""
+        if not deal_ids:
+            return {}
+        stmt = select(Activity.id, Activity.deal_id, Activity.type, Activity.created_at)
+        rows = await self._newest(stmt.where(Activity.deal_id.in_(deal_ids)), per_deal=1)
+        return {row.deal_id: row for row in rows}
+
+    async def recent_for_deals(self, deal_ids: set[int], *, per_deal: int) -> list[Activity]:
+        if not deal_ids or per_deal <= 0:
+            return []
+        stmt = select(Activity).where(Activity.deal_id.in_(deal_ids))
+        return await self._newest(stmt, per_deal=per_deal)
+
+    async def _newest(self, stmt: Select[Any], *, per_deal: int) -> list[Any]:
+        return await self.top_per_group(
+            stmt,
+            partition_by=Activity.deal_id,
+            order_by=(Activity.created_at.desc(), Activity.id.desc()),
+            limit=per_deal,
+        )
+
+    def deal_query(self, deal_id: int) -> Select[tuple[Activity]]:
+        return (
+            select(Activity)
+            .where(Activity.deal_id == deal_id)
+            .order_by(Activity.created_at.asc(), Activity.id.asc())
+        )
+
+    @staticmethod
+    def keyset(order: str) -> Keyset:
+        return Keyset(
+            name="created_at",
+            column=Activity.created_at,
+            id_column=Activity.id,
+            descending=order.lower() == "desc",
+        )
 
     async def create(self, activity: Activity) -> Activity:
         self.session.add(activity)
         await self.session.flush()
         return activity
+
+    async def create_many(self, values: list[dict]) -> list[int]:
+        if not values:
+            return []
+        result = await self.session.execute(insert(Activity).returning(Activity.id), values)
+        return list(result.scalars())
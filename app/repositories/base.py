@@ -1,8 +1,65 @@
 from __future__ import annotations
 
+from typing import Any, AsyncIterator, Sequence, TypeVar
+
+from sqlalchemy import ColumnElement, Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.repositories.pagination import Keyset
+
+T = TypeVar("T")
 
 
 class BaseRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
+
+    async def stream(self, stmt: Select[tuple[T]], *, batch_size: int) -> AsyncIterator[T]:
+        # server-side cursor: rows are fetched batch_size at a time and never all held at once
+        result = await self.session.stream_scalars(stmt.execution_options(yield_per=batch_size))
+        async for item in result:
+            yield item
+
+    async def fetch(
+        self, stmt: Select[tuple[T]], *, fields: Sequence[str] | None = None, keyset: Keyset
+    ) -> list[Any]:
+        """Entities, or with ``fields`` plain rows of just those columns (plus the sort key).
+
+        Projected rows bypass the identity map and are read-only; they expose the selected
+        columns as attributes, so keyset cursors and the response encoder work on either.
+        """
+        if not fields:
+            return list((await self.session.scalars(stmt)).all())
+        model = keyset.id_column.class_
+        names = dict.fromkeys([*fields, keyset.column.key, keyset.id_column.key])
+        stmt = stmt.with_only_columns(*(getattr(model, name) for name in names))
+        return list((await self.session.execute(stmt)).all())
+
+    async def top_per_group(
+        self,
+        stmt: Select[Any],
+        *,
+        partition_by: ColumnElement[Any],
+        order_by: Sequence[ColumnElement[Any]],
+        limit: int,
+    ) -> list[Any]:
+        """The first ``limit`` rows of ``stmt`` in every ``partition_by`` group, in one query.
+
+        Ranks with ``row_number()`` in a subquery. Entity selects come back as entities, column
+        selects as rows; within a group rows keep the ``order_by`` order.
+        """
+        rank = func.row_number().over(partition_by=partition_by, order_by=order_by)
+        ranked = stmt.add_columns(rank.label("group_rank")).subquery()
+        described = stmt.column_descriptions
+        if len(described) == 1 and described[0]["expr"] is described[0]["entity"]:
+            outer = select(aliased(described[0]["entity"], ranked))
+            result = await self.session.scalars(
+                outer.where(ranked.c.group_rank <= limit).order_by(ranked.c.group_rank)
+            )
+            return list(result.all())
+        outer = select(*(column for column in ranked.c if column.key != "group_rank"))
+        result = await self.session.execute(
+            outer.where(ranked.c.group_rank <= limit).order_by(ranked.c.group_rank)
+        )
+        return list(result.all())
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+from sqlalchemy import insert, select, update
+
+from app.models.enums import ChangeEntity, ChangeOp
+from app.models.models import Change, Organization
+from app.repositories.base import BaseRepository
+
+# session.info key: organizations whose change log grew in the current transaction
+CHANGED_ORGANIZATIONS = "changed_organizations"
+
+
+class ChangeRepository(BaseRepository):
+    async def record(
+        self,
+        organization_id: int,
+        entity: ChangeEntity,
+        op: ChangeOp,
+        entity_ids: Sequence[int],
+    ) -> None:
+        if not entity_ids:
+            return
+        # The organization row stays locked until commit, so versions become visible in order
+        # and a reader never skips a change that commits late.
+        stmt = (
+            update(Organization)
+            .where(Organization.id == organization_id)
+            .values(data_version=Organization.data_version + len(entity_ids))
+            .returning(Organization.data_version)
+            .execution_options(synchronize_session=False)
+        )
+        last = await self.session.scalar(stmt)
+        if last is None:
+            return
+        first = last - len(entity_ids) + 1
+        await self.session.execute(
+            insert(Change),
+            [
+                {
+                    "organization_id": organization_id,
+                    "version": first + offset,
+                    "entity": entity,
+                    "entity_id": entity_id,
+                    "op": op,
+                }
+                for offset, entity_id in enumerate(entity_ids)
+            ],
+        )
+        self.session.info.setdefault(CHANGED_ORGANIZATIONS, set()).add(organization_id)
+
+    async def since(self, organization_id: int, version: int, *, limit: int) -> list[Change]:
+        stmt = (
+            select(Change)
+            .where(Change.organization_id == organization_id, Change.version > version)
+            .order_by(Change.version)
+            .limit(limit)
+        )
+        return list((await self.session.scalars(stmt)).all())
+
+    async def current_version(self, organization_id: int) -> int:
+        stmt = select(Organization.data_version).where(Organization.id == organization_id)
+        return int(await self.session.scalar(stmt) or 0)
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
-from sqlalchemy import func, select
+from typing import Any, Sequence
+
+from sqlalchemy import Select, func, insert, select
 
 from app.models.models import Contact, Deal
 from app.repositories.base import BaseRepository
+from app.repositories.pagination import Keyset, Page, next_cursor
+
+ContactKeyset = Keyset(
+    name="created_at", column=Contact.created_at, id_column=Contact.id, descending=True
+)
 
 
 class ContactRepository(BaseRepository):
@@ -15,8 +22,33 @@ class ContactRepository(BaseRepository):
         page_size: int,
         search: str | None = None,
         owner_id: int | None = None,
-    ) -> list[Contact]:
+        cursor: str | None = None,
+        fields: Sequence[str] | None = None,
+        ids: Sequence[int] | None = None,
+    ) -> Page[Any]:
+        stmt = self.filtered_query(organization_id, search=search, owner_id=owner_id, ids=ids)
+        stmt = stmt.order_by(*ContactKeyset.order_by())
+        if ids:
+            return Page(items=await self.fetch(stmt, fields=fields, keyset=ContactKeyset))
+        stmt = stmt.limit(page_size)
+        if cursor:
+            stmt = stmt.where(ContactKeyset.after(cursor))
+        else:
+            stmt = stmt.offset((page - 1) * page_size)
+        rows = await self.fetch(stmt, fields=fields, keyset=ContactKeyset)
+        return Page(items=rows, next_cursor=next_cursor(ContactKeyset, rows, page_size))
+
+    def filtered_query(
+        self,
+        organization_id: int,
+        *,
+        search: str | None = None,
+        owner_id: int | None = None,
+        ids: Sequence[int] | None = None,
+    ) -> Select[tuple[Contact]]:
         stmt = select(Contact).where(Contact.organization_id == organization_id)
+        if ids:
+            stmt = stmt.where(Contact.id.in_(ids))
         if search:
             like = f"%{search.lower()}%"
             stmt = stmt.where(
@@ -24,9 +56,7 @@ class ContactRepository(BaseRepository):
             )
         if owner_id is not None:
             stmt = stmt.where(Contact.owner_id == owner_id)
-        stmt = stmt.order_by(Contact.created_at.desc()).offset((page - 1) * page_size).limit(page_size)
-        result = await self.session.scalars(stmt)
-        return list(result.all())
+        return stmt
 
     async def create(self, contact: Contact) -> Contact:
         self.session.add(contact)
@@ -40,6 +70,26 @@ class ContactRepository(BaseRepository):
         )
         return await self.session.scalar(stmt)
 
+    async def create_many(self, values: list[dict]) -> list[int]:
+        result = await self.session.execute(insert(Contact).returning(Contact.id), values)
+        return list(result.scalars())
+
+    async def summaries(self, organization_id: int, contact_ids: set[int]) -> dict[int, Any]:
+        if not contact_ids:
+            return {}
+        stmt = select(Contact.id, Contact.name, Contact.email).where(
+            Contact.organization_id == organization_id, Contact.id.in_(contact_ids)
+        )
+        return {row.id: row for row in await self.session.execute(stmt)}
+
+    async def existing_ids(self, organization_id: int, contact_ids: set[int]) -> set[int]:
+        if not contact_ids:
+            return set()
+        stmt = select(Contact.id).where(
+            Contact.organization_id == organization_id, Contact.id.in_(contact_ids)
+        )
+        return set((await self.session.scalars(stmt)).all())
+
     async def delete(self, contact: Contact) -> None:
         await self.session.delete(contact)
 
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
 from decimal import Decimal
+from typing import Any, Sequence
 
-from sqlalchemy import Select, func, select
+from sqlalchemy import Select, insert, select
 
 from app.models.enums import DealStage, DealStatus
 from app.models.models import Deal
 from app.repositories.base import BaseRepository
+from app.repositories.pagination import Keyset, Page, next_cursor
 
 OrderFields = {
     "created_at": Deal.created_at,
@@ -34,8 +35,45 @@ class DealRepository(BaseRepository):
         owner_id: int | None = None,
         order_by: str = "created_at",
         order: str = "desc",
-    ) -> list[Deal]:
+        cursor: str | None = None,
+        fields: Sequence[str] | None = None,
+        ids: Sequence[int] | None = None,
+    ) -> Page[Any]:
+        stmt = self.filtered_query(
+            organization_id,
+            statuses=statuses,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            stage=stage,
+            owner_id=owner_id,
+            ids=ids,
+        )
+        keyset = self.keyset(order_by, order)
+        stmt = stmt.order_by(*keyset.order_by())
+        if ids:
+            return Page(items=await self.fetch(stmt, fields=fields, keyset=keyset))
+        stmt = stmt.limit(page_size)
+        if cursor:
+            stmt = stmt.where(keyset.after(cursor))
+        else:
+            stmt = stmt.offset((page - 1) * page_size)
+        rows = await self.fetch(stmt, fields=fields, keyset=keyset)
+        return Page(items=rows, next_cursor=next_cursor(keyset, rows, page_size))
+
+    def filtered_query(
+        self,
+        organization_id: int,
+        *,
+        statuses: list[DealStatus] | None = None,
+        min_amount: Decimal | None = None,
+        max_amount: Decimal | None = None,
+        stage: DealStage | None = None,
+        owner_id: int | None = None,
+        ids: Sequence[int] | None = None,
+    ) -> Select[tuple[Deal]]:
         stmt = self._base_query(organization_id)
+        if ids:
+            stmt = stmt.where(Deal.id.in_(ids))
         if statuses:
             stmt = stmt.where(Deal.status.in_(statuses))
         if min_amount is not None:
@@ -46,51 +84,41 @@ class DealRepository(BaseRepository):
             stmt = stmt.where(Deal.stage == stage)
         if owner_id is not None:
             stmt = stmt.where(Deal.owner_id == owner_id)
-        order_column = OrderFields.get(order_by, Deal.created_at)
-        order_clause = order_column.desc() if order.lower() == "desc" else order_column.asc()
-        stmt = stmt.order_by(order_clause).offset((page - 1) * page_size).limit(page_size)
-        rows = await self.session.scalars(stmt)
-        return list(rows.all())
+        return stmt
+
+    @staticmethod
+    def keyset(order_by: str, order: str) -> Keyset:
+        if order_by not in OrderFields:
+            order_by = "created_at"
+        return Keyset(
+            name=order_by,
+            column=OrderFields[order_by],
+            id_column=Deal.id,
+            descending=order.lower() == "desc",
+        )
 
     async def create(self, deal: Deal) -> Deal:
         self.session.add(deal)
         await self.session.flush()
         return deal
 
+    async def create_many(self, values: list[dict]) -> list[int]:
+        result = await self.session.execute(insert(Deal).returning(Deal.id), values)
+        return list(result.scalars())
+
     async def get(self, organization_id: int, deal_id: int) -> Deal | None:
         stmt = self._base_query(organization_id).where(Deal.id == deal_id)
         return await self.session.scalar(stmt)
 
-    async def summarise_by_status(
-        self, organization_id: int
-    ) -> list[tuple[DealStatus, int, Decimal]]:
-        stmt = (
-            select(Deal.status, func.count(Deal.id), func.coalesce(func.sum(Deal.amount), 0))
-            .where(Deal.organization_id == organization_id)
-            .group_by(Deal.status)
-        )
-        rows = await self.session.execute(stmt)
-        return [(row[0], row[1], row[2]) for row in rows.all()]
-
-    async def average_won_amount(self, organization_id: int) -> Decimal | None:
-        stmt = select(func.avg(Deal.amount)).where(
-            Deal.organization_id == organization_id, Deal.status == DealStatus.WON
-        )
-        return await self.session.scalar(stmt)
-
-    async def count_new_deals(self, organization_id: int, days: int) -> int:
-        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-        stmt = select(func.count(Deal.id)).where(
-            Deal.organization_id == organization_id, Deal.created_at >= cutoff
-        )
-        value = await self.session.scalar(stmt)
-        return int(value or 0)
+    async def get_many(self, organization_id: int, deal_ids: list[int]) -> list[Deal]:
+        stmt = self._base_query(organization_id).where(Deal.id.in_(deal_ids))
+        return list((await self.session.scalars(stmt)).all())
 
-    async def funnel_counts(self, organization_id: int) -> list[tuple[DealStage, DealStatus, int]]:
+    async def for_contact(self, organization_id: int, contact_id: int, *, limit: int) -> list[Deal]:
         stmt = (
-            select(Deal.stage, Deal.status, func.count(Deal.id))
-            .where(Deal.organization_id == organization_id)
-            .group_by(Deal.stage, Deal.status)
+            self._base_query(organization_id)
+            .where(Deal.contact_id == contact_id)
+            .order_by(Deal.created_at.desc(), Deal.id.desc())
+            .limit(limit)
         )
-        rows = await self.session.execute(stmt)
-        return [(row[0], row[1], row[2]) for row in rows.all()]
+        return list((await self.session.scalars(stmt)).all())
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import Numeric, Select, case, cast, delete, func, literal, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models.enums import ActivityType, DealStage, DealStatus
+from app.models.models import Activity, Deal, DealDailyStat, DealStat
+from app.repositories.base import BaseRepository
+
+StatKey = tuple[DealStage, DealStatus]
+DealSnapshot = tuple[DealStage, DealStatus, Decimal]
+
+DAILY_COLUMNS = ["organization_id", "day", "created_count", "won_count", "lost_count", "won_amount"]
+
+
+class StatsDelta:
+    """Net change of the rollups produced by the deal writes of one transaction."""
+
+    def __init__(self) -> None:
+        self._changes: dict[StatKey, list[Any]] = defaultdict(lambda: [0, Decimal("0")])
+        # created, won, lost, won amount per UTC day
+        self._days: dict[date, list[Any]] = defaultdict(lambda: [0, 0, 0, Decimal("0")])
+
+    def add(
+        self, stage: DealStage, status: DealStatus, amount: Decimal | None, count: int = 1
+    ) -> None:
+        change = self._changes[(stage, status)]
+        change[0] += count
+        change[1] += amount or Decimal("0")
+
+    def remove(self, stage: DealStage, status: DealStatus, amount: Decimal | None) -> None:
+        self.add(stage, status, -(amount or Decimal("0")), count=-1)
+
+    def create(self, stage: DealStage, status: DealStatus, amount: Decimal | None) -> None:
+        self.add(stage, status, amount)
+        self._days[_utc_today()][0] += 1
+        self._flow(status, amount, 1)
+
+    def move(self, before: DealSnapshot, deal: Deal, won_day: date | None = None) -> None:
+        """``won_day``: when the deal was last won, for amount edits of a deal that stays won."""
+        stage, status, amount = before
+        self.remove(stage, status, amount)
+        self.add(deal.stage, deal.status, deal.amount)
+        if deal.status != status:
+            self._flow(status, amount, -1)
+            self._flow(deal.status, deal.amount, 1)
+        elif status == DealStatus.WON and won_day is not None:
+            self._days[won_day][3] += (deal.amount or Decimal("0")) - (amount or Decimal("0"))
+
+    def _flow(self, status: DealStatus, amount: Decimal | None, sign: int) -> None:
+        today = self._days[_utc_today()]
+        if status == DealStatus.WON:
+            today[1] += sign
+            today[3] += sign * (amount or Decimal("0"))
+        elif status == DealStatus.LOST:
+            today[2] += sign
+
+    def rows(self, organization_id: int) -> list[dict]:
+        # Sorted so concurrent transactions lock the rollup rows in the same order.
+        return [
+            {
+                "organization_id": organization_id,
+                "stage": stage,
+                "status": status,
+                "deal_count": count,
+                "amount_total": amount,
+            }
+            for (stage, status), (count, amount) in sorted(self._changes.items())
+            if count or amount
+        ]
+
+    def daily_rows(self, organization_id: int) -> list[dict]:
+        return [
+            {
+                "organization_id": organization_id,
+                "day": day,
+                "created_count": created,
+                "won_count": won,
+                "lost_count": lost,
+                "won_amount": won_amount,
+            }
+            for day, (created, won, lost, won_amount) in sorted(self._days.items())
+            if created or won or lost or won_amount
+        ]
+
+
+def won_transition_amount(before: DealSnapshot, deal: Deal) -> Decimal | None:
+    """What a status change moves in or out of the won amount, kept in the activity payload."""
+    _, status, amount = before
+    if deal.status == status:
+        return None
+    if deal.status == DealStatus.WON:
+        return deal.amount or Decimal("0")
+    if status == DealStatus.WON:
+        return amount or Decimal("0")
+    return None
+
+
+def edits_won_amount(before: DealSnapshot, deal: Deal) -> bool:
+    _, status, amount = before
+    return deal.status == status == DealStatus.WON and deal.amount != amount
+
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _utc_date(column: Any, dialect: str) -> Any:
+    if dialect == "postgresql":
+        return func.date(func.timezone("UTC", column))
+    # SQLite keeps timestamps as UTC text
+    return func.date(column)
+
+
+def daily_rebuild_query(organization_id: int | None = None, *, dialect: str) -> Select[Any]:
+    """Daily flows recomputed from deals (created) and STATUS_CHANGED activities (won/lost).
+
+    Same rule as ``StatsDelta``, on UTC days: a win is credited to the day it happened with the
+    amount the deal had when it next left won (its current amount while it is still won), so
+    edits made while won land on the win day; leaving won debits that amount on its own day.
+    Activities written before the payload carried ``amount`` fall back to the current amount.
+    """
+    to_status = Activity.payload["to"].as_string()
+    from_status = Activity.payload["from"].as_string()
+    moved = cast(Activity.payload["amount"].as_string(), Numeric(18, 2))
+    left_won_with = func.lead(moved).over(
+        partition_by=Activity.deal_id, order_by=(Activity.created_at, Activity.id)
+    )
+    won, lost = DealStatus.WON.value, DealStatus.LOST.value
+    created = select(
+        Deal.organization_id.label("organization_id"),
+        _utc_date(Deal.created_at, dialect).label("day"),
+        literal(1).label("created_count"),
+        literal(0).label("won_count"),
+        literal(0).label("lost_count"),
+        literal(0).label("won_amount"),
+    )
+    flows = (
+        select(
+            Deal.organization_id,
+            _utc_date(Activity.created_at, dialect),
+            literal(0),
+            case((to_status == won, 1), (from_status == won, -1), else_=0),
+            case((to_status == lost, 1), (from_status == lost, -1), else_=0),
+            case(
+                (to_status == won, func.coalesce(left_won_with, Deal.amount)),
+                (from_status == won, -func.coalesce(moved, Deal.amount)),
+                else_=0,
+            ),
+        )
+        .join(Deal, Deal.id == Activity.deal_id)
+        .where(Activity.type == ActivityType.STATUS_CHANGED)
+    )
+    if organization_id is not None:
+        created = created.where(Deal.organization_id == organization_id)
+        flows = flows.where(Deal.organization_id == organization_id)
+    combined = union_all(created, flows).subquery()
+    return select(
+        combined.c.organization_id,
+        combined.c.day,
+        func.sum(combined.c.created_count),
+        func.sum(combined.c.won_count),
+        func.sum(combined.c.lost_count),
+        func.sum(combined.c.won_amount),
+    ).group_by(combined.c.organization_id, combined.c.day)
+
+
+class DealStatsRepository(BaseRepository):
+    async def apply(self, organization_id: int, delta: StatsDelta) -> None:
+        dialect = self.session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        rows = delta.rows(organization_id)
+        if rows:
+            stmt = insert(DealStat).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[DealStat.organization_id, DealStat.stage, DealStat.status],
+                set_={
+                    "deal_count": DealStat.deal_count + stmt.excluded.deal_count,
+                    "amount_total": DealStat.amount_total + stmt.excluded.amount_total,
+                },
+            )
+            await self.session.execute(stmt)
+        daily = delta.daily_rows(organization_id)
+        if daily:
+            stmt = insert(DealDailyStat).values(daily)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[DealDailyStat.organization_id, DealDailyStat.day],
+                set_={
+                    column: getattr(DealDailyStat, column) + getattr(stmt.excluded, column)
+                    for column in DAILY_COLUMNS[2:]
+                },
+            )
+            await self.session.execute(stmt)
+
+    async def for_organization(self, organization_id: int) -> list[DealStat]:
+        stmt = select(DealStat).where(DealStat.organization_id == organization_id)
+        return list((await self.session.scalars(stmt)).all())
+
+    async def created_since(self, organization_id: int, since: date) -> int:
+        stmt = select(func.coalesce(func.sum(DealDailyStat.created_count), 0)).where(
+            DealDailyStat.organization_id == organization_id, DealDailyStat.day >= since
+        )
+        return int(await self.session.scalar(stmt) or 0)
+
+    async def won_days(self, deal_ids: set[int]) -> dict[int, date]:
+        """The UTC day each of these deals was last won, if it ever was."""
+        if not deal_ids:
+            return {}
+        stmt = (
+            select(Activity.deal_id, func.max(Activity.created_at))
+            .where(
+                Activity.deal_id.in_(deal_ids),
+                Activity.type == ActivityType.STATUS_CHANGED,
+                Activity.payload["to"].as_string() == DealStatus.WON.value,
+            )
+            .group_by(Activity.deal_id)
+        )
+        return {
+            deal_id: (won_at.astimezone(timezone.utc) if won_at.tzinfo else won_at).date()
+            for deal_id, won_at in await self.session.execute(stmt)
+        }
+
+    async def daily(self, organization_id: int, since: date) -> list[DealDailyStat]:
+        stmt = (
+            select(DealDailyStat)
+            .where(DealDailyStat.organization_id == organization_id, DealDailyStat.day >= since)
+            .order_by(DealDailyStat.day)
+        )
+        return list((await self.session.scalars(stmt)).all())
+
+    async def rebuild(self, organization_id: int | None = None) -> int:
+        """Recompute both rollups from their sources; returns the number of rows written."""
+        dialect = self.session.get_bind().dialect.name
+        clear = delete(DealStat)
+        clear_daily = delete(DealDailyStat)
+        source = select(
+            Deal.organization_id,
+            Deal.stage,
+            Deal.status,
+            func.count(Deal.id),
+            func.coalesce(func.sum(Deal.amount), 0),
+        ).group_by(Deal.organization_id, Deal.stage, Deal.status)
+        if organization_id is not None:
+            clear = clear.where(DealStat.organization_id == organization_id)
+            clear_daily = clear_daily.where(DealDailyStat.organization_id == organization_id)
+            source = source.where(Deal.organization_id == organization_id)
+        await self.session.execute(clear)
+        await self.session.execute(clear_daily)
+        result = await self.session.execute(
+            DealStat.__table__.insert().from_select(
+                ["organization_id", "stage", "status", "deal_count", "amount_total"], source
+            )
+        )
+        daily = await self.session.execute(
+            DealDailyStat.__table__.insert().from_select(
+                DAILY_COLUMNS, daily_rebuild_query(organization_id, dialect=dialect)
+            )
+        )
+        return result.rowcount + daily.rowcount
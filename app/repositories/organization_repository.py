@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 
+from app.caching.principals import CHANGED_MEMBERSHIPS
 from app.models.enums import MemberRole
-from app.models.models import Organization, OrganizationMember
+from app.models.models import Organization, OrganizationMember, User
 from app.repositories.base import BaseRepository
 
 
@@ -20,8 +21,20 @@ class OrganizationRepository(BaseRepository):
             membership.role = role
         self.session.add(membership)
         await self.session.flush()
+        await self.bump_membership_version(membership.user_id)
+        self.session.info.setdefault(CHANGED_MEMBERSHIPS, set()).add(
+            (membership.user_id, membership.organization_id)
+        )
         return membership
 
+    async def bump_membership_version(self, user_id: int) -> None:
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(membership_version=User.membership_version + 1)
+        )
+        await self.session.execute(stmt)
+
     async def list_for_user(self, user_id: int) -> list[tuple[Organization, OrganizationMember]]:
         stmt = (
             select(Organization, OrganizationMember)
@@ -32,6 +45,15 @@ class OrganizationRepository(BaseRepository):
         rows = await self.session.execute(stmt)
         return list(rows.all())
 
+    async def member_ids(self, organization_id: int, user_ids: set[int]) -> set[int]:
+        if not user_ids:
+            return set()
+        stmt = select(OrganizationMember.user_id).where(
+            OrganizationMember.organization_id == organization_id,
+            OrganizationMember.user_id.in_(user_ids),
+        )
+        return set((await self.session.scalars(stmt)).all())
+
     async def get_member(self, organization_id: int, user_id: int) -> OrganizationMember | None:
         stmt = select(OrganizationMember).where(
             OrganizationMember.organization_id == organization_id,
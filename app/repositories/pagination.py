@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Generic, Sequence, TypeVar
+
+from sqlalchemy import ColumnElement, and_, or_
+from sqlalchemy.orm import InstrumentedAttribute
+
+T = TypeVar("T")
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
+@dataclass(frozen=True)
+class Keyset:
+    """Sort key of a keyset-paginated query: one ordering column plus the primary key."""
+
+    name: str
+    column: InstrumentedAttribute[Any]
+    id_column: InstrumentedAttribute[Any]
+    descending: bool
+
+    def order_by(self, reverse: bool = False) -> tuple[ColumnElement[Any], ColumnElement[Any]]:
+        if self.descending != reverse:
+            return self.column.desc(), self.id_column.desc()
+        return self.column.asc(), self.id_column.asc()
+
+    def after(self, cursor: str) -> ColumnElement[bool]:
+        predicate, backward = self.seek(cursor)
+        if backward:
+            raise InvalidCursor("Backward cursors are not supported here")
+        return predicate
+
+    def seek(self, cursor: str) -> tuple[ColumnElement[bool], bool]:
+        """Predicate selecting rows past the cursor, and whether it pages backward."""
+        value, last_id, backward = self.decode(cursor)
+        if self.descending != backward:
+            return (
+                or_(self.column < value, and_(self.column == value, self.id_column < last_id)),
+                backward,
+            )
+        return (
+            or_(self.column > value, and_(self.column == value, self.id_column > last_id)),
+            backward,
+        )
+
+    def encode(self, row: Any, *, backward: bool = False) -> str:
+        value = getattr(row, self.column.key)
+        data = [self._tag(), _dump_value(value), getattr(row, self.id_column.key)]
+        if backward:
+            data.append("prev")
+        raw = json.dumps(data)
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> tuple[Any, int, bool]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            tag, value, last_id, *direction = json.loads(base64.urlsafe_b64decode(padded))
+        except (binascii.Error, ValueError, TypeError) as exc:
+            raise InvalidCursor("Malformed cursor") from exc
+        if tag != self._tag() or not isinstance(last_id, int) or direction not in ([], ["prev"]):
+            raise InvalidCursor("Cursor does not match the requested ordering")
+        try:
+            return _load_value(value, self.column.type.python_type), last_id, bool(direction)
+        except (ValueError, TypeError, ArithmeticError) as exc:
+            raise InvalidCursor("Malformed cursor") from exc
+
+    def _tag(self) -> str:
+        return f"{self.name}:{'desc' if self.descending else 'asc'}"
+
+
+def next_cursor(keyset: Keyset, rows: Sequence[Any], page_size: int) -> str | None:
+    if len(rows) < page_size or not rows:
+        return None
+    return keyset.encode(rows[-1])
+
+
+def keyset_page(
+    keyset: Keyset, rows: Sequence[Any], limit: int, *, cursor: str | None, backward: bool
+) -> Page[Any]:
+    """Page from rows fetched with ``limit + 1`` in query order (reversed when ``backward``)."""
+    items = list(rows[:limit])
+    has_more = len(rows) > limit
+    if backward:
+        items.reverse()
+    if not items:
+        return Page(items=[])
+    more_after = has_more if not backward else True
+    more_before = has_more if backward else cursor is not None
+    return Page(
+        items=items,
+        next_cursor=keyset.encode(items[-1]) if more_after else None,
+        prev_cursor=keyset.encode(items[0], backward=True) if more_before else None,
+    )
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _load_value(value: Any, python_type: type) -> Any:
+    if value is None:
+        return None
+    if issubclass(python_type, datetime):
+        return datetime.fromisoformat(value)
+    if issubclass(python_type, Decimal):
+        return Decimal(value)
+    return python_type(value)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from sqlalchemy import Select, TableClause, func, literal_column, or_, select
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.models.models import Contact, Deal
+from app.models.search import contacts_fts, deals_fts
+from app.repositories.base import BaseRepository
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+class SearchRepository(BaseRepository):
+    async def search_contacts(
+        self, organization_id: int, query: str, *, limit: int
+    ) -> list[tuple[Contact, float]]:
+        stmt = self._search(Contact, contacts_fts, [Contact.name, Contact.email], query, limit)
+        if stmt is None:
+            return []
+        stmt = stmt.where(Contact.organization_id == organization_id)
+        rows = await self.session.execute(stmt)
+        return [(row[0], float(row[1] or 0)) for row in rows.all()]
+
+    async def search_deals(
+        self, organization_id: int, query: str, *, limit: int
+    ) -> list[tuple[Deal, float]]:
+        stmt = self._search(Deal, deals_fts, [Deal.title], query, limit)
+        if stmt is None:
+            return []
+        stmt = stmt.where(Deal.organization_id == organization_id)
+        rows = await self.session.execute(stmt)
+        return [(row[0], float(row[1] or 0)) for row in rows.all()]
+
+    def _search(
+        self,
+        model: Any,
+        fts: TableClause,
+        columns: list[InstrumentedAttribute[Any]],
+        query: str,
+        limit: int,
+        dialect: str | None = None,
+    ) -> Select[Any] | None:
+        dialect = dialect or self.session.get_bind().dialect.name
+        if dialect == "sqlite":
+            tokens = _TOKEN.findall(query.lower())
+            if not tokens:
+                return None
+            # bm25() is lower-is-better; negate it so every backend reports higher-is-better
+            match = " ".join(f'"{token}"*' for token in tokens)
+            rank = -func.bm25(literal_column(fts.name))
+            return (
+                select(model, rank)
+                .join(fts, fts.c.rowid == model.id)
+                .where(literal_column(fts.name).op("MATCH")(match))
+                .order_by(rank.desc(), model.id.desc())
+                .limit(limit)
+            )
+        # trigram and LIKE matching keep punctuation, so emails and phone numbers match as typed
+        needle = query.strip().lower()
+        if not needle:
+            return None
+        like = f"%{_escape_like(needle)}%"
+        matches = [func.lower(column).like(like, escape="\\") for column in columns]
+        if dialect == "postgresql":
+            rank = func.greatest(
+                *[
+                    func.similarity(func.coalesce(func.lower(column), ""), needle)
+                    for column in columns
+                ]
+            )
+        else:
+            rank = literal_column("0.0")
+        return (
+            select(model, rank)
+            .where(or_(*matches))
+            .order_by(rank.desc(), model.id.desc())
+            .limit(limit)
+        )
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
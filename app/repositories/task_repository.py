@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Any, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Select, func, select
 
 from app.models.models import Deal, Task
 from app.repositories.base import BaseRepository
+from app.repositories.pagination import Keyset, Page, next_cursor
+
+TaskKeyset = Keyset(name="due_date", column=Task.due_date, id_column=Task.id, descending=False)
 
 
 class TaskRepository(BaseRepository):
@@ -13,23 +17,84 @@ class TaskRepository(BaseRepository):
         self,
         organization_id: int,
         *,
+        page: int,
+        page_size: int,
         deal_id: int | None = None,
         only_open: bool = False,
         due_before: datetime | None = None,
         due_after: datetime | None = None,
-    ) -> list[Task]:
-        stmt = select(Task).join(Deal).where(Deal.organization_id == organization_id)
+        owner_id: int | None = None,
+        cursor: str | None = None,
+        fields: Sequence[str] | None = None,
+        ids: Sequence[int] | None = None,
+    ) -> Page[Any]:
+        stmt = self.filtered_query(
+            organization_id,
+            deal_id=deal_id,
+            only_open=only_open,
+            due_before=due_before,
+            due_after=due_after,
+            owner_id=owner_id,
+            ids=ids,
+        )
+        stmt = stmt.order_by(*TaskKeyset.order_by())
+        if ids:
+            return Page(items=await self.fetch(stmt, fields=fields, keyset=TaskKeyset))
+        stmt = stmt.limit(page_size)
+        if cursor:
+            stmt = stmt.where(TaskKeyset.after(cursor))
+        else:
+            stmt = stmt.offset((page - 1) * page_size)
+        rows = await self.fetch(stmt, fields=fields, keyset=TaskKeyset)
+        return Page(items=rows, next_cursor=next_cursor(TaskKeyset, rows, page_size))
+
+    def filtered_query(
+        self,
+        organization_id: int,
+        *,
+        deal_id: int | None = None,
+        only_open: bool = False,
+        due_before: datetime | None = None,
+        due_after: datetime | None = None,
+        owner_id: int | None = None,
+        ids: Sequence[int] | None = None,
+    ) -> Select[tuple[Task]]:
+        stmt = select(Task).where(Task.organization_id == organization_id)
+        if ids:
+            stmt = stmt.where(Task.id.in_(ids))
         if deal_id:
             stmt = stmt.where(Task.deal_id == deal_id)
         if only_open:
-            stmt = stmt.where(Task.is_done.is_(False))
+            stmt = stmt.where(~Task.is_done)
         if due_before:
             stmt = stmt.where(Task.due_date <= due_before)
         if due_after:
             stmt = stmt.where(Task.due_date >= due_after)
-        stmt = stmt.order_by(Task.due_date.asc())
-        rows = await self.session.scalars(stmt)
-        return list(rows.all())
+        if owner_id is not None:
+            stmt = stmt.join(Deal).where(Deal.owner_id == owner_id)
+        return stmt
+
+    async def open_counts(self, deal_ids: set[int]) -> dict[int, int]:
+        if not deal_ids:
+            return {}
+        stmt = (
+            select(Task.deal_id, func.count(Task.id))
+            .where(Task.deal_id.in_(deal_ids), ~Task.is_done)
+            .group_by(Task.deal_id)
+        )
+        return {deal_id: count for deal_id, count in await self.session.execute(stmt)}
+
+    async def open_for_deals(self, deal_ids: set[int], *, per_deal: int) -> list[Task]:
+        """The earliest-due open tasks of every deal, at most ``per_deal`` each."""
+        if not deal_ids or per_deal <= 0:
+            return []
+        stmt = select(Task).where(Task.deal_id.in_(deal_ids), ~Task.is_done)
+        return await self.top_per_group(
+            stmt,
+            partition_by=Task.deal_id,
+            order_by=(Task.due_date.asc(), Task.id.asc()),
+            limit=per_deal,
+        )
 
     async def create(self, task: Task) -> Task:
         self.session.add(task)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Any
+
 from sqlalchemy import select
 
 from app.models.models import User
@@ -11,6 +13,16 @@ class UserRepository(BaseRepository):
         stmt = select(User).where(User.email == email)
         return await self.session.scalar(stmt)
 
+    async def get_membership_version(self, user_id: int) -> int | None:
+        stmt = select(User.membership_version).where(User.id == user_id)
+        return await self.session.scalar(stmt)
+
+    async def summaries(self, user_ids: set[int]) -> dict[int, Any]:
+        if not user_ids:
+            return {}
+        stmt = select(User.id, User.name, User.email).where(User.id.in_(user_ids))
+        return {row.id: row for row in await self.session.execute(stmt)}
+
     async def add(self, user: User) -> User:
         self.session.add(user)
         await self.session.flush()
@@ -18,7 +18,7 @@ class ActivityRead(BaseModel):
     deal_id: int
     author_id: Optional[int]
     type: ActivityType
-    payload: Dict[str, Any] | None
+    payload: Dict[str, Any] | None = None
     created_at: datetime
 
     class Config:
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from datetime import date
 from decimal import Decimal
+from enum import Enum
 from typing import Dict, Optional
 
 from pydantic import BaseModel
@@ -23,3 +25,23 @@ class DealFunnelStageBreakdown(BaseModel):
 
 class DealsFunnelResponse(BaseModel):
     stages: list[DealFunnelStageBreakdown]
+
+
+class TimeseriesBucket(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class DealsTimeseriesPoint(BaseModel):
+    start: date
+    created: int = 0
+    won: int = 0
+    lost: int = 0
+    won_amount: Decimal = Decimal("0")
+
+
+class DealsTimeseriesResponse(BaseModel):
+    bucket: TimeseriesBucket
+    days: int
+    points: list[DealsTimeseriesPoint]
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from app.models.enums import ChangeEntity, ChangeOp
+
+
+class ChangeRead(BaseModel):
+    version: int
+    entity: ChangeEntity
+    entity_id: int
+    op: ChangeOp
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ChangesResponse(BaseModel):
+    changes: list[ChangeRead]
+    next_since: int = Field(description="Pass as `since` to get the changes after this page")
+    has_more: bool
@@ -5,6 +5,10 @@ from typing import Optional
 
 from pydantic import BaseModel, EmailStr, Field
 
+from app.schemas.activity import ActivityRead
+from app.schemas.deal import DealRead
+from app.schemas.task import TaskRead
+
 
 class ContactCreate(BaseModel):
     name: str = Field(min_length=1)
@@ -30,3 +34,14 @@ class ContactRead(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ContactOverviewDeal(DealRead):
+    open_task_count: int
+    open_tasks: list[TaskRead]
+    recent_activities: list[ActivityRead]
+
+
+class ContactOverview(BaseModel):
+    contact: ContactRead
+    deals: list[ContactOverviewDeal]
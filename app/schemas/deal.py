@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from datetime import datetime
 from decimal import Decimal
+from enum import Enum
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
-from app.models.enums import DealStage, DealStatus
+from app.core.config import get_settings
+from app.models.enums import ActivityType, DealStage, DealStatus
 
 
 class DealCreate(BaseModel):
@@ -26,6 +28,32 @@ class DealUpdate(BaseModel):
     owner_id: Optional[int] = None
 
 
+class DealBatchItem(DealUpdate):
+    id: int
+
+
+class DealBatchUpdate(BaseModel):
+    ids: list[int] = Field(default_factory=list, description="Deals that receive `changes`")
+    changes: Optional[DealUpdate] = None
+    items: list[DealBatchItem] = Field(default_factory=list, description="Per-deal changes")
+
+    @model_validator(mode="after")
+    def check_size(self) -> "DealBatchUpdate":
+        if self.ids and self.changes is None:
+            raise ValueError("`changes` is required together with `ids`")
+        total = len(self.ids) + len(self.items)
+        if total == 0:
+            raise ValueError("Batch is empty")
+        if total > get_settings().max_batch_size:
+            raise ValueError(f"Batch is limited to {get_settings().max_batch_size} deals")
+        return self
+
+    def updates(self) -> list[tuple[int, DealUpdate]]:
+        shared = [(deal_id, self.changes) for deal_id in self.ids if self.changes is not None]
+        own = [(item.id, DealUpdate(**item.model_dump(exclude={"id"}))) for item in self.items]
+        return shared + own
+
+
 class DealRead(BaseModel):
     id: int
     organization_id: int
@@ -41,3 +69,37 @@ class DealRead(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class DealInclude(str, Enum):
+    CONTACT = "contact"
+    OWNER = "owner"
+    OPEN_TASK_COUNT = "open_task_count"
+    LAST_ACTIVITY = "last_activity"
+
+
+class DealContactRef(BaseModel):
+    id: int
+    name: str
+    email: Optional[str]
+
+
+class DealOwnerRef(BaseModel):
+    id: int
+    name: str
+    email: str
+
+
+class DealLastActivity(BaseModel):
+    id: int
+    type: ActivityType
+    created_at: datetime
+
+
+class DealListItem(DealRead):
+    """A deal row with the related resources requested through ``include=``."""
+
+    contact: Optional[DealContactRef] = None
+    owner: Optional[DealOwnerRef] = None
+    open_task_count: Optional[int] = None
+    last_activity: Optional[DealLastActivity] = None
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class ImportRowError(BaseModel):
+    row: int
+    detail: str
+
+
+class ImportResult(BaseModel):
+    received: int
+    inserted: int
+    failed: int
+    errors: list[ImportRowError]
+    errors_truncated: bool
+    elapsed_seconds: float
+    rows_per_second: float
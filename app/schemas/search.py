@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+from app.schemas.contact import ContactRead
+from app.schemas.deal import DealRead
+
+
+class ContactSearchHit(ContactRead):
+    score: float
+
+
+class DealSearchHit(DealRead):
+    score: float
+
+
+class SearchResponse(BaseModel):
+    contacts: list[ContactSearchHit]
+    deals: list[DealSearchHit]
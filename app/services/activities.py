@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+from typing import Any, AsyncIterator
+
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.enums import ActivityType
-from app.models.models import Activity
+from app.core.config import get_settings
+from app.models.enums import ActivityType, ChangeEntity, ChangeOp, DealStage
+from app.models.models import Activity, Deal
 from app.repositories.activity_repository import ActivityRepository
+from app.repositories.change_repository import ChangeRepository
 from app.repositories.deal_repository import DealRepository
+from app.repositories.pagination import InvalidCursor, Page
 from app.schemas.activity import ActivityCreate
 
 
@@ -15,12 +20,73 @@ class ActivityService:
         self.session = session
         self.activities = ActivityRepository(session)
         self.deals = DealRepository(session)
+        self.changes = ChangeRepository(session)
+
+    async def list_for_deal(
+        self,
+        organization_id: int,
+        deal_id: int,
+        *,
+        limit: int,
+        order: str,
+        types: list[ActivityType] | None,
+        author_id: int | None,
+        include_payload: bool,
+        cursor: str | None,
+    ) -> Page[Any]:
+        deal = await self.get_deal(organization_id, deal_id)
+        try:
+            return await self.activities.list_for_deal(
+                deal.id,
+                limit=limit,
+                order=order,
+                types=types,
+                author_id=author_id,
+                include_payload=include_payload,
+                cursor=cursor,
+            )
+        except InvalidCursor as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
-    async def list_for_deal(self, organization_id: int, deal_id: int) -> list[Activity]:
+    async def feed(
+        self,
+        organization_id: int,
+        *,
+        limit: int,
+        types: list[ActivityType] | None,
+        author_id: int | None,
+        owner_id: int | None,
+        stage: DealStage | None,
+        include_payload: bool,
+        cursor: str | None,
+    ) -> Page[Any]:
+        try:
+            return await self.activities.feed(
+                organization_id,
+                limit=limit,
+                types=types,
+                author_id=author_id,
+                owner_id=owner_id,
+                stage=stage,
+                include_payload=include_payload,
+                cursor=cursor,
+            )
+        except InvalidCursor as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    async def export_for_deal(self, organization_id: int, deal_id: int) -> AsyncIterator[Activity]:
+        stmt = self.activities.deal_query(deal_id).where(
+            Activity.organization_id == organization_id
+        )
+        batch_size = get_settings().export_batch_size
+        async for activity in self.activities.stream(stmt, batch_size=batch_size):
+            yield activity
+
+    async def get_deal(self, organization_id: int, deal_id: int) -> Deal:
         deal = await self.deals.get(organization_id, deal_id)
         if not deal:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deal not found")
-        return await self.activities.list_for_deal(deal.id)
+        return deal
 
     async def add_comment(
         self, organization_id: int, deal_id: int, *, author_id: int, data: ActivityCreate
@@ -29,15 +95,17 @@ class ActivityService:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Manual activities must be comments"
             )
-        deal = await self.deals.get(organization_id, deal_id)
-        if not deal:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deal not found")
+        deal = await self.get_deal(organization_id, deal_id)
         activity = Activity(
+            organization_id=deal.organization_id,
             deal_id=deal.id,
             author_id=author_id,
             type=ActivityType.COMMENT,
             payload=data.payload,
         )
         await self.activities.create(activity)
+        await self.changes.record(
+            organization_id, ChangeEntity.ACTIVITY, ChangeOp.CREATED, [activity.id]
+        )
         await self.session.commit()
         return activity
@@ -1,62 +1,86 @@
 from __future__ import annotations
 
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Dict
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.caching.memory import SimpleTTLCache
+from app.caching.analytics import analytics_cache
 from app.core.config import get_settings
 from app.models.enums import DealStage, DealStatus
-from app.repositories.deal_repository import DealRepository
-from app.schemas.analytics import DealFunnelStageBreakdown, DealsFunnelResponse, DealsSummaryResponse
+from app.repositories.deal_stats_repository import DealStatsRepository
+from app.schemas.analytics import (
+    DealFunnelStageBreakdown,
+    DealsFunnelResponse,
+    DealsSummaryResponse,
+    DealsTimeseriesPoint,
+    DealsTimeseriesResponse,
+    TimeseriesBucket,
+)
 
 
 class AnalyticsService:
-    _summary_cache: SimpleTTLCache[DealsSummaryResponse] = SimpleTTLCache()
-    _funnel_cache: SimpleTTLCache[DealsFunnelResponse] = SimpleTTLCache()
-
     def __init__(self, session: AsyncSession):
-        self.repo = DealRepository(session)
+        self.stats = DealStatsRepository(session)
         self.settings = get_settings()
 
     async def deals_summary(self, organization_id: int, *, days: int) -> DealsSummaryResponse:
-        cache_key = (organization_id, days, "summary")
-        cached = self._summary_cache.get(cache_key)
-        if cached:
-            return cached
+        return await analytics_cache.get_or_compute(
+            organization_id,
+            f"summary:{days}",
+            DealsSummaryResponse,
+            lambda: self._deals_summary(organization_id, days),
+            self.settings.analytics_cache_ttl_seconds,
+        )
+
+    async def deals_funnel(self, organization_id: int) -> DealsFunnelResponse:
+        return await analytics_cache.get_or_compute(
+            organization_id,
+            "funnel",
+            DealsFunnelResponse,
+            lambda: self._deals_funnel(organization_id),
+            self.settings.analytics_cache_ttl_seconds,
+        )
+
+    async def deals_timeseries(
+        self, organization_id: int, *, bucket: TimeseriesBucket, days: int
+    ) -> DealsTimeseriesResponse:
+        return await analytics_cache.get_or_compute(
+            organization_id,
+            f"timeseries:{bucket.value}:{days}",
+            DealsTimeseriesResponse,
+            lambda: self._deals_timeseries(organization_id, bucket, days),
+            self.settings.analytics_cache_ttl_seconds,
+        )
 
-        rows = await self.repo.summarise_by_status(organization_id)
+    async def _deals_summary(self, organization_id: int, days: int) -> DealsSummaryResponse:
         count_by_status: Dict[DealStatus, int] = {status: 0 for status in DealStatus}
         amount_by_status: Dict[DealStatus, Decimal] = {status: Decimal("0") for status in DealStatus}
-        for status, count, total in rows:
-            count_by_status[status] = count
-            amount_by_status[status] = total
+        for row in await self.stats.for_organization(organization_id):
+            count_by_status[row.status] += row.deal_count
+            amount_by_status[row.status] += row.amount_total
 
-        average = await self.repo.average_won_amount(organization_id)
-        recent = await self.repo.count_new_deals(organization_id, days)
+        won = count_by_status[DealStatus.WON]
+        average = None
+        if won:
+            average = (amount_by_status[DealStatus.WON] / won).quantize(Decimal("0.01"))
+        first_day = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+        recent = await self.stats.created_since(organization_id, first_day)
 
-        response = DealsSummaryResponse(
+        return DealsSummaryResponse(
             count_by_status=count_by_status,
             amount_by_status=amount_by_status,
             average_won_amount=average,
             new_deals_last_n_days=recent,
         )
-        self._summary_cache.set(cache_key, response, self.settings.analytics_cache_ttl_seconds)
-        return response
-
-    async def deals_funnel(self, organization_id: int) -> DealsFunnelResponse:
-        cache_key = (organization_id, "funnel")
-        cached = self._funnel_cache.get(cache_key)
-        if cached:
-            return cached
 
-        rows = await self.repo.funnel_counts(organization_id)
+    async def _deals_funnel(self, organization_id: int) -> DealsFunnelResponse:
         result: dict[DealStage, Dict[DealStatus, int]] = {
             stage: {status: 0 for status in DealStatus} for stage in DealStage
         }
-        for stage, status, count in rows:
-            result[stage][status] = count
+        for row in await self.stats.for_organization(organization_id):
+            result[row.stage][row.status] = row.deal_count
 
         ordered_stages = list(DealStage)
         previous_total: int | None = None
@@ -76,6 +100,32 @@ class AnalyticsService:
             )
             previous_total = stage_total if stage_total > 0 else previous_total
 
-        response = DealsFunnelResponse(stages=breakdown)
-        self._funnel_cache.set(cache_key, response, self.settings.analytics_cache_ttl_seconds)
-        return response
+        return DealsFunnelResponse(stages=breakdown)
+
+    async def _deals_timeseries(
+        self, organization_id: int, bucket: TimeseriesBucket, days: int
+    ) -> DealsTimeseriesResponse:
+        today = datetime.now(timezone.utc).date()
+        first_day = today - timedelta(days=days - 1)
+        points: dict[date, DealsTimeseriesPoint] = {}
+        for offset in range(days):
+            start = _bucket_start(first_day + timedelta(days=offset), bucket)
+            points.setdefault(start, DealsTimeseriesPoint(start=start))
+        for row in await self.stats.daily(organization_id, first_day):
+            # rows dated after today (clock skew between writers) fall outside the window
+            point = points.get(_bucket_start(row.day, bucket))
+            if point is None:
+                continue
+            point.created += row.created_count
+            point.won += row.won_count
+            point.lost += row.lost_count
+            point.won_amount += row.won_amount
+        return DealsTimeseriesResponse(bucket=bucket, days=days, points=list(points.values()))
+
+
+def _bucket_start(day: date, bucket: TimeseriesBucket) -> date:
+    if bucket == TimeseriesBucket.WEEK:
+        return day - timedelta(days=day.weekday())
+    if bucket == TimeseriesBucket.MONTH:
+        return day.replace(day=1)
+    return day
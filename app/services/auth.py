@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 from datetime import timedelta
+from typing import Any
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
-from app.core.security import create_token, get_password_hash, verify_password
+from app.core.security import (
+    PasswordHasherBusy,
+    create_token,
+    get_password_hash_async,
+    verify_password_async,
+)
 from app.models.enums import MemberRole
 from app.models.models import Organization, OrganizationMember, User
 from app.repositories.organization_repository import OrganizationRepository
@@ -26,7 +32,8 @@ class AuthService:
         if existing:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email exists")
 
-        user = User(email=data.email, hashed_password=get_password_hash(data.password), name=data.name)
+        hashed_password = await self._hash_password(data.password)
+        user = User(email=data.email, hashed_password=hashed_password, name=data.name)
         organization = Organization(name=data.organization_name)
         membership = OrganizationMember(user=user, organization=organization, role=MemberRole.OWNER)
 
@@ -35,19 +42,32 @@ class AuthService:
         await self.organizations.add_member(membership)
         await self.session.commit()
 
-        return self._issue_tokens(user.id)
+        return await self._issue_tokens(user.id)
 
     async def login(self, data: LoginRequest) -> TokenPair:
         user = await self.users.get_by_email(data.email)
-        if not user or not verify_password(data.password, user.hashed_password):
+        if not user or not await self._verify_password(data.password, user.hashed_password):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-        return self._issue_tokens(user.id)
+        return await self._issue_tokens(user.id)
 
-    def _issue_tokens(self, user_id: int) -> TokenPair:
+    async def _hash_password(self, password: str) -> str:
+        try:
+            return await get_password_hash_async(password)
+        except PasswordHasherBusy as exc:
+            raise _busy_error() from exc
+
+    async def _verify_password(self, password: str, hashed_password: str) -> bool:
+        try:
+            return await verify_password_async(password, hashed_password)
+        except PasswordHasherBusy as exc:
+            raise _busy_error() from exc
+
+    async def _issue_tokens(self, user_id: int) -> TokenPair:
         access = create_token(
             str(user_id),
             token_type="access",
             expires_delta=timedelta(minutes=self.settings.token.access_token_expire_minutes),
+            extra_claims=await self._membership_claims(user_id),
         )
         refresh = create_token(
             str(user_id),
@@ -55,3 +75,21 @@ class AuthService:
             expires_delta=timedelta(minutes=self.settings.token.refresh_token_expire_minutes),
         )
         return TokenPair(access_token=access, refresh_token=refresh)
+
+    async def _membership_claims(self, user_id: int) -> dict[str, Any] | None:
+        if not self.settings.token.embed_memberships:
+            return None
+        version = await self.users.get_membership_version(user_id)
+        rows = await self.organizations.list_for_user(user_id)
+        return {
+            "orgs": {str(organization.id): membership.role.value for organization, membership in rows},
+            "mv": version,
+        }
+
+
+def _busy_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is busy, retry later",
+        headers={"Retry-After": "1"},
+    )
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.repositories.change_repository import CHANGED_ORGANIZATIONS, ChangeRepository
+from app.schemas.change import ChangeRead, ChangesResponse
+
+# Other workers' writes are only seen by polling; this bounds how late a waiter notices them.
+POLL_INTERVAL_SECONDS = 1.0
+
+
+class ChangeNotifier:
+    """Wakes long-polling requests of this process when an organization's change log grows."""
+
+    def __init__(self) -> None:
+        self._events: dict[int, asyncio.Event] = {}
+
+    def event(self, organization_id: int) -> asyncio.Event:
+        return self._events.setdefault(organization_id, asyncio.Event())
+
+    def notify(self, organization_id: int) -> None:
+        pending = self._events.pop(organization_id, None)
+        if pending is not None:
+            pending.set()
+
+
+change_notifier = ChangeNotifier()
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_committed_changes(session: Session) -> None:
+    for organization_id in session.info.pop(CHANGED_ORGANIZATIONS, ()):
+        change_notifier.notify(organization_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_changes(session: Session) -> None:
+    session.info.pop(CHANGED_ORGANIZATIONS, None)
+
+
+class ChangeService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repo = ChangeRepository(session)
+
+    async def changes_since(
+        self, organization_id: int, *, since: int, limit: int, wait_seconds: float
+    ) -> ChangesResponse:
+        deadline = time.monotonic() + wait_seconds
+        while True:
+            pending = change_notifier.event(organization_id)
+            changes = await self.repo.since(organization_id, since, limit=limit + 1)
+            remaining = deadline - time.monotonic()
+            if changes or remaining <= 0:
+                break
+            # release the pooled connection while waiting
+            await self.session.rollback()
+            try:
+                await asyncio.wait_for(pending.wait(), min(remaining, POLL_INTERVAL_SECONDS))
+            except asyncio.TimeoutError:
+                pass
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        return ChangesResponse(
+            changes=[ChangeRead.model_validate(change) for change in changes],
+            next_since=changes[-1].version if changes else since,
+            has_more=has_more,
+        )
@@ -1,19 +1,38 @@
 from __future__ import annotations
 
+from typing import Any, AsyncIterator, Iterable, Sequence
+
 from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.enums import MemberRole
+from app.core.config import get_settings
+from app.models.enums import ChangeEntity, ChangeOp, MemberRole
 from app.models.models import Contact, OrganizationMember
+from app.repositories.activity_repository import ActivityRepository
+from app.repositories.change_repository import ChangeRepository
 from app.repositories.contact_repository import ContactRepository
-from app.schemas.contact import ContactCreate
+from app.repositories.deal_repository import DealRepository
+from app.repositories.organization_repository import OrganizationRepository
+from app.repositories.pagination import InvalidCursor, Page
+from app.repositories.task_repository import TaskRepository
+from app.schemas.activity import ActivityRead
+from app.schemas.contact import ContactCreate, ContactOverview, ContactOverviewDeal, ContactRead
+from app.schemas.deal import DealRead
+from app.schemas.imports import ImportResult
+from app.schemas.task import TaskRead
+from app.services.imports import ImportReport, RawRow, chunked
 
 
 class ContactService:
     def __init__(self, session: AsyncSession):
         self.session = session
         self.repo = ContactRepository(session)
+        self.organizations = OrganizationRepository(session)
+        self.changes = ChangeRepository(session)
+        self.deals = DealRepository(session)
+        self.tasks = TaskRepository(session)
+        self.activities = ActivityRepository(session)
 
     async def list_contacts(
         self,
@@ -24,15 +43,38 @@ class ContactService:
         page_size: int,
         search: str | None,
         owner_id: int | None,
-    ) -> list[Contact]:
+        cursor: str | None = None,
+        fields: Sequence[str] | None = None,
+        ids: Sequence[int] | None = None,
+    ) -> Page[Any]:
         owner_filter = owner_id if role != MemberRole.MEMBER else None
-        return await self.repo.list(
-            organization_id,
-            page=page,
-            page_size=page_size,
-            search=search,
-            owner_id=owner_filter,
-        )
+        try:
+            return await self.repo.list(
+                organization_id,
+                page=page,
+                page_size=page_size,
+                search=search,
+                owner_id=owner_filter,
+                cursor=cursor,
+                fields=fields,
+                ids=ids,
+            )
+        except InvalidCursor as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    async def export_contacts(
+        self,
+        organization_id: int,
+        *,
+        role: MemberRole,
+        search: str | None,
+        owner_id: int | None,
+    ) -> AsyncIterator[Contact]:
+        owner_filter = owner_id if role != MemberRole.MEMBER else None
+        stmt = self.repo.filtered_query(organization_id, search=search, owner_id=owner_filter)
+        stmt = stmt.order_by(Contact.id)
+        async for contact in self.repo.stream(stmt, batch_size=get_settings().export_batch_size):
+            yield contact
 
     async def create_contact(
         self,
@@ -55,9 +97,95 @@ class ContactService:
             phone=data.phone,
         )
         await self.repo.create(contact)
+        await self.changes.record(
+            organization_id, ChangeEntity.CONTACT, ChangeOp.CREATED, [contact.id]
+        )
         await self.session.commit()
         return contact
 
+    async def import_contacts(
+        self,
+        organization_id: int,
+        *,
+        role: MemberRole,
+        requestor_id: int,
+        rows: Iterable[RawRow],
+    ) -> ImportResult:
+        settings = get_settings()
+        report = ImportReport(max_errors=settings.import_max_errors)
+        async for chunk in chunked(rows, settings.import_chunk_size):
+            valid = report.validate(chunk, ContactCreate)
+            requested_owners = {data.owner_id for _, data in valid if data.owner_id}
+            known_owners = (
+                await self.organizations.member_ids(organization_id, requested_owners)
+                if role != MemberRole.MEMBER
+                else set()
+            )
+            values: list[dict] = []
+            for number, data in valid:
+                owner_id = requestor_id
+                if role != MemberRole.MEMBER and data.owner_id:
+                    if data.owner_id not in known_owners:
+                        report.fail(number, "Unknown owner")
+                        continue
+                    owner_id = data.owner_id
+                values.append(
+                    {
+                        "organization_id": organization_id,
+                        "owner_id": owner_id,
+                        "name": data.name,
+                        "email": data.email,
+                        "phone": data.phone,
+                    }
+                )
+            if values:
+                contact_ids = await self.repo.create_many(values)
+                await self.changes.record(
+                    organization_id, ChangeEntity.CONTACT, ChangeOp.CREATED, contact_ids
+                )
+                await self.session.commit()
+                report.inserted += len(values)
+        return report.result()
+
+    async def overview(
+        self,
+        organization_id: int,
+        contact_id: int,
+        *,
+        deal_limit: int,
+        tasks_per_deal: int,
+        activities_per_deal: int,
+    ) -> ContactOverview:
+        """Contact, its newest deals, their open tasks and latest activities in five queries."""
+        contact = await self.repo.get(organization_id, contact_id)
+        if not contact:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found")
+        deals = await self.deals.for_contact(organization_id, contact_id, limit=deal_limit)
+        deal_ids = {deal.id for deal in deals}
+        counts = await self.tasks.open_counts(deal_ids)
+        tasks: dict[int, list[TaskRead]] = {deal_id: [] for deal_id in deal_ids}
+        for task in await self.tasks.open_for_deals(deal_ids, per_deal=tasks_per_deal):
+            tasks[task.deal_id].append(TaskRead.model_validate(task))
+        activities: dict[int, list[ActivityRead]] = {deal_id: [] for deal_id in deal_ids}
+        for activity in await self.activities.recent_for_deals(
+            deal_ids, per_deal=activities_per_deal
+        ):
+            activities[activity.deal_id].append(ActivityRead.model_validate(activity))
+        return ContactOverview(
+            contact=ContactRead.model_validate(contact),
+            deals=[
+                ContactOverviewDeal.model_validate(
+                    {
+                        **{name: getattr(deal, name) for name in DealRead.model_fields},
+                        "open_task_count": counts.get(deal.id, 0),
+                        "open_tasks": tasks[deal.id],
+                        "recent_activities": activities[deal.id],
+                    }
+                )
+                for deal in deals
+            ],
+        )
+
     async def delete_contact(
         self,
         organization_id: int,
@@ -77,6 +205,9 @@ class ContactService:
                 detail="Contact has deals and cannot be removed",
             )
         await self.repo.delete(contact)
+        await self.changes.record(
+            organization_id, ChangeEntity.CONTACT, ChangeOp.DELETED, [contact_id]
+        )
         await self.session.commit()
 
     async def _ensure_member(self, organization_id: int, user_id: int) -> None:
@@ -1,15 +1,41 @@
 from __future__ import annotations
 
 from decimal import Decimal
+from typing import Any, AsyncIterator, Iterable, Sequence
 
 from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.enums import ActivityType, DealStage, DealStatus, MemberRole
-from app.models.models import Activity, Contact, Deal, OrganizationMember
+from app.caching.analytics import invalidate_organization
+from app.core.config import get_settings
+from app.models.enums import (
+    ActivityType,
+    ChangeEntity,
+    ChangeOp,
+    DealStage,
+    DealStatus,
+    MemberRole,
+)
+from app.models.models import Contact, Deal, OrganizationMember
+from app.repositories.activity_repository import ActivityRepository
+from app.repositories.change_repository import ChangeRepository
+from app.repositories.contact_repository import ContactRepository
 from app.repositories.deal_repository import DealRepository
-from app.schemas.deal import DealCreate, DealUpdate
+from app.repositories.deal_stats_repository import (
+    DealSnapshot,
+    DealStatsRepository,
+    StatsDelta,
+    edits_won_amount,
+    won_transition_amount,
+)
+from app.repositories.organization_repository import OrganizationRepository
+from app.repositories.pagination import InvalidCursor, Page
+from app.repositories.task_repository import TaskRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.deal import DealCreate, DealInclude, DealUpdate
+from app.schemas.imports import ImportResult
+from app.services.imports import ImportReport, RawRow, chunked
 
 STAGE_ORDER = {
     DealStage.QUALIFICATION: 1,
@@ -23,6 +49,13 @@ class DealService:
     def __init__(self, session: AsyncSession):
         self.session = session
         self.repo = DealRepository(session)
+        self.contacts = ContactRepository(session)
+        self.activities = ActivityRepository(session)
+        self.organizations = OrganizationRepository(session)
+        self.stats = DealStatsRepository(session)
+        self.changes = ChangeRepository(session)
+        self.tasks = TaskRepository(session)
+        self.users = UserRepository(session)
 
     async def list_deals(
         self,
@@ -38,20 +71,83 @@ class DealService:
         owner_id: int | None,
         order_by: str,
         order: str,
-    ) -> list[Deal]:
+        cursor: str | None = None,
+        fields: Sequence[str] | None = None,
+        ids: Sequence[int] | None = None,
+    ) -> Page[Any]:
+        effective_owner = owner_id if role != MemberRole.MEMBER else None
+        try:
+            return await self.repo.list(
+                organization_id,
+                page=page,
+                page_size=page_size,
+                statuses=statuses,
+                min_amount=min_amount,
+                max_amount=max_amount,
+                stage=stage,
+                owner_id=effective_owner,
+                order_by=order_by,
+                order=order,
+                cursor=cursor,
+                fields=fields,
+                ids=ids,
+            )
+        except InvalidCursor as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    async def embed(
+        self, organization_id: int, deals: Sequence[Any], include: set[DealInclude]
+    ) -> dict[int, dict[str, Any]]:
+        """Related resources per deal id: one query per included name, whatever the page size."""
+        embedded: dict[int, dict[str, Any]] = {deal.id: {} for deal in deals}
+        if not deals:
+            return embedded
+        deal_ids = set(embedded)
+        if DealInclude.CONTACT in include:
+            contacts = await self.contacts.summaries(
+                organization_id, {deal.contact_id for deal in deals}
+            )
+            for deal in deals:
+                embedded[deal.id]["contact"] = _as_dict(contacts.get(deal.contact_id))
+        if DealInclude.OWNER in include:
+            owners = await self.users.summaries({deal.owner_id for deal in deals})
+            for deal in deals:
+                embedded[deal.id]["owner"] = _as_dict(owners.get(deal.owner_id))
+        if DealInclude.OPEN_TASK_COUNT in include:
+            counts = await self.tasks.open_counts(deal_ids)
+            for deal_id, fields in embedded.items():
+                fields["open_task_count"] = counts.get(deal_id, 0)
+        if DealInclude.LAST_ACTIVITY in include:
+            latest = await self.activities.latest_for_deals(deal_ids)
+            for deal_id, fields in embedded.items():
+                activity = _as_dict(latest.get(deal_id))
+                if activity:
+                    del activity["deal_id"]
+                fields["last_activity"] = activity
+        return embedded
+
+    async def export_deals(
+        self,
+        organization_id: int,
+        *,
+        role: MemberRole,
+        statuses: list[DealStatus] | None,
+        min_amount: Decimal | None,
+        max_amount: Decimal | None,
+        stage: DealStage | None,
+        owner_id: int | None,
+    ) -> AsyncIterator[Deal]:
         effective_owner = owner_id if role != MemberRole.MEMBER else None
-        return await self.repo.list(
+        stmt = self.repo.filtered_query(
             organization_id,
-            page=page,
-            page_size=page_size,
             statuses=statuses,
             min_amount=min_amount,
             max_amount=max_amount,
             stage=stage,
             owner_id=effective_owner,
-            order_by=order_by,
-            order=order,
-        )
+        ).order_by(Deal.id)
+        async for deal in self.repo.stream(stmt, batch_size=get_settings().export_batch_size):
+            yield deal
 
     async def create_deal(
         self,
@@ -76,9 +172,71 @@ class DealService:
             currency=data.currency,
         )
         await self.repo.create(deal)
+        delta = StatsDelta()
+        delta.create(deal.stage, deal.status, deal.amount)
+        await self.stats.apply(organization_id, delta)
+        await self.changes.record(organization_id, ChangeEntity.DEAL, ChangeOp.CREATED, [deal.id])
         await self.session.commit()
+        await invalidate_organization(organization_id)
         return deal
 
+    async def import_deals(
+        self,
+        organization_id: int,
+        *,
+        role: MemberRole,
+        requestor_id: int,
+        rows: Iterable[RawRow],
+    ) -> ImportResult:
+        settings = get_settings()
+        report = ImportReport(max_errors=settings.import_max_errors)
+        async for chunk in chunked(rows, settings.import_chunk_size):
+            valid = report.validate(chunk, DealCreate)
+            known_contacts = await self.contacts.existing_ids(
+                organization_id, {data.contact_id for _, data in valid}
+            )
+            requested_owners = {data.owner_id for _, data in valid if data.owner_id}
+            known_owners = (
+                await self.organizations.member_ids(organization_id, requested_owners)
+                if role != MemberRole.MEMBER
+                else set()
+            )
+            values: list[dict] = []
+            delta = StatsDelta()
+            for number, data in valid:
+                owner_id = requestor_id
+                if role != MemberRole.MEMBER and data.owner_id:
+                    if data.owner_id not in known_owners:
+                        report.fail(number, "Unknown owner")
+                        continue
+                    owner_id = data.owner_id
+                if data.contact_id not in known_contacts:
+                    report.fail(number, "Contact not in organization")
+                    continue
+                values.append(
+                    {
+                        "organization_id": organization_id,
+                        "contact_id": data.contact_id,
+                        "owner_id": owner_id,
+                        "title": data.title,
+                        "amount": data.amount,
+                        "currency": data.currency,
+                        "stage": DealStage.QUALIFICATION,
+                        "status": DealStatus.NEW,
+                    }
+                )
+                delta.create(DealStage.QUALIFICATION, DealStatus.NEW, data.amount)
+            if values:
+                deal_ids = await self.repo.create_many(values)
+                await self.stats.apply(organization_id, delta)
+                await self.changes.record(
+                    organization_id, ChangeEntity.DEAL, ChangeOp.CREATED, deal_ids
+                )
+                await self.session.commit()
+                await invalidate_organization(organization_id)
+                report.inserted += len(values)
+        return report.result()
+
     async def update_deal(
         self,
         organization_id: int,
@@ -93,10 +251,91 @@ class DealService:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deal not found")
         if role == MemberRole.MEMBER and deal.owner_id != user_id:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed")
+        valid_owners = await self._valid_owners(organization_id, role, [data])
 
-        previous_status = deal.status
-        previous_stage = deal.stage
+        before = (deal.stage, deal.status, deal.amount)
+        self._apply_changes(deal, data, role, valid_owners)
+
+        await self.session.flush()
+        won_days = await self.stats.won_days({deal.id} if edits_won_amount(before, deal) else set())
+        delta = StatsDelta()
+        delta.move(before, deal, won_days.get(deal.id))
+        await self.stats.apply(organization_id, delta)
+        activity_ids = await self.activities.create_many(self._activity_rows(deal, before))
+        await self.changes.record(organization_id, ChangeEntity.DEAL, ChangeOp.UPDATED, [deal.id])
+        await self.changes.record(
+            organization_id, ChangeEntity.ACTIVITY, ChangeOp.CREATED, activity_ids
+        )
+        await self.session.commit()
+        await invalidate_organization(organization_id)
+        return deal
 
+    async def update_deals(
+        self,
+        organization_id: int,
+        *,
+        user_id: int,
+        role: MemberRole,
+        updates: list[tuple[int, DealUpdate]],
+    ) -> list[Deal]:
+        deal_ids = [deal_id for deal_id, _ in updates]
+        if len(set(deal_ids)) != len(deal_ids):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Duplicate deal ids in batch"
+            )
+        deals = {deal.id: deal for deal in await self.repo.get_many(organization_id, deal_ids)}
+        missing = [deal_id for deal_id in deal_ids if deal_id not in deals]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=f"Deals not found: {missing}"
+            )
+        valid_owners = await self._valid_owners(organization_id, role, [d for _, d in updates])
+
+        activity_rows: list[dict] = []
+        moves: list[tuple[DealSnapshot, Deal]] = []
+        for deal_id, data in updates:
+            deal = deals[deal_id]
+            before = (deal.stage, deal.status, deal.amount)
+            try:
+                if role == MemberRole.MEMBER and deal.owner_id != user_id:
+                    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed")
+                self._apply_changes(deal, data, role, valid_owners)
+            except HTTPException as exc:
+                await self.session.rollback()
+                raise HTTPException(
+                    status_code=exc.status_code, detail=f"Deal {deal_id}: {exc.detail}"
+                ) from exc
+            activity_rows.extend(self._activity_rows(deal, before))
+            moves.append((before, deal))
+
+        await self.session.flush()
+        won_days = await self.stats.won_days(
+            {deal.id for before, deal in moves if edits_won_amount(before, deal)}
+        )
+        delta = StatsDelta()
+        for before, deal in moves:
+            delta.move(before, deal, won_days.get(deal.id))
+        await self.stats.apply(organization_id, delta)
+        activity_ids = await self.activities.create_many(activity_rows)
+        await self.changes.record(organization_id, ChangeEntity.DEAL, ChangeOp.UPDATED, deal_ids)
+        await self.changes.record(
+            organization_id, ChangeEntity.ACTIVITY, ChangeOp.CREATED, activity_ids
+        )
+        await self.session.commit()
+        await invalidate_organization(organization_id)
+        return [deals[deal_id] for deal_id in deal_ids]
+
+    async def _valid_owners(
+        self, organization_id: int, role: MemberRole, changes: list[DealUpdate]
+    ) -> set[int]:
+        if role == MemberRole.MEMBER:
+            return set()
+        requested = {data.owner_id for data in changes if data.owner_id is not None}
+        return await self.organizations.member_ids(organization_id, requested)
+
+    def _apply_changes(
+        self, deal: Deal, data: DealUpdate, role: MemberRole, valid_owners: set[int]
+    ) -> None:
         if data.title is not None:
             deal.title = data.title
         if data.amount is not None:
@@ -106,10 +345,11 @@ class DealService:
         if data.owner_id is not None:
             if role == MemberRole.MEMBER:
                 raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed")
-            await self._ensure_member(organization_id, data.owner_id)
+            if data.owner_id not in valid_owners:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown owner")
             deal.owner_id = data.owner_id
         if data.stage is not None:
-            self._validate_stage_transition(previous_stage, data.stage, role)
+            self._validate_stage_transition(deal.stage, data.stage, role)
             deal.stage = data.stage
         if data.status is not None:
             if data.status == DealStatus.WON and (deal.amount is None or deal.amount <= 0):
@@ -118,33 +358,33 @@ class DealService:
                 )
             deal.status = data.status
 
-        await self.session.flush()
-        await self._record_activity_if_needed(deal, previous_status, previous_stage)
-        await self.session.commit()
-        return deal
-
-    async def _record_activity_if_needed(
-        self, deal: Deal, previous_status: DealStatus, previous_stage: DealStage
-    ) -> None:
-        activities: list[Activity] = []
+    def _activity_rows(self, deal: Deal, before: DealSnapshot) -> list[dict]:
+        previous_stage, previous_status, _ = before
+        rows: list[dict] = []
         if deal.status != previous_status:
-            activities.append(
-                Activity(
-                    deal_id=deal.id,
-                    type=ActivityType.STATUS_CHANGED,
-                    payload={"from": previous_status.value, "to": deal.status.value},
-                )
+            payload = {"from": previous_status.value, "to": deal.status.value}
+            moved = won_transition_amount(before, deal)
+            if moved is not None:
+                # the daily rollup rebuild values wins and losses with it
+                payload["amount"] = str(moved)
+            rows.append(
+                {
+                    "organization_id": deal.organization_id,
+                    "deal_id": deal.id,
+                    "type": ActivityType.STATUS_CHANGED,
+                    "payload": payload,
+                }
             )
         if deal.stage != previous_stage:
-            activities.append(
-                Activity(
-                    deal_id=deal.id,
-                    type=ActivityType.STAGE_CHANGED,
-                    payload={"from": previous_stage.value, "to": deal.stage.value},
-                )
+            rows.append(
+                {
+                    "organization_id": deal.organization_id,
+                    "deal_id": deal.id,
+                    "type": ActivityType.STAGE_CHANGED,
+                    "payload": {"from": previous_stage.value, "to": deal.stage.value},
+                }
             )
-        if activities:
-            self.session.add_all(activities)
+        return rows
 
     def _validate_stage_transition(
         self, current_stage: DealStage, new_stage: DealStage, role: MemberRole
@@ -175,3 +415,7 @@ class DealService:
         )
         if not await self.session.scalar(stmt):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown owner")
+
+
+def _as_dict(row: Any) -> dict[str, Any] | None:
+    return None if row is None else row._asdict()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, AsyncIterator, Iterable, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
+
+from app.schemas.imports import ImportResult, ImportRowError
+
+M = TypeVar("M", bound=BaseModel)
+
+
+@dataclass
+class RawRow:
+    number: int
+    data: dict[str, Any] | None
+    error: str | None = None
+
+
+@dataclass
+class ImportReport:
+    max_errors: int
+    received: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: list[ImportRowError] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+
+    def fail(self, row: int, detail: str) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(ImportRowError(row=row, detail=detail))
+
+    def validate(self, chunk: list[RawRow], schema: type[M]) -> list[tuple[int, M]]:
+        valid: list[tuple[int, M]] = []
+        for raw in chunk:
+            self.received += 1
+            if raw.data is None:
+                self.fail(raw.number, raw.error or "Malformed row")
+                continue
+            try:
+                valid.append((raw.number, schema.model_validate(raw.data)))
+            except ValidationError as exc:
+                self.fail(raw.number, _describe(exc))
+        return valid
+
+    def result(self) -> ImportResult:
+        elapsed = time.perf_counter() - self.started
+        return ImportResult(
+            received=self.received,
+            inserted=self.inserted,
+            failed=self.failed,
+            errors=self.errors,
+            errors_truncated=self.failed > len(self.errors),
+            elapsed_seconds=round(elapsed, 3),
+            rows_per_second=round(self.received / elapsed, 1) if elapsed else 0.0,
+        )
+
+
+async def chunked(rows: Iterable[RawRow], size: int) -> AsyncIterator[list[RawRow]]:
+    """Pull ``size`` rows at a time in the threadpool: reading and parsing the upload blocks."""
+    iterator = iter(rows)
+    while chunk := await run_in_threadpool(lambda: list(islice(iterator, size))):
+        yield chunk
+
+
+def _describe(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+    )
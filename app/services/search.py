@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.search_repository import SearchRepository
+from app.schemas.contact import ContactRead
+from app.schemas.deal import DealRead
+from app.schemas.search import ContactSearchHit, DealSearchHit, SearchResponse
+
+
+class SearchService:
+    def __init__(self, session: AsyncSession):
+        self.repo = SearchRepository(session)
+
+    async def search(self, organization_id: int, query: str, *, limit: int) -> SearchResponse:
+        contacts = await self.repo.search_contacts(organization_id, query, limit=limit)
+        deals = await self.repo.search_deals(organization_id, query, limit=limit)
+        return SearchResponse(
+            contacts=[
+                ContactSearchHit(
+                    **ContactRead.model_validate(contact).model_dump(), score=round(score, 4)
+                )
+                for contact, score in contacts
+            ],
+            deals=[
+                DealSearchHit(**DealRead.model_validate(deal).model_dump(), score=round(score, 4))
+                for deal, score in deals
+            ],
+        )
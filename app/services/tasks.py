@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 from datetime import date, datetime, time, timezone
+from typing import Any, AsyncIterator, Sequence
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.enums import ActivityType, MemberRole
+from app.core.config import get_settings
+from app.models.enums import ActivityType, ChangeEntity, ChangeOp, MemberRole
 from app.models.models import Activity, Deal, Task
+from app.repositories.change_repository import ChangeRepository
 from app.repositories.deal_repository import DealRepository
+from app.repositories.pagination import InvalidCursor, Page
 from app.repositories.task_repository import TaskRepository
 from app.schemas.task import TaskCreate, TaskUpdate
 
@@ -17,23 +21,64 @@ class TaskService:
         self.session = session
         self.repo = TaskRepository(session)
         self.deals = DealRepository(session)
+        self.changes = ChangeRepository(session)
 
     async def list_tasks(
         self,
         organization_id: int,
         *,
+        role: MemberRole,
+        page: int,
+        page_size: int,
         deal_id: int | None,
         only_open: bool,
         due_before: datetime | None,
         due_after: datetime | None,
-    ) -> list[Task]:
-        return await self.repo.list(
+        owner_id: int | None = None,
+        cursor: str | None = None,
+        fields: Sequence[str] | None = None,
+        ids: Sequence[int] | None = None,
+    ) -> Page[Any]:
+        effective_owner = owner_id if role != MemberRole.MEMBER else None
+        try:
+            return await self.repo.list(
+                organization_id,
+                page=page,
+                page_size=page_size,
+                deal_id=deal_id,
+                only_open=only_open,
+                due_before=due_before,
+                due_after=due_after,
+                owner_id=effective_owner,
+                cursor=cursor,
+                fields=fields,
+                ids=ids,
+            )
+        except InvalidCursor as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    async def export_tasks(
+        self,
+        organization_id: int,
+        *,
+        role: MemberRole,
+        deal_id: int | None,
+        only_open: bool,
+        due_before: datetime | None,
+        due_after: datetime | None,
+        owner_id: int | None,
+    ) -> AsyncIterator[Task]:
+        effective_owner = owner_id if role != MemberRole.MEMBER else None
+        stmt = self.repo.filtered_query(
             organization_id,
             deal_id=deal_id,
             only_open=only_open,
             due_before=due_before,
             due_after=due_after,
-        )
+            owner_id=effective_owner,
+        ).order_by(Task.id)
+        async for task in self.repo.stream(stmt, batch_size=get_settings().export_batch_size):
+            yield task
 
     async def create_task(
         self,
@@ -49,6 +94,7 @@ class TaskService:
         if role == MemberRole.MEMBER and deal.owner_id != user_id:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed")
         task = Task(
+            organization_id=deal.organization_id,
             deal_id=deal.id,
             title=data.title,
             description=data.description,
@@ -57,12 +103,18 @@ class TaskService:
         await self.repo.create(task)
         await self.session.flush()
         activity = Activity(
+            organization_id=deal.organization_id,
             deal_id=deal.id,
             author_id=user_id,
             type=ActivityType.TASK_CREATED,
             payload={"task_id": task.id, "title": task.title},
         )
         self.session.add(activity)
+        await self.session.flush()
+        await self.changes.record(organization_id, ChangeEntity.TASK, ChangeOp.CREATED, [task.id])
+        await self.changes.record(
+            organization_id, ChangeEntity.ACTIVITY, ChangeOp.CREATED, [activity.id]
+        )
         await self.session.commit()
         return task
 
@@ -91,6 +143,7 @@ class TaskService:
             task.due_date = _ensure_future_due_date(data.due_date)
         if data.is_done is not None:
             task.is_done = data.is_done
+        await self.changes.record(organization_id, ChangeEntity.TASK, ChangeOp.UPDATED, [task.id])
         await self.session.commit()
         return task
 
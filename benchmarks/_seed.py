@@ -0,0 +1,136 @@
+"""Synthetic multi-tenant dataset shared by the benchmarks.
+
+Importing this module points ``DATABASE_URL`` at a throwaway SQLite file unless one is already set.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncConnection  # noqa: E402
+
+from app.models.base import Base  # noqa: E402
+from app.models.enums import ActivityType, DealStage, DealStatus, MemberRole  # noqa: E402
+from app.models.models import (  # noqa: E402
+    Activity,
+    Contact,
+    Deal,
+    Organization,
+    OrganizationMember,
+    Task,
+    User,
+)
+
+BATCH = 5_000
+
+
+async def _insert(conn: AsyncConnection, model: type, rows: list[dict]) -> None:
+    for start in range(0, len(rows), BATCH):
+        await conn.execute(insert(model), rows[start : start + BATCH])
+
+
+async def seed(
+    conn: AsyncConnection,
+    *,
+    organizations: int = 4,
+    contacts_per_org: int = 20_000,
+    deals_per_org: int = 40_000,
+    tasks_per_deal: int = 1,
+    activities_per_deal: int = 2,
+) -> None:
+    """Create schema and rows; organization 1 is the tenant the benchmarks query."""
+    rnd = random.Random(7)
+    await conn.run_sync(Base.metadata.drop_all)
+    await conn.run_sync(Base.metadata.create_all)
+    now = datetime.now(timezone.utc)
+
+    await _insert(
+        conn,
+        User,
+        [
+            {"id": i, "email": f"user{i}@example.com", "hashed_password": "-", "name": f"User {i}"}
+            for i in range(1, organizations * 5 + 1)
+        ],
+    )
+    await _insert(
+        conn, Organization, [{"id": i, "name": f"Org {i}"} for i in range(1, organizations + 1)]
+    )
+    await _insert(
+        conn,
+        OrganizationMember,
+        [
+            {"organization_id": org, "user_id": (org - 1) * 5 + n, "role": MemberRole.MANAGER}
+            for org in range(1, organizations + 1)
+            for n in range(1, 6)
+        ],
+    )
+
+    contacts: list[dict] = []
+    deals: list[dict] = []
+    tasks: list[dict] = []
+    activities: list[dict] = []
+    contact_id = deal_id = 0
+    for org in range(1, organizations + 1):
+        owners = [(org - 1) * 5 + n for n in range(1, 6)]
+        first_contact = contact_id + 1
+        for n in range(contacts_per_org):
+            contact_id += 1
+            contacts.append(
+                {
+                    "id": contact_id,
+                    "organization_id": org,
+                    "owner_id": rnd.choice(owners),
+                    "name": f"Contact {org}-{n} {rnd.choice(['Ivanov', 'Smith', 'Garcia', 'Chen'])}",
+                    "email": f"contact{contact_id}@example.com",
+                    "created_at": now - timedelta(minutes=rnd.randint(0, 500_000)),
+                }
+            )
+        for _ in range(deals_per_org):
+            deal_id += 1
+            created = now - timedelta(minutes=rnd.randint(0, 500_000))
+            deals.append(
+                {
+                    "id": deal_id,
+                    "organization_id": org,
+                    "contact_id": rnd.randint(first_contact, contact_id),
+                    "owner_id": rnd.choice(owners),
+                    "title": f"Deal {deal_id} {rnd.choice(['Website', 'Audit', 'Support', 'CRM'])}",
+                    "amount": rnd.randint(0, 100_000),
+                    "currency": "USD",
+                    "status": rnd.choice(list(DealStatus)),
+                    "stage": rnd.choice(list(DealStage)),
+                    "created_at": created,
+                    "updated_at": created,
+                }
+            )
+            for _ in range(tasks_per_deal):
+                tasks.append(
+                    {
+                        "organization_id": org,
+                        "deal_id": deal_id,
+                        "title": "Follow up",
+                        "due_date": now + timedelta(days=rnd.randint(-30, 60)),
+                        "is_done": rnd.random() < 0.7,
+                    }
+                )
+            for _ in range(activities_per_deal):
+                activities.append(
+                    {
+                        "organization_id": org,
+                        "deal_id": deal_id,
+                        "type": ActivityType.COMMENT,
+                        "payload": {"text": "note"},
+                        "created_at": created + timedelta(minutes=rnd.randint(0, 10_000)),
+                    }
+                )
+
+    await _insert(conn, Contact, contacts)
+    await _insert(conn, Deal, deals)
+    await _insert(conn, Task, tasks)
+    await _insert(conn, Activity, activities)
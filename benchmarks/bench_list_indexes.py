@@ -0,0 +1,91 @@
+"""Latency of the list queries behind each list endpoint, before and after the composite indexes.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_list_indexes
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable
+
+from benchmarks._seed import seed
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionMaker, engine
+from app.models.base import Base
+from app.models.enums import ActivityType, DealStatus
+from app.repositories.activity_repository import ActivityRepository
+from app.repositories.contact_repository import ContactRepository
+from app.repositories.deal_repository import DealRepository
+from app.repositories.task_repository import TaskRepository
+
+REPEAT = 20
+
+Query = Callable[[AsyncSession], Awaitable[object]]
+
+QUERIES: dict[str, Query] = {
+    "GET /deals": lambda s: DealRepository(s).list(1, page=1, page_size=50),
+    "GET /deals?status=won": lambda s: DealRepository(s).list(
+        1, page=1, page_size=50, statuses=[DealStatus.WON]
+    ),
+    "GET /deals?owner_id=3": lambda s: DealRepository(s).list(1, page=1, page_size=50, owner_id=3),
+    "GET /deals?order_by=amount": lambda s: DealRepository(s).list(
+        1, page=1, page_size=50, order_by="amount"
+    ),
+    "GET /contacts": lambda s: ContactRepository(s).list(1, page=1, page_size=50),
+    "GET /tasks?deal_id=10&only_open": lambda s: TaskRepository(s).list(
+        1, page=1, page_size=50, deal_id=10, only_open=True
+    ),
+    "GET /tasks?only_open": lambda s: TaskRepository(s).list(
+        1, page=1, page_size=50, only_open=True
+    ),
+    "GET /deals/10/activities": lambda s: ActivityRepository(s).list_for_deal(10, limit=50),
+    "GET /activities": lambda s: ActivityRepository(s).feed(1, limit=50),
+    "GET /activities?type=comment": lambda s: ActivityRepository(s).feed(
+        1, limit=50, types=[ActivityType.COMMENT]
+    ),
+}
+
+
+async def _measure(query: Query) -> float:
+    samples = []
+    async with AsyncSessionMaker() as session:
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            await query(session)
+            samples.append((time.perf_counter() - start) * 1000)
+            session.expunge_all()
+    return statistics.median(samples)
+
+
+async def _set_indexes(enabled: bool) -> None:
+    async with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if enabled:
+                    await conn.run_sync(lambda c, i=index: i.create(c, checkfirst=True))
+                else:
+                    await conn.run_sync(lambda c, i=index: i.drop(c, checkfirst=True))
+        await conn.exec_driver_sql("ANALYZE")
+
+
+async def main() -> None:
+    async with engine.begin() as conn:
+        await seed(conn)
+    results: dict[str, list[float]] = {name: [] for name in QUERIES}
+    for enabled in (False, True):
+        await _set_indexes(enabled)
+        for name, query in QUERIES.items():
+            results[name].append(await _measure(query))
+    print(f"{'query':<34}{'no indexes':>12}{'indexes':>12}")
+    for name, (before, after) in results.items():
+        print(f"{name:<34}{before:>10.2f}ms{after:>10.2f}ms")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+"""Latency of an unrelated endpoint while a burst of logins is being processed.
+
+Compares the old behaviour (bcrypt on the event loop) with the dedicated hashing pool.
+Run from the repository root::
+
+    python -m benchmarks.bench_login_storm
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db"
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+
+from app.core import security  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.services import auth as auth_service  # noqa: E402
+
+LOGINS = 64
+CREDENTIALS = {"email": "storm@example.com", "password": "StrongPass123"}
+
+
+async def _blocking_verify(plain_password: str, hashed_password: str) -> bool:
+    return security.verify_password(plain_password, hashed_password)
+
+
+async def _storm(client: AsyncClient) -> tuple[list[float], dict[int, int]]:
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    done = asyncio.Event()
+
+    async def probe() -> None:
+        while not done.is_set():
+            start = time.perf_counter()
+            await client.get("/health")
+            latencies.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(0.005)
+
+    async def login() -> None:
+        resp = await client.post("/api/v1/auth/login", json=CREDENTIALS)
+        statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+
+    prober = asyncio.create_task(probe())
+    await asyncio.gather(*(login() for _ in range(LOGINS)))
+    done.set()
+    await prober
+    return latencies, statuses
+
+
+def _report(label: str, latencies: list[float], statuses: dict[int, int]) -> None:
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{label:<22} /health p50={statistics.median(ordered):7.2f}ms p99={p99:7.2f}ms "
+        f"samples={len(ordered)} login statuses={statuses}"
+    )
+
+
+async def main() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        await client.post(
+            "/api/v1/auth/register",
+            json={**CREDENTIALS, "name": "Storm", "organization_name": "Storm Inc"},
+        )
+        original = auth_service.verify_password_async
+        auth_service.verify_password_async = _blocking_verify
+        _report("bcrypt on event loop", *await _storm(client))
+        auth_service.verify_password_async = original
+        _report("bcrypt on hash pool", *await _storm(client))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,57 @@
+"""Contact lookup latency: the ``LIKE '%x%'`` filter of ``GET /contacts?search=`` versus ``GET /search``.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_search
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable
+
+from benchmarks._seed import seed
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionMaker, engine
+from app.repositories.contact_repository import ContactRepository
+from app.repositories.search_repository import SearchRepository
+
+REPEAT = 20
+TERMS = ["garcia", "chen", "contact1-19", "contact12345"]
+
+Query = Callable[[AsyncSession, str], Awaitable[object]]
+
+QUERIES: dict[str, Query] = {
+    "LIKE (GET /contacts?search=)": lambda s, q: ContactRepository(s).list(
+        1, page=1, page_size=20, search=q
+    ),
+    "full-text (GET /search)": lambda s, q: SearchRepository(s).search_contacts(1, q, limit=20),
+}
+
+
+async def _measure(query: Query, term: str) -> float:
+    samples = []
+    async with AsyncSessionMaker() as session:
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            await query(session, term)
+            samples.append((time.perf_counter() - start) * 1000)
+            session.expunge_all()
+    return statistics.median(samples)
+
+
+async def main() -> None:
+    async with engine.begin() as conn:
+        await seed(conn)
+    print(f"{'term':<16}" + "".join(f"{name:>32}" for name in QUERIES))
+    for term in TERMS:
+        timings = [await _measure(query, term) for query in QUERIES.values()]
+        print(f"{term:<16}" + "".join(f"{value:>30.2f}ms" for value in timings))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -8,6 +8,8 @@ from httpx import AsyncClient
 
 os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test.db")
 
+from app.caching.analytics import analytics_cache  
+from app.caching.principals import membership_cache, membership_version_cache  
 from app.db.session import AsyncSessionMaker, engine, get_session  
 from app.main import app  
 from app.models.base import Base  
@@ -25,6 +27,9 @@ async def prepare_database():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
+    membership_cache.clear()
+    membership_version_cache.clear()
+    await analytics_cache.clear()
     yield
 
 
@@ -38,3 +43,19 @@ async def client():
     async with AsyncClient(app=app, base_url="http://test") as ac:
         yield ac
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+async def headers(client):
+    resp = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "owner@example.com",
+            "password": "StrongPass123",
+            "name": "Owner",
+            "organization_name": "Acme Inc",
+        },
+    )
+    auth_headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+    orgs = await client.get("/api/v1/organizations/me", headers=auth_headers)
+    return {**auth_headers, "X-Organization-Id": str(orgs.json()[0]["organization"]["id"])}
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import pytest
+
+
+async def _deal_with_timeline(client, headers) -> int:
+    contact = await client.post("/api/v1/contacts", json={"name": "Buyer"}, headers=headers)
+    deal = await client.post(
+        "/api/v1/deals",
+        json={"contact_id": contact.json()["id"], "title": "D", "amount": 10, "currency": "USD"},
+        headers=headers,
+    )
+    deal_id = deal.json()["id"]
+    for n in range(5):
+        await client.post(
+            f"/api/v1/deals/{deal_id}/activities",
+            json={"payload": {"text": f"note {n}"}},
+            headers=headers,
+        )
+    await client.patch(f"/api/v1/deals/{deal_id}", json={"status": "in_progress"}, headers=headers)
+    return deal_id
+
+
+@pytest.mark.asyncio
+async def test_timeline_pages_both_ways(client, headers):
+    deal_id = await _deal_with_timeline(client, headers)
+    url = f"/api/v1/deals/{deal_id}/activities"
+
+    pages, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        resp = await client.get(url, params=params, headers=headers)
+        pages.append(resp)
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    ids = [item["id"] for page in pages for item in page.json()]
+    assert len(ids) == 6 and ids == sorted(ids)
+    assert "X-Prev-Cursor" not in pages[0].headers
+
+    back = await client.get(
+        url, params={"limit": 2, "cursor": pages[2].headers["X-Prev-Cursor"]}, headers=headers
+    )
+    assert back.json() == pages[1].json()
+    back = await client.get(
+        url, params={"limit": 2, "cursor": back.headers["X-Prev-Cursor"]}, headers=headers
+    )
+    assert back.json() == pages[0].json()
+    assert "X-Prev-Cursor" not in back.headers
+
+    newest = await client.get(url, params={"limit": 1, "order": "desc"}, headers=headers)
+    assert newest.json()[0]["type"] == "status_changed"
+
+
+@pytest.mark.asyncio
+async def test_timeline_filters_and_compact_rows(client, headers):
+    deal_id = await _deal_with_timeline(client, headers)
+    url = f"/api/v1/deals/{deal_id}/activities"
+
+    resp = await client.get(url, params={"type": "status_changed"}, headers=headers)
+    assert [item["payload"] for item in resp.json()] == [{"from": "new", "to": "in_progress"}]
+
+    resp = await client.get(url, params={"include_payload": "false"}, headers=headers)
+    assert len(resp.json()) == 6
+    assert all(item["payload"] is None for item in resp.json())
+
+    author_id = resp.json()[0]["author_id"]
+    resp = await client.get(url, params={"author_id": author_id}, headers=headers)
+    assert [item["type"] for item in resp.json()] == ["comment"] * 5
+
+    resp = await client.get(url, params={"cursor": "garbage"}, headers=headers)
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_organization_feed_merges_deals_newest_first(client, headers):
+    first = await _deal_with_timeline(client, headers)
+    second = await _deal_with_timeline(client, headers)
+    await client.patch(f"/api/v1/deals/{second}", json={"stage": "proposal"}, headers=headers)
+
+    resp = await client.get("/api/v1/activities", params={"limit": 5}, headers=headers)
+    assert resp.status_code == 200
+    page = resp.json()
+    assert page[0]["type"] == "stage_changed" and page[0]["deal_id"] == second
+    assert [item["id"] for item in page] == sorted((item["id"] for item in page), reverse=True)
+
+    rest = await client.get(
+        "/api/v1/activities",
+        params={"limit": 50, "cursor": resp.headers["X-Next-Cursor"]},
+        headers=headers,
+    )
+    assert len(page) + len(rest.json()) == 13
+    assert "X-Next-Cursor" not in rest.headers
+
+    by_stage = await client.get("/api/v1/activities", params={"stage": "proposal"}, headers=headers)
+    assert {item["deal_id"] for item in by_stage.json()} == {second}
+    by_type = await client.get(
+        "/api/v1/activities", params={"type": "status_changed"}, headers=headers
+    )
+    assert sorted(item["deal_id"] for item in by_type.json()) == [first, second]
+
+
+@pytest.mark.asyncio
+async def test_organization_feed_is_scoped(client, headers):
+    await _deal_with_timeline(client, headers)
+    other = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "other@example.com",
+            "password": "StrongPass123",
+            "name": "Other",
+            "organization_name": "Other Org",
+        },
+    )
+    other_headers = {"Authorization": f"Bearer {other.json()['access_token']}"}
+    orgs = await client.get("/api/v1/organizations/me", headers=other_headers)
+    other_headers["X-Organization-Id"] = str(orgs.json()[0]["organization"]["id"])
+
+    resp = await client.get("/api/v1/activities", headers=other_headers)
+    assert resp.json() == []
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.caching.principals import membership_cache, membership_version_cache
+from app.core import security
+from app.db.session import AsyncSessionMaker
+from app.models.enums import MemberRole
+from app.models.models import OrganizationMember
+from app.repositories.organization_repository import OrganizationRepository
+from app.repositories.user_repository import UserRepository
+
+
+async def _register(client, email: str, organization_name: str) -> tuple[dict, int]:
+    resp = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": email,
+            "password": "StrongPass123",
+            "name": email.split("@")[0],
+            "organization_name": organization_name,
+        },
+    )
+    assert resp.status_code == 200
+    auth_headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+    orgs = await client.get("/api/v1/organizations/me", headers=auth_headers)
+    return auth_headers, orgs.json()[0]["organization"]["id"]
+
+
+@pytest.mark.asyncio
+async def test_membership_context_is_cached(client):
+    auth_headers, organization_id = await _register(client, "owner@example.com", "Acme")
+    headers = {**auth_headers, "X-Organization-Id": str(organization_id)}
+
+    assert (await client.get("/api/v1/contacts", headers=headers)).status_code == 200
+    assert (await client.get("/api/v1/contacts", headers=headers)).status_code == 200
+
+    stats = (await client.get("/health/caches")).json()["membership"]
+    assert stats["misses"] >= 1
+    assert stats["hits"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_new_membership_is_visible_immediately(client):
+    auth_headers, _ = await _register(client, "owner@example.com", "Acme")
+    _, other_org = await _register(client, "other@example.com", "Globex")
+    headers = {**auth_headers, "X-Organization-Id": str(other_org)}
+
+    resp = await client.get("/api/v1/contacts", headers=headers)
+    assert resp.status_code == 403
+
+    async with AsyncSessionMaker() as session:
+        repo = OrganizationRepository(session)
+        owner = await UserRepository(session).get_by_email("owner@example.com")
+        owner_id = owner.id
+        await repo.add_member(
+            OrganizationMember(organization_id=other_org, user_id=owner_id),
+            role=MemberRole.MANAGER,
+        )
+        await session.commit()
+
+    resp = await client.get("/api/v1/contacts", headers=headers)
+    assert resp.status_code == 200
+    assert len(membership_cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_membership_cache_is_invalidated_after_commit(client):
+    await _register(client, "owner@example.com", "Acme")
+    _, other_org = await _register(client, "other@example.com", "Globex")
+
+    async with AsyncSessionMaker() as session:
+        owner = await UserRepository(session).get_by_email("owner@example.com")
+        owner_id = owner.id
+        await OrganizationRepository(session).add_member(
+            OrganizationMember(organization_id=other_org, user_id=owner_id)
+        )
+        # a concurrent request still reads the committed, pre-change version
+        membership_version_cache.set(owner_id, 0, 60)
+        await session.rollback()
+        assert membership_version_cache.get(owner_id) == 0
+
+        await OrganizationRepository(session).add_member(
+            OrganizationMember(organization_id=other_org, user_id=owner_id)
+        )
+        membership_version_cache.set(owner_id, 0, 60)
+        await session.commit()
+    assert membership_version_cache.get(owner_id) is None
+
+
+@pytest.mark.asyncio
+async def test_login_is_rejected_when_hasher_is_saturated(client, monkeypatch):
+    await _register(client, "owner@example.com", "Acme")
+    monkeypatch.setattr(security, "_hash_slots", asyncio.Semaphore(0))
+
+    resp = await client.post(
+        "/api/v1/auth/login", json={"email": "owner@example.com", "password": "StrongPass123"}
+    )
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_membership_claims_are_used_until_memberships_change(client, monkeypatch):
+    monkeypatch.setattr(security.get_settings().token, "embed_memberships", True)
+    auth_headers, own_org = await _register(client, "owner@example.com", "Acme")
+    _, other_org = await _register(client, "other@example.com", "Globex")
+
+    token = auth_headers["Authorization"].split()[1]
+    payload = security.decode_token(token)
+    assert payload.orgs == {str(own_org): MemberRole.OWNER}
+
+    headers = {**auth_headers, "X-Organization-Id": str(own_org)}
+    assert (await client.get("/api/v1/contacts", headers=headers)).status_code == 200
+    assert len(membership_cache) == 0
+
+    async with AsyncSessionMaker() as session:
+        owner = await UserRepository(session).get_by_email("owner@example.com")
+        await OrganizationRepository(session).add_member(
+            OrganizationMember(organization_id=other_org, user_id=owner.id)
+        )
+        await session.commit()
+
+    # the old token does not list the new organization, but its version is stale now
+    headers = {**auth_headers, "X-Organization-Id": str(other_org)}
+    assert (await client.get("/api/v1/contacts", headers=headers)).status_code == 200
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import pytest
+
+
+async def _seed(client, headers, count: int = 3) -> list[int]:
+    contact = await client.post("/api/v1/contacts", json={"name": "Buyer"}, headers=headers)
+    ids = []
+    for n in range(count):
+        resp = await client.post(
+            "/api/v1/deals",
+            json={
+                "contact_id": contact.json()["id"],
+                "title": f"Deal {n}",
+                "amount": 100 * n,
+                "currency": "USD",
+            },
+            headers=headers,
+        )
+        ids.append(resp.json()["id"])
+    return ids
+
+
+@pytest.mark.asyncio
+async def test_batch_update_moves_deals_and_writes_activities(client, headers):
+    ids = await _seed(client, headers)
+    resp = await client.patch(
+        "/api/v1/deals/batch",
+        json={
+            "ids": ids[:2],
+            "changes": {"stage": "proposal"},
+            "items": [{"id": ids[2], "status": "won", "stage": "negotiation"}],
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [deal["stage"] for deal in body] == ["proposal", "proposal", "negotiation"]
+    assert body[2]["status"] == "won"
+
+    timeline = await client.get(f"/api/v1/deals/{ids[2]}/activities", headers=headers)
+    assert sorted(item["type"] for item in timeline.json()) == ["stage_changed", "status_changed"]
+
+
+@pytest.mark.asyncio
+async def test_batch_update_is_all_or_nothing(client, headers):
+    ids = await _seed(client, headers)
+    resp = await client.patch(
+        "/api/v1/deals/batch",
+        json={"ids": ids, "changes": {"status": "won"}},
+        headers=headers,
+    )
+    # the first deal has amount 0 and cannot be won
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == f"Deal {ids[0]}: Won deal must have amount"
+
+    deals = await client.get("/api/v1/deals", headers=headers)
+    assert {deal["status"] for deal in deals.json()} == {"new"}
+
+    resp = await client.patch(
+        "/api/v1/deals/batch", json={"ids": [ids[0], 999], "changes": {}}, headers=headers
+    )
+    assert resp.status_code == 404
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import fnmatch
+import re
+import time
+
+import pytest
+
+from app.caching.analytics import AnalyticsCache
+from app.caching.backends import (
+    CacheBackend,
+    MemoryBackend,
+    RedisBackend,
+    SQLiteBackend,
+    encode_command,
+    read_reply,
+)
+from app.schemas.analytics import DealsFunnelResponse
+
+
+class StandInRedis:
+    """In-process server speaking enough RESP for RedisBackend (GET, SET PX, INCR, SCAN, DEL)."""
+
+    def __init__(self) -> None:
+        self.data: dict[bytes, tuple[bytes, float | None]] = {}
+        self.slow_keys: set[bytes] = set()
+        self.server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"redis://127.0.0.1:{port}/0"
+
+    async def stop(self) -> None:
+        assert self.server is not None
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                command, *args = await read_reply(reader)
+                if args and args[0] in self.slow_keys:
+                    await asyncio.sleep(0.2)
+                writer.write(self._handle(command.upper(), args))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    def _handle(self, command: bytes, args: list[bytes]) -> bytes:
+        if command == b"GET":
+            value, expires = self.data.get(args[0], (None, None))
+            if value is None or (expires is not None and expires <= time.monotonic()):
+                return b"$-1\r\n"
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        if command == b"SET":
+            expires = time.monotonic() + int(args[3]) / 1000 if len(args) > 2 else None
+            self.data[args[0]] = (args[1], expires)
+            return b"+OK\r\n"
+        if command == b"INCR":
+            value = int(self.data.get(args[0], (b"0", None))[0]) + 1
+            self.data[args[0]] = (str(value).encode(), None)
+            return b":%d\r\n" % value
+        if command == b"SCAN":
+            # Redis escapes glob characters with a backslash, fnmatch with a one-item class
+            pattern = re.sub(r"\\(.)", r"[\1]", args[2].decode())
+            keys = [key for key in self.data if fnmatch.fnmatchcase(key.decode(), pattern)]
+            return b"*2\r\n$1\r\n0\r\n" + encode_command(*keys)
+        if command == b"DEL":
+            removed = [self.data.pop(key, None) for key in args]
+            return b":%d\r\n" % sum(value is not None for value in removed)
+        return b"-ERR unknown command\r\n"
+
+
+@pytest.fixture
+async def redis_server():
+    server = StandInRedis()
+    server.url = await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest.fixture
+def redis_url(redis_server):
+    return redis_server.url
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+async def backend_pair(request, tmp_path, redis_url):
+    """Two backends standing for two workers; memory ones share nothing on purpose."""
+    if request.param == "memory":
+        backends = [MemoryBackend(100), MemoryBackend(100)]
+    elif request.param == "sqlite":
+        path = str(tmp_path / "cache.sqlite3")
+        backends = [SQLiteBackend(path, timeout_seconds=1), SQLiteBackend(path, timeout_seconds=1)]
+    else:
+        backends = [
+            RedisBackend(redis_url, timeout_seconds=1),
+            RedisBackend(redis_url, timeout_seconds=1),
+        ]
+    yield request.param, backends
+    for backend in backends:
+        await backend.close()
+
+
+async def test_backend_roundtrip_and_expiry(backend_pair):
+    _, (backend, _) = backend_pair
+    assert await backend.get("k") is None
+    await backend.set("k", b"\x00value", 60)
+    assert await backend.get("k") == b"\x00value"
+    await backend.set("short", b"x", 0.05)
+    await asyncio.sleep(0.1)
+    assert await backend.get("short") is None
+    assert await backend.generation("org:1") == 0
+    assert await backend.bump("org:1") == 1
+    assert await backend.generation("org:1") == 1
+
+
+async def test_workers_share_entries_and_invalidations(backend_pair):
+    kind, (first, second) = backend_pair
+    if kind == "memory":
+        pytest.skip("the in-process backend is per worker by design")
+    worker_a, worker_b = AnalyticsCache(first), AnalyticsCache(second)
+    calls = 0
+
+    async def compute() -> DealsFunnelResponse:
+        nonlocal calls
+        calls += 1
+        return DealsFunnelResponse(stages=[])
+
+    await worker_a.get_or_compute(1, "funnel", DealsFunnelResponse, compute, 60)
+    await worker_b.get_or_compute(1, "funnel", DealsFunnelResponse, compute, 60)
+    assert calls == 1
+
+    await worker_a.invalidate_organization(1)
+    await worker_b.get_or_compute(1, "funnel", DealsFunnelResponse, compute, 60)
+    await worker_a.get_or_compute(1, "funnel", DealsFunnelResponse, compute, 60)
+    assert calls == 2
+    assert (worker_a.stats()["hits"], worker_b.stats()["hits"]) == (1, 1)
+
+
+async def test_unreachable_backend_falls_back_to_database():
+    cache = AnalyticsCache(RedisBackend("redis://127.0.0.1:1/0", timeout_seconds=0.2))
+
+    async def compute() -> DealsFunnelResponse:
+        return DealsFunnelResponse(stages=[])
+
+    result = await cache.get_or_compute(1, "funnel", DealsFunnelResponse, compute, 60)
+    assert result.stages == []
+    assert cache.stats()["errors"] == 1
+
+
+async def test_redis_clear_removes_only_its_own_prefix(redis_server):
+    backend = RedisBackend(redis_server.url, timeout_seconds=1, key_prefix="crm:[1]:")
+    redis_server.data[b"other-app:session"] = (b"keep", None)
+    redis_server.data[b"crm:1:lookalike"] = (b"keep", None)
+    await backend.set("k", b"v", 60)
+    await backend.bump("org:1")
+    assert b"crm:[1]:k" in redis_server.data
+
+    await backend.clear()
+    assert set(redis_server.data) == {b"other-app:session", b"crm:1:lookalike"}
+    await backend.close()
+
+
+async def test_redis_cancelled_command_does_not_leak_its_reply(redis_server):
+    backend = RedisBackend(redis_server.url, timeout_seconds=1, key_prefix="")
+    redis_server.data[b"slow"] = (b"late", None)
+    redis_server.data[b"fast"] = (b"fast", None)
+    redis_server.slow_keys.add(b"slow")
+
+    pending = asyncio.create_task(backend.get("slow"))
+    await asyncio.sleep(0.05)
+    pending.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await pending
+    assert await backend.get("fast") == b"fast"
+    await backend.close()
+
+
+def test_resp_encoding():
+    assert encode_command("SET", "k", b"v", "PX", 10) == (
+        b"*5\r\n$3\r\nSET\r\n$1\r\nk\r\n$1\r\nv\r\n$2\r\nPX\r\n$2\r\n10\r\n"
+    )
+    assert isinstance(MemoryBackend(1), CacheBackend)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from app.caching.memory import LRUTTLCache, SingleFlightCache
+
+
+def test_lru_bound_and_expiry_sweep():
+    cache: LRUTTLCache[int] = LRUTTLCache(max_entries=2)
+    cache.set("a", 1, 60)
+    cache.set("b", 2, 60)
+    cache.get("a")
+    cache.set("c", 3, 60)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+    cache.set("short", 4, 0.01)
+    time.sleep(0.02)
+    assert cache.purge_expired() == 1
+    assert len(cache) == 1
+    assert cache.get("a") == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_computation():
+    cache: SingleFlightCache[int] = SingleFlightCache(max_entries=10)
+    calls = 0
+
+    async def compute() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    results = await asyncio.gather(*(cache.get_or_compute("k", compute, 60) for _ in range(20)))
+    assert results == [42] * 20
+    assert calls == 1
+    assert cache.stats()["coalesced"] == 19
+    assert await cache.get_or_compute("k", compute, 60) == 42
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_failures_are_shared_but_not_cached():
+    cache: SingleFlightCache[int] = SingleFlightCache(max_entries=10)
+
+    async def boom() -> int:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("db down")
+
+    results = await asyncio.gather(
+        *(cache.get_or_compute("k", boom, 60) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def ok() -> int:
+        return 1
+
+    assert await cache.get_or_compute("k", ok, 60) == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_computation_is_not_stored():
+    cache: SingleFlightCache[str] = SingleFlightCache(max_entries=10)
+    started = asyncio.Event()
+
+    async def slow() -> str:
+        started.set()
+        await asyncio.sleep(0.01)
+        return "stale"
+
+    task = asyncio.create_task(cache.get_or_compute((1, "summary"), slow, 60))
+    await started.wait()
+    cache.invalidate(lambda key: key[0] == 1)
+    assert await task == "stale"
+    assert cache.get((1, "summary")) is None
+
+
+@pytest.mark.asyncio
+async def test_deal_writes_invalidate_analytics(client, headers):
+    contact = await client.post("/api/v1/contacts", json={"name": "Buyer"}, headers=headers)
+    summary = await client.get("/api/v1/analytics/deals/summary", headers=headers)
+    assert summary.json()["count_by_status"]["new"] == 0
+
+    await client.post(
+        "/api/v1/deals",
+        json={"contact_id": contact.json()["id"], "title": "D", "amount": 5, "currency": "USD"},
+        headers=headers,
+    )
+    summary = await client.get("/api/v1/analytics/deals/summary", headers=headers)
+    assert summary.json()["count_by_status"]["new"] == 1
+
+    stats = (await client.get("/health/caches")).json()["analytics"]
+    assert (stats["backend"], stats["hits"], stats["misses"]) == ("memory", 0, 2)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_change_feed_reports_writes_in_order(client, headers):
+    contact = await client.post("/api/v1/contacts", json={"name": "Buyer"}, headers=headers)
+    contact_id = contact.json()["id"]
+    deal = await client.post(
+        "/api/v1/deals",
+        json={"contact_id": contact_id, "title": "D", "amount": 10, "currency": "USD"},
+        headers=headers,
+    )
+    deal_id = deal.json()["id"]
+    await client.patch(f"/api/v1/deals/{deal_id}", json={"status": "in_progress"}, headers=headers)
+    spare = await client.post("/api/v1/contacts", json={"name": "Spare"}, headers=headers)
+    await client.delete(f"/api/v1/contacts/{spare.json()['id']}", headers=headers)
+
+    resp = await client.get("/api/v1/changes", headers=headers)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [(c["entity"], c["op"]) for c in body["changes"]] == [
+        ("contact", "created"),
+        ("deal", "created"),
+        ("deal", "updated"),
+        ("activity", "created"),
+        ("contact", "created"),
+        ("contact", "deleted"),
+    ]
+    assert [c["version"] for c in body["changes"]] == [1, 2, 3, 4, 5, 6]
+    assert body["next_since"] == 6 and body["has_more"] is False
+
+    page = await client.get("/api/v1/changes", params={"since": 2, "limit": 2}, headers=headers)
+    assert [c["version"] for c in page.json()["changes"]] == [3, 4]
+    assert page.json()["has_more"] is True
+
+    empty = await client.get("/api/v1/changes", params={"since": 6}, headers=headers)
+    assert empty.json() == {"changes": [], "next_since": 6, "has_more": False}
+
+
+@pytest.mark.asyncio
+async def test_long_poll_wakes_up_on_commit(client, headers):
+    async def write_later():
+        await asyncio.sleep(0.2)
+        await client.post("/api/v1/contacts", json={"name": "Late"}, headers=headers)
+
+    writer = asyncio.create_task(write_later())
+    start = time.monotonic()
+    resp = await client.get("/api/v1/changes", params={"wait": 5}, headers=headers)
+    await writer
+    assert [c["op"] for c in resp.json()["changes"]] == ["created"]
+    assert time.monotonic() - start < 0.9
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event
+
+from app.db.session import engine
+
+
+async def _deal(client, headers, contact_id: int, title: str) -> int:
+    resp = await client.post(
+        "/api/v1/deals",
+        json={"contact_id": contact_id, "title": title, "amount": 1, "currency": "USD"},
+        headers=headers,
+    )
+    return resp.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_overview_nests_deals_tasks_and_activities(client, headers):
+    contact = (await client.post("/api/v1/contacts", json={"name": "Ann"}, headers=headers)).json()
+    other = (await client.post("/api/v1/contacts", json={"name": "Bob"}, headers=headers)).json()
+    first = await _deal(client, headers, contact["id"], "First")
+    second = await _deal(client, headers, contact["id"], "Second")
+    await _deal(client, headers, other["id"], "Foreign")
+    for day in ("2030-01-03", "2030-01-01", "2030-01-02"):
+        await client.post(
+            "/api/v1/tasks",
+            json={"deal_id": first, "title": day, "due_date": day},
+            headers=headers,
+        )
+    for n in range(3):
+        await client.post(
+            f"/api/v1/deals/{first}/activities",
+            json={"type": "comment", "payload": {"n": n}},
+            headers=headers,
+        )
+
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        resp = await client.get(
+            f"/api/v1/contacts/{contact['id']}/overview",
+            params={"tasks_per_deal": 2, "activities_per_deal": 2},
+            headers=headers,
+        )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["contact"]["name"] == "Ann"
+    assert [deal["id"] for deal in body["deals"]] == [second, first]
+    by_id = {deal["id"]: deal for deal in body["deals"]}
+    assert by_id[first]["open_task_count"] == 3
+    assert [task["title"] for task in by_id[first]["open_tasks"]] == ["2030-01-01", "2030-01-02"]
+    assert [a["payload"]["n"] for a in by_id[first]["recent_activities"]] == [2, 1]
+    assert by_id[second]["open_tasks"] == [] and by_id[second]["recent_activities"] == []
+    # version lookup for the ETag, then contact, deals, task counts, tasks, activities: a fixed
+    # number of queries however many deals the contact has
+    tables = ["organizations", "contacts", "deals", "tasks", "tasks", "activities"]
+    assert len(statements) == len(tables)
+    for statement, table in zip(statements, tables):
+        assert statement.lstrip().startswith("SELECT") and f"FROM {table}" in statement
+
+    missing = await client.get("/api/v1/contacts/999/overview", headers=headers)
+    assert missing.status_code == 404
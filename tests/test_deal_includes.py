@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event
+
+from app.db.session import engine
+
+
+async def _seed(client, headers, count: int) -> list[int]:
+    contact = await client.post(
+        "/api/v1/contacts", json={"name": "Buyer", "email": "buyer@example.com"}, headers=headers
+    )
+    ids = []
+    for n in range(count):
+        deal = await client.post(
+            "/api/v1/deals",
+            json={
+                "contact_id": contact.json()["id"],
+                "title": f"D{n}",
+                "amount": n,
+                "currency": "USD",
+            },
+            headers=headers,
+        )
+        ids.append(deal.json()["id"])
+    return ids
+
+
+async def _list(client, headers, params: dict) -> tuple[list[dict], int]:
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        resp = await client.get("/api/v1/deals", params=params, headers=headers)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    assert resp.status_code == 200, resp.text
+    return resp.json(), len(statements)
+
+
+@pytest.mark.asyncio
+async def test_include_embeds_related_resources(client, headers):
+    first, second = await _seed(client, headers, 2)
+    for title in ("Call", "Send offer"):
+        await client.post(
+            "/api/v1/tasks",
+            json={"deal_id": first, "title": title, "due_date": "2030-01-01"},
+            headers=headers,
+        )
+    await client.post(
+        f"/api/v1/deals/{first}/activities",
+        json={"type": "comment", "payload": {"text": "hi"}},
+        headers=headers,
+    )
+
+    items, _ = await _list(
+        client, headers, {"include": "contact,owner,open_task_count,last_activity"}
+    )
+    by_id = {item["id"]: item for item in items}
+    assert by_id[first]["contact"] == {"id": 1, "name": "Buyer", "email": "buyer@example.com"}
+    assert by_id[first]["owner"]["name"] == "Owner"
+    assert by_id[first]["open_task_count"] == 2 and by_id[second]["open_task_count"] == 0
+    assert by_id[first]["last_activity"]["type"] == "comment"
+    assert by_id[second]["last_activity"] is None
+
+    plain, _ = await _list(client, headers, {})
+    assert "contact" not in plain[0]
+
+    narrow, _ = await _list(client, headers, {"fields": "id,title", "include": "owner"})
+    assert set(narrow[0]) == {"id", "title", "owner"}
+
+    resp = await client.get("/api/v1/deals", params={"include": "tasks"}, headers=headers)
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_include_query_count_does_not_grow_with_page(client, headers):
+    await _seed(client, headers, 6)
+    params = {"include": "contact,owner,open_task_count,last_activity"}
+    _, small = await _list(client, headers, {**params, "page_size": 2})
+    _, large = await _list(client, headers, {**params, "page_size": 6})
+    assert small == large
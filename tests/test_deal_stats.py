@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import delete, event, select, text
+
+from app.commands.rebuild_rollups import rebuild
+from app.db.session import AsyncSessionMaker, engine
+from app.models.models import Activity, DealDailyStat, DealStat, Organization
+
+
+async def _rollup() -> dict[tuple[str, str], tuple[int, float]]:
+    async with AsyncSessionMaker() as session:
+        rows = (await session.scalars(select(DealStat))).all()
+    return {
+        (row.stage.value, row.status.value): (row.deal_count, float(row.amount_total))
+        for row in rows
+        if row.deal_count
+    }
+
+
+@pytest.mark.asyncio
+async def test_rollup_follows_every_deal_write(client, headers):
+    contact = await client.post("/api/v1/contacts", json={"name": "Buyer"}, headers=headers)
+    contact_id = contact.json()["id"]
+    ids = []
+    for amount in (100, 250, 0):
+        resp = await client.post(
+            "/api/v1/deals",
+            json={"contact_id": contact_id, "title": "Deal", "amount": amount, "currency": "USD"},
+            headers=headers,
+        )
+        ids.append(resp.json()["id"])
+    await client.patch(
+        f"/api/v1/deals/{ids[0]}", json={"status": "won", "amount": 150}, headers=headers
+    )
+    await client.patch(
+        "/api/v1/deals/batch",
+        json={"ids": ids[1:], "changes": {"stage": "proposal"}},
+        headers=headers,
+    )
+    await client.post(
+        "/api/v1/deals/import",
+        files={"file": ("deals.csv", f"contact_id,title,amount,currency\n{contact_id},X,40,USD\n")},
+        headers=headers,
+    )
+
+    expected = {
+        ("qualification", "won"): (1, 150.0),
+        ("proposal", "new"): (2, 250.0),
+        ("qualification", "new"): (1, 40.0),
+    }
+    assert await _rollup() == expected
+    await rebuild()
+    assert await _rollup() == expected
+
+    summary = (await client.get("/api/v1/analytics/deals/summary", headers=headers)).json()
+    assert summary["count_by_status"] == {"new": 3, "in_progress": 0, "won": 1, "lost": 0}
+    assert float(summary["amount_by_status"]["new"]) == 290
+    assert float(summary["average_won_amount"]) == 150
+    assert summary["new_deals_last_n_days"] == 4
+
+    funnel = (await client.get("/api/v1/analytics/deals/funnel", headers=headers)).json()
+    counts = {stage["stage"]: stage["counts"] for stage in funnel["stages"]}
+    assert counts["proposal"]["new"] == 2
+    assert counts["qualification"] == {"new": 1, "in_progress": 0, "won": 1, "lost": 0}
+
+
+@pytest.mark.asyncio
+async def test_summary_reads_only_the_rollups(client, headers):
+    contact = await client.post("/api/v1/contacts", json={"name": "Buyer"}, headers=headers)
+    contact_id = contact.json()["id"]
+    for amount in (10, 20):
+        await client.post(
+            "/api/v1/deals",
+            json={"contact_id": contact_id, "title": "D", "amount": amount, "currency": "USD"},
+            headers=headers,
+        )
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        resp = await client.get(
+            "/api/v1/analytics/deals/summary", params={"days": 7}, headers=headers
+        )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    assert resp.json()["new_deals_last_n_days"] == 2
+    assert not [statement for statement in statements if "FROM deals" in statement]
+
+
+@pytest.mark.asyncio
+async def test_enums_are_stored_as_the_migrations_declare_them(client, headers):
+    contact = await client.post("/api/v1/contacts", json={"name": "Buyer"}, headers=headers)
+    deal = await client.post(
+        "/api/v1/deals",
+        json={"contact_id": contact.json()["id"], "title": "D", "amount": 5, "currency": "USD"},
+        headers=headers,
+    )
+    deal_id = deal.json()["id"]
+    await client.patch(f"/api/v1/deals/{deal_id}", json={"status": "won"}, headers=headers)
+    async with AsyncSessionMaker() as session:
+        deal_row = (await session.execute(text("SELECT status, stage FROM deals"))).one()
+        activity_type = await session.scalar(text("SELECT type FROM activities"))
+    assert tuple(deal_row) == ("won", "qualification")
+    assert activity_type == "status_changed"
+
+
+@pytest.mark.asyncio
+async def test_rebuild_repairs_drift(client, headers):
+    contact = await client.post("/api/v1/contacts", json={"name": "Buyer"}, headers=headers)
+    await client.post(
+        "/api/v1/deals",
+        json={"contact_id": contact.json()["id"], "title": "D", "amount": 5, "currency": "USD"},
+        headers=headers,
+    )
+    async with AsyncSessionMaker() as session:
+        await session.execute(delete(DealStat))
+        await session.commit()
+    assert await _rollup() == {}
+
+    assert await rebuild(int(headers["X-Organization-Id"])) == 2
+    assert await _rollup() == {("qualification", "new"): (1, 5.0)}
+
+
+async def _daily() -> list[tuple[int, int, int, float]]:
+    async with AsyncSessionMaker() as session:
+        rows = (await session.scalars(select(DealDailyStat))).all()
+    return [(r.created_count, r.won_count, r.lost_count, float(r.won_amount)) for r in rows]
+
+
+@pytest.mark.asyncio
+async def test_timeseries_counts_daily_flows(client, headers):
+    contact = await client.post("/api/v1/contacts", json={"name": "Buyer"}, headers=headers)
+    contact_id = contact.json()["id"]
+    ids = []
+    for amount in (100, 200, 300):
+        resp = await client.post(
+            "/api/v1/deals",
+            json={"contact_id": contact_id, "title": "D", "amount": amount, "currency": "USD"},
+            headers=headers,
+        )
+        ids.append(resp.json()["id"])
+    await client.patch(f"/api/v1/deals/{ids[0]}", json={"status": "won"}, headers=headers)
+    await client.patch(f"/api/v1/deals/{ids[1]}", json={"status": "won"}, headers=headers)
+    # reopened and lost: the win is taken back on the same day
+    await client.patch(f"/api/v1/deals/{ids[1]}", json={"status": "lost"}, headers=headers)
+    await client.patch(f"/api/v1/deals/{ids[0]}", json={"amount": 150}, headers=headers)
+
+    assert await _daily() == [(3, 1, 1, 150.0)]
+    await rebuild()
+    assert await _daily() == [(3, 1, 1, 150.0)]
+
+    resp = await client.get(
+        "/api/v1/analytics/deals/timeseries", params={"days": 7}, headers=headers
+    )
+    assert resp.status_code == 200
+    points = resp.json()["points"]
+    assert len(points) == 7
+    assert [points[-1][key] for key in ("created", "won", "lost")] == [3, 1, 1]
+    assert float(points[-1]["won_amount"]) == 150
+    assert sum(point["created"] for point in points) == 3
+
+    resp = await client.get(
+        "/api/v1/analytics/deals/timeseries",
+        params={"bucket": "month", "days": 1},
+        headers=headers,
+    )
+    [point] = resp.json()["points"]
+    assert point["start"].endswith("-01") and point["created"] == 3
+
+
+async def _daily_by_day() -> dict[str, tuple[int, int, int, float]]:
+    async with AsyncSessionMaker() as session:
+        rows = (await session.scalars(select(DealDailyStat))).all()
+    return {
+        row.day.isoformat(): counts
+        for row in rows
+        if any(counts := (row.created_count, row.won_count, row.lost_count, float(row.won_amount)))
+    }
+
+
+@pytest.mark.asyncio
+async def test_incremental_daily_rollup_matches_the_rebuild(client, headers):
+    contact = await client.post("/api/v1/contacts", json={"name": "Buyer"}, headers=headers)
+    ids = []
+    for amount in (100, 200, 300):
+        resp = await client.post(
+            "/api/v1/deals",
+            json={
+                "contact_id": contact.json()["id"],
+                "title": "D",
+                "amount": amount,
+                "currency": "USD",
+            },
+            headers=headers,
+        )
+        ids.append(resp.json()["id"])
+    for deal_id in ids[:2]:
+        await client.patch(f"/api/v1/deals/{deal_id}", json={"status": "won"}, headers=headers)
+
+    # the wins happened two days ago
+    async with AsyncSessionMaker() as session:
+        for activity in (await session.scalars(select(Activity))).all():
+            activity.created_at -= timedelta(days=2)
+        await session.commit()
+    await rebuild()
+    won_day = (datetime.now(timezone.utc).date() - timedelta(days=2)).isoformat()
+    assert (await _daily_by_day())[won_day] == (0, 2, 0, 300.0)
+
+    # edits of a won deal go to its win day, leaving won debits the amount it had
+    await client.patch(f"/api/v1/deals/{ids[0]}", json={"amount": 150}, headers=headers)
+    await client.patch(
+        f"/api/v1/deals/{ids[1]}", json={"status": "lost", "amount": 250}, headers=headers
+    )
+    await client.patch(
+        f"/api/v1/deals/{ids[2]}", json={"status": "won", "amount": 350}, headers=headers
+    )
+    await client.patch(
+        "/api/v1/deals/batch",
+        json={"ids": [ids[0], ids[2]], "changes": {"amount": 400}},
+        headers=headers,
+    )
+    await client.patch(f"/api/v1/deals/{ids[2]}", json={"status": "lost"}, headers=headers)
+    await client.patch(f"/api/v1/deals/{ids[2]}", json={"status": "won"}, headers=headers)
+
+    incremental = await _daily_by_day()
+    assert incremental[won_day] == (0, 2, 0, 600.0)
+    await rebuild()
+    assert await _daily_by_day() == incremental
+
+
+@pytest.mark.asyncio
+async def test_timeseries_ignores_rows_outside_the_window(client, headers):
+    today = datetime.now(timezone.utc).date()
+    async with AsyncSessionMaker() as session:
+        organization_id = await session.scalar(select(Organization.id))
+        session.add(
+            DealDailyStat(
+                organization_id=organization_id,
+                day=today + timedelta(days=3),
+                created_count=5,
+                won_count=0,
+                lost_count=0,
+                won_amount=0,
+            )
+        )
+        await session.commit()
+
+    resp = await client.get(
+        "/api/v1/analytics/deals/timeseries", params={"days": 7}, headers=headers
+    )
+    assert resp.status_code == 200
+    points = resp.json()["points"]
+    assert points[-1]["start"] == today.isoformat()
+    assert sum(point["created"] for point in points) == 0
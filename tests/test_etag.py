@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event
+
+from app.db.session import engine
+
+
+@pytest.mark.asyncio
+async def test_unchanged_list_answers_304_without_querying_deals(client, headers):
+    contact = await client.post("/api/v1/contacts", json={"name": "Buyer"}, headers=headers)
+    await client.post(
+        "/api/v1/deals",
+        json={"contact_id": contact.json()["id"], "title": "D", "amount": 10, "currency": "USD"},
+        headers=headers,
+    )
+    first = await client.get("/api/v1/deals", headers=headers)
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and first.headers["Cache-Control"] == "private, no-cache"
+
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        resp = await client.get(
+            "/api/v1/deals", headers={**headers, "If-None-Match": f'W/"x", {etag}'}
+        )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["ETag"] == etag
+    assert statements and not [s for s in statements if "FROM deals" in s]
+
+
+@pytest.mark.asyncio
+async def test_etag_follows_writes_and_query(client, headers):
+    tag = (await client.get("/api/v1/contacts", headers=headers)).headers["ETag"]
+    other = await client.get("/api/v1/contacts", params={"search": "x"}, headers=headers)
+    assert other.headers["ETag"] != tag
+
+    await client.post("/api/v1/contacts", json={"name": "New"}, headers=headers)
+    resp = await client.get("/api/v1/contacts", headers={**headers, "If-None-Match": tag})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != tag
+    assert [item["name"] for item in resp.json()] == ["New"]
+
+
+@pytest.mark.asyncio
+async def test_analytics_endpoints_are_conditional(client, headers):
+    for path in ("/api/v1/analytics/deals/summary", "/api/v1/analytics/deals/funnel"):
+        first = await client.get(path, headers=headers)
+        resp = await client.get(path, headers={**headers, "If-None-Match": first.headers["ETag"]})
+        assert resp.status_code == 304
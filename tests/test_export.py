@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import date, timedelta
+
+import pytest
+
+
+async def _seed(client, headers) -> int:
+    contact = await client.post(
+        "/api/v1/contacts", json={"name": "Buyer", "email": "buyer@example.com"}, headers=headers
+    )
+    for n in range(3):
+        await client.post(
+            "/api/v1/deals",
+            json={
+                "contact_id": contact.json()["id"],
+                "title": f"Deal {n}",
+                "amount": 100 * n,
+                "currency": "USD",
+            },
+            headers=headers,
+        )
+    await client.patch("/api/v1/deals/1", json={"stage": "proposal"}, headers=headers)
+    return contact.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_export_deals_as_ndjson_respects_filters(client, headers):
+    await _seed(client, headers)
+    resp = await client.get(
+        "/api/v1/deals/export", params={"min_amount": 100}, headers=headers
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [row["title"] for row in rows] == ["Deal 1", "Deal 2"]
+    assert rows[0]["amount"] == "100.00"
+
+
+@pytest.mark.asyncio
+async def test_export_contacts_and_activities_as_csv(client, headers):
+    await _seed(client, headers)
+    resp = await client.get("/api/v1/contacts/export", params={"format": "csv"}, headers=headers)
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [row["email"] for row in rows] == ["buyer@example.com"]
+
+    resp = await client.get(
+        "/api/v1/deals/1/activities/export", params={"format": "csv"}, headers=headers
+    )
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert json.loads(rows[0]["payload"]) == {"from": "qualification", "to": "proposal"}
+
+    resp = await client.get("/api/v1/deals/99/activities/export", headers=headers)
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_export_tasks(client, headers):
+    await _seed(client, headers)
+    today = date.today()
+    for n, days in enumerate((1, 5, 10)):
+        resp = await client.post(
+            "/api/v1/tasks",
+            json={
+                "deal_id": 1 + n % 2,
+                "title": f"Task {n}",
+                "due_date": (today + timedelta(days=days)).isoformat(),
+            },
+            headers=headers,
+        )
+        assert resp.status_code == 201
+    await client.patch("/api/v1/tasks/1", json={"is_done": True}, headers=headers)
+
+    async def export(**params) -> list[dict]:
+        resp = await client.get("/api/v1/tasks/export", params=params, headers=headers)
+        assert resp.status_code == 200
+        return [json.loads(line) for line in resp.text.splitlines()]
+
+    rows = await export()
+    assert [(row["title"], row["deal_id"], row["is_done"]) for row in rows] == [
+        ("Task 0", 1, True),
+        ("Task 1", 2, False),
+        ("Task 2", 1, False),
+    ]
+    assert [row["title"] for row in await export(only_open=True)] == ["Task 1", "Task 2"]
+    assert [row["title"] for row in await export(deal_id=1)] == ["Task 0", "Task 2"]
+    cutoff = (today + timedelta(days=5)).isoformat()
+    assert [row["title"] for row in await export(due_before=cutoff)] == ["Task 0", "Task 1"]
+    assert [row["title"] for row in await export(due_after=cutoff)] == ["Task 1", "Task 2"]
+
+    resp = await client.get(
+        "/api/v1/tasks/export", params={"format": "csv", "only_open": True}, headers=headers
+    )
+    assert resp.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [row["title"] for row in rows] == ["Task 1", "Task 2"]
+    assert rows[0]["is_done"] == "False"
+    assert rows[1]["due_date"].startswith((today + timedelta(days=10)).isoformat())
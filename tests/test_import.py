@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+import threading
+
+import pytest
+
+from app.api.imports import UNDECODABLE
+from app.services.imports import RawRow, chunked
+
+
+@pytest.mark.asyncio
+async def test_import_contacts_ndjson_reports_row_errors(client, headers):
+    lines = [
+        json.dumps({"name": "Ann", "email": "ann@example.com"}),
+        json.dumps({"name": "", "email": "nobody@example.com"}),
+        "{not json",
+        json.dumps({"name": "Bob", "owner_id": 999}),
+        json.dumps({"name": "Cid", "phone": "+1"}),
+    ]
+    resp = await client.post(
+        "/api/v1/contacts/import",
+        files={"file": ("contacts.ndjson", "\n".join(lines).encode(), "application/x-ndjson")},
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    result = resp.json()
+    assert (result["received"], result["inserted"], result["failed"]) == (5, 2, 3)
+    assert [error["row"] for error in result["errors"]] == [2, 3, 4]
+    assert result["errors"][2]["detail"] == "Unknown owner"
+
+    contacts = await client.get("/api/v1/contacts", headers=headers)
+    assert sorted(item["name"] for item in contacts.json()) == ["Ann", "Cid"]
+
+
+@pytest.mark.asyncio
+async def test_import_deals_csv_resolves_contacts_in_bulk(client, headers):
+    contact = await client.post("/api/v1/contacts", json={"name": "Buyer"}, headers=headers)
+    contact_id = contact.json()["id"]
+    body = "\n".join(
+        [
+            "contact_id,title,amount,currency",
+            f"{contact_id},Big deal,1000,USD",
+            f"{contact_id},Small deal,10,EUR",
+            "404,Orphan,5,USD",
+            f"{contact_id},Negative,-1,USD",
+        ]
+    )
+    resp = await client.post(
+        "/api/v1/deals/import",
+        files={"file": ("deals.csv", body.encode(), "text/csv")},
+        headers=headers,
+    )
+    result = resp.json()
+    assert (result["inserted"], result["failed"]) == (2, 2)
+    assert {error["row"]: error["detail"] for error in result["errors"]}[3] == (
+        "Contact not in organization"
+    )
+
+    deals = await client.get("/api/v1/deals", params={"order_by": "amount"}, headers=headers)
+    assert [deal["title"] for deal in deals.json()] == ["Big deal", "Small deal"]
+
+
+@pytest.mark.asyncio
+async def test_import_reports_a_non_utf8_file_instead_of_failing(client, headers):
+    body = "name,email\nJosé,jose@example.com\n".encode("latin-1")
+    resp = await client.post(
+        "/api/v1/contacts/import",
+        files={"file": ("contacts.csv", body, "text/csv")},
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    result = resp.json()
+    assert (result["received"], result["inserted"], result["failed"]) == (1, 0, 1)
+    assert result["errors"] == [{"row": 1, "detail": UNDECODABLE}]
+
+
+@pytest.mark.asyncio
+async def test_rows_are_parsed_off_the_event_loop():
+    threads = set()
+
+    def rows():
+        for number in range(1, 6):
+            threads.add(threading.get_ident())
+            yield RawRow(number, {"name": str(number)})
+
+    chunks = [[row.number for row in chunk] async for chunk in chunked(rows(), 2)]
+    assert chunks == [[1, 2], [3, 4], [5]]
+    assert threading.get_ident() not in threads
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app.db.session import AsyncSessionMaker
+from app.repositories.task_repository import TaskKeyset, TaskRepository
+
+
+async def _seed_deals(client, headers, count: int) -> None:
+    contact = await client.post("/api/v1/contacts", json={"name": "Buyer"}, headers=headers)
+    for n in range(count):
+        resp = await client.post(
+            "/api/v1/deals",
+            json={
+                "contact_id": contact.json()["id"],
+                "title": f"Deal {n}",
+                "amount": (n * 7) % 5,
+                "currency": "USD",
+            },
+            headers=headers,
+        )
+        assert resp.status_code == 201
+
+
+async def _walk(client, headers, path: str, params: dict) -> list[int]:
+    seen: list[int] = []
+    resp = await client.get(path, params=params, headers=headers)
+    while True:
+        assert resp.status_code == 200
+        seen.extend(item["id"] for item in resp.json())
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            return seen
+        resp = await client.get(path, params={**params, "cursor": cursor}, headers=headers)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "order_by,order",
+    [("created_at", "desc"), ("amount", "asc"), ("amount", "desc"), ("title", "asc")],
+)
+async def test_deal_cursor_pages_match_offset_pages(client, headers, order_by, order):
+    await _seed_deals(client, headers, 7)
+    params = {"page_size": 3, "order_by": order_by, "order": order}
+
+    by_cursor = await _walk(client, headers, "/api/v1/deals", params)
+    by_offset = []
+    for page in (1, 2, 3):
+        resp = await client.get("/api/v1/deals", params={**params, "page": page}, headers=headers)
+        by_offset.extend(item["id"] for item in resp.json())
+
+    assert by_cursor == by_offset
+    assert sorted(by_cursor) == list(range(1, 8))
+
+
+@pytest.mark.asyncio
+async def test_contact_cursor_pagination(client, headers):
+    for n in range(5):
+        await client.post("/api/v1/contacts", json={"name": f"Contact {n}"}, headers=headers)
+    ids = await _walk(client, headers, "/api/v1/contacts", {"page_size": 2})
+    assert ids == [5, 4, 3, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_cursor_from_other_ordering_is_rejected(client, headers):
+    await _seed_deals(client, headers, 3)
+    resp = await client.get("/api/v1/deals", params={"page_size": 2}, headers=headers)
+    cursor = resp.headers["X-Next-Cursor"]
+
+    resp = await client.get(
+        "/api/v1/deals", params={"order_by": "amount", "cursor": cursor}, headers=headers
+    )
+    assert resp.status_code == 400
+    resp = await client.get("/api/v1/deals", params={"cursor": "garbage"}, headers=headers)
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_tasks_are_paginated_by_due_date(client, headers):
+    await _seed_deals(client, headers, 2)
+    for n in range(5):
+        resp = await client.post(
+            "/api/v1/tasks",
+            json={
+                "deal_id": 1 + n % 2,
+                "title": f"Task {n}",
+                "due_date": (date.today() + timedelta(days=5 - n % 3)).isoformat(),
+            },
+            headers=headers,
+        )
+        assert resp.status_code == 201
+
+    ids = await _walk(client, headers, "/api/v1/tasks", {"page_size": 2})
+    assert sorted(ids) == [1, 2, 3, 4, 5]
+    assert ids == [3, 2, 5, 1, 4]
+
+    resp = await client.get("/api/v1/tasks", params={"owner_id": 999}, headers=headers)
+    assert resp.json() == []
+    resp = await client.get("/api/v1/tasks", params={"page_size": 1000}, headers=headers)
+    assert resp.status_code == 422
+
+
+async def _task_plan(**filters) -> str:
+    async with AsyncSessionMaker() as session:
+        stmt = TaskRepository(session).filtered_query(1, **filters)
+        stmt = stmt.order_by(*TaskKeyset.order_by()).limit(50)
+        sql = stmt.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+        rows = await session.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+        return " | ".join(row[-1] for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_task_lists_are_served_by_the_task_indexes():
+    # the open-task predicate must match the partial index's, or the planner skips it
+    assert await _task_plan(deal_id=1, only_open=True) == (
+        "SEARCH tasks USING INDEX ix_tasks_open_deal_due (deal_id=?)"
+    )
+    # organization-wide lists walk an index in due-date order instead of sorting
+    for filters in ({}, {"only_open": True}):
+        plan = await _task_plan(**filters)
+        assert plan.startswith("SEARCH tasks USING INDEX ix_tasks_")
+        assert "(organization_id=?)" in plan and "TEMP B-TREE" not in plan
+
+
+@pytest.mark.asyncio
+async def test_fetch_by_ids_is_scoped_and_capped(client, headers):
+    await _seed_deals(client, headers, 5)
+    resp = await client.get(
+        "/api/v1/deals",
+        params=[("ids", 4), ("ids", 2), ("ids", 99), ("page_size", 1), ("page", 3)],
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    assert sorted(item["id"] for item in resp.json()) == [2, 4]
+    assert "X-Next-Cursor" not in resp.headers
+
+    contacts = await client.get("/api/v1/contacts", params={"ids": 1}, headers=headers)
+    assert [item["name"] for item in contacts.json()] == ["Buyer"]
+
+    await client.post(
+        "/api/v1/tasks",
+        json={"deal_id": 1, "title": "Call", "due_date": "2030-01-01"},
+        headers=headers,
+    )
+    tasks = await client.get("/api/v1/tasks", params=[("ids", 1), ("ids", 2)], headers=headers)
+    assert [item["id"] for item in tasks.json()] == [1]
+
+    other = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "other@example.com",
+            "password": "StrongPass123",
+            "name": "Other",
+            "organization_name": "Other Inc",
+        },
+    )
+    other_headers = {"Authorization": f"Bearer {other.json()['access_token']}"}
+    orgs = await client.get("/api/v1/organizations/me", headers=other_headers)
+    other_headers["X-Organization-Id"] = str(orgs.json()[0]["organization"]["id"])
+    foreign = await client.get("/api/v1/deals", params={"ids": 1}, headers=other_headers)
+    assert foreign.json() == []
+
+    too_many = [("ids", n) for n in range(1, 502)]
+    assert (await client.get("/api/v1/deals", params=too_many, headers=headers)).status_code == 422
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from pydantic import TypeAdapter
+from sqlalchemy import event
+
+from app.api import responses
+from app.db.session import engine
+from app.models.enums import ActivityType, DealStage, DealStatus
+from app.schemas.activity import ActivityRead
+from app.schemas.deal import DealRead
+
+
+def _deal(created_at: datetime) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=1,
+        organization_id=2,
+        contact_id=3,
+        owner_id=4,
+        title="Ünïcode",
+        amount=Decimal("1250.50"),
+        currency="USD",
+        status=DealStatus.IN_PROGRESS,
+        stage=DealStage.PROPOSAL,
+        created_at=created_at,
+        updated_at=created_at.replace(microsecond=0),
+    )
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+@pytest.mark.parametrize(
+    "created_at",
+    [datetime(2024, 5, 1, 12, 30, 15, 123456), datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)],
+)
+def test_fast_path_matches_pydantic_output(monkeypatch, use_orjson, created_at):
+    if use_orjson and responses.orjson is None:
+        pytest.skip("orjson is not installed")
+    if not use_orjson:
+        monkeypatch.setattr(responses, "orjson", None)
+    rows = [_deal(created_at)]
+    expected = TypeAdapter(list[DealRead]).dump_python(
+        [DealRead.model_validate(row) for row in rows], mode="json"
+    )
+
+    items = [responses._to_dict(row, responses._plan(DealRead)) for row in rows]
+    media_type, body = responses.encode(items)
+
+    assert media_type == "application/json"
+    assert json.loads(body) == expected
+
+
+def test_optional_fields_fall_back_to_schema_defaults():
+    row = SimpleNamespace(
+        id=1, deal_id=2, author_id=None, type=ActivityType.COMMENT, created_at=datetime(2024, 1, 1)
+    )
+    item = responses._to_dict(row, responses._plan(ActivityRead))
+    assert item["payload"] is None and item["type"] is ActivityType.COMMENT
+
+
+@pytest.mark.asyncio
+async def test_list_endpoint_keeps_headers(client, headers):
+    for n in range(3):
+        await client.post("/api/v1/contacts", json={"name": f"C{n}"}, headers=headers)
+    resp = await client.get("/api/v1/contacts", params={"page_size": 2}, headers=headers)
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.headers["X-Next-Cursor"] and resp.headers["ETag"]
+    assert [item["name"] for item in resp.json()] == ["C2", "C1"]
+
+
+@pytest.mark.asyncio
+async def test_list_endpoint_negotiates_msgpack(client, headers):
+    msgpack = pytest.importorskip("msgpack")
+    await client.post("/api/v1/contacts", json={"name": "Packed"}, headers=headers)
+    resp = await client.get(
+        "/api/v1/contacts", headers={**headers, "Accept": "application/x-msgpack"}
+    )
+    assert resp.headers["content-type"] == "application/msgpack"
+    assert [item["name"] for item in msgpack.unpackb(resp.content)] == ["Packed"]
+
+
+@pytest.mark.asyncio
+async def test_fields_project_columns_and_response(client, headers):
+    contact = await client.post("/api/v1/contacts", json={"name": "Buyer"}, headers=headers)
+    for n in range(3):
+        await client.post(
+            "/api/v1/deals",
+            json={
+                "contact_id": contact.json()["id"],
+                "title": f"D{n}",
+                "amount": n,
+                "currency": "USD",
+            },
+            headers=headers,
+        )
+
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        resp = await client.get(
+            "/api/v1/deals",
+            params={"fields": "title, stage,id", "page_size": 2, "order_by": "amount"},
+            headers=headers,
+        )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    assert resp.status_code == 200
+    assert resp.json() == [
+        {"id": 3, "title": "D2", "stage": "qualification"},
+        {"id": 2, "title": "D1", "stage": "qualification"},
+    ]
+    query = next(s for s in statements if "FROM deals" in s)
+    assert "deals.currency" not in query and "deals.amount" in query
+
+    cursor = resp.headers["X-Next-Cursor"]
+    rest = await client.get(
+        "/api/v1/deals",
+        params={"fields": "id", "page_size": 2, "order_by": "amount", "cursor": cursor},
+        headers=headers,
+    )
+    assert rest.json() == [{"id": 1}]
+
+    await client.post(
+        "/api/v1/tasks",
+        json={"deal_id": 1, "title": "Call", "due_date": "2030-01-01"},
+        headers=headers,
+    )
+    tasks = await client.get("/api/v1/tasks", params={"fields": "is_done,id"}, headers=headers)
+    assert tasks.json() == [{"id": 1, "is_done": False}]
+    bad = await client.get("/api/v1/contacts", params={"fields": "name,secret"}, headers=headers)
+    assert bad.status_code == 400
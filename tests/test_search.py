@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.models import Contact
+from app.models.search import contacts_fts
+from app.repositories.search_repository import SearchRepository
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_contacts_and_deals(client, headers):
+    for name, email in [
+        ("John Smith", "john@example.com"),
+        ("Johanna Doe", "jd@example.com"),
+        ("Peter Parker", "peter@daily.example"),
+    ]:
+        await client.post("/api/v1/contacts", json={"name": name, "email": email}, headers=headers)
+    await client.post(
+        "/api/v1/deals",
+        json={"contact_id": 1, "title": "Johnson account renewal", "amount": 5, "currency": "USD"},
+        headers=headers,
+    )
+
+    resp = await client.get("/api/v1/search", params={"q": "joh"}, headers=headers)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert {hit["name"] for hit in body["contacts"]} == {"John Smith", "Johanna Doe"}
+    assert [hit["title"] for hit in body["deals"]] == ["Johnson account renewal"]
+
+    resp = await client.get("/api/v1/search", params={"q": "daily"}, headers=headers)
+    assert [hit["name"] for hit in resp.json()["contacts"]] == ["Peter Parker"]
+
+
+@pytest.mark.asyncio
+async def test_search_index_follows_writes(client, headers):
+    contact = await client.post("/api/v1/contacts", json={"name": "Temporary"}, headers=headers)
+    resp = await client.get("/api/v1/search", params={"q": "temporary"}, headers=headers)
+    assert len(resp.json()["contacts"]) == 1
+
+    await client.delete(f"/api/v1/contacts/{contact.json()['id']}", headers=headers)
+    resp = await client.get("/api/v1/search", params={"q": "temporary"}, headers=headers)
+    assert resp.json()["contacts"] == []
+
+    resp = await client.get("/api/v1/search", params={"q": "!!!"}, headers=headers)
+    assert resp.json() == {"contacts": [], "deals": []}
+
+
+def test_postgresql_search_matches_the_raw_query():
+    stmt = SearchRepository(None)._search(
+        Contact,
+        contacts_fts,
+        [Contact.name, Contact.email],
+        " John@Example.com ",
+        10,
+        dialect="postgresql",
+    )
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    values = set(compiled.params.values())
+    assert "%john@example.com%" in values and "john@example.com" in values
+    assert "similarity" in str(compiled)
+
+    stmt = SearchRepository(None)._search(
+        Contact, contacts_fts, [Contact.name], "50%_off", 10, dialect="postgresql"
+    )
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    assert "%50\\%\\_off%" in compiled.params.values()
+    assert "ESCAPE" in str(compiled)
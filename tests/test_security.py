@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+
+import pytest
+
+from app.core.security import create_token, decode_token, verified_token_cache
+
+
+def test_decode_token_reuses_verified_payload():
+    token = create_token("42", token_type="access", expires_delta=timedelta(minutes=5))
+    first = decode_token(token)
+    hits = verified_token_cache.hits
+    second = decode_token(token)
+    assert first is second
+    assert verified_token_cache.hits == hits + 1
+
+
+def test_expired_token_is_not_served_from_cache():
+    token = create_token("42", token_type="access", expires_delta=timedelta(seconds=1))
+    assert decode_token(token).sub == "42"
+    time.sleep(2.1)
+    with pytest.raises(ValueError):
+        decode_token(token)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from app.api.middleware import ServerTimingMiddleware
+from app.core.security import get_password_hash_async
+from app.core.timing import current_timings
+from app.db.session import AsyncSessionMaker
+
+
+def _metrics(header: str) -> dict[str, str]:
+    return {part.split(";")[0].strip(): part for part in header.split(",")}
+
+
+@pytest.mark.asyncio
+async def test_app_sends_no_server_timing_by_default(client, headers):
+    resp = await client.get("/api/v1/deals", headers=headers)
+    assert "Server-Timing" not in resp.headers
+    login = await client.post(
+        "/api/v1/auth/login", json={"email": "owner@example.com", "password": "StrongPass123"}
+    )
+    assert "Server-Timing" not in login.headers
+
+
+@pytest.mark.asyncio
+async def test_server_timing_only_for_authenticated_non_auth_requests():
+    inner = FastAPI()
+
+    @inner.get("/work")
+    @inner.post("/auth/login")
+    async def work() -> dict[str, bool]:
+        async with AsyncSessionMaker() as session:
+            await session.execute(text("SELECT 1"))
+        await get_password_hash_async("secret-password")
+        return {"ok": True}
+
+    timed = ServerTimingMiddleware(inner, header=True, hidden_prefixes=("/auth/",))
+    bearer = {"Authorization": "Bearer x"}
+    async with AsyncClient(app=timed, base_url="http://test") as ac:
+        resp = await ac.get("/work", headers=bearer)
+        anonymous = await ac.get("/work")
+        login = await ac.post("/auth/login", headers=bearer)
+
+    metrics = _metrics(resp.headers["Server-Timing"])
+    assert set(metrics) == {"db", "db-acquire", "hash", "app", "total"}
+    assert 'desc="1 queries"' in metrics["db"]
+    assert "Server-Timing" not in anonymous.headers
+    assert "Server-Timing" not in login.headers
+
+
+@pytest.mark.asyncio
+async def test_slow_requests_are_logged_with_statements(caplog):
+    inner = FastAPI()
+
+    @inner.get("/work")
+    async def work() -> dict[str, int]:
+        async with AsyncSessionMaker() as session:
+            for n in range(3):
+                await session.execute(text(f"SELECT {n}"))
+        return {"queries": current_timings.get().sql_count}
+
+    timed = ServerTimingMiddleware(
+        inner, header=True, slow_request_ms=0.001, max_logged_statements=2
+    )
+    with caplog.at_level(logging.WARNING, logger="app.requests"):
+        async with AsyncClient(app=timed, base_url="http://test") as ac:
+            resp = await ac.get("/work", headers={"Authorization": "Bearer x"})
+
+    assert resp.json() == {"queries": 3}
+    assert 'db;dur=' in resp.headers["Server-Timing"]
+    assert _metrics(resp.headers["Server-Timing"])["db-acquire"]
+    [record] = caplog.records
+    message = record.getMessage()
+    assert "slow request GET /work -> 200" in message and "3 statements" in message
+    assert "SELECT 0" in message and "SELECT 1" in message and "SELECT 2" not in message
+    assert "1 more statements" in message